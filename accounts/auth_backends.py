@@ -1,9 +1,11 @@
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
+from django.core.exceptions import PermissionDenied
 from django.utils import timezone
-from django.conf import settings
 from django.utils.translation import gettext_lazy as _
-from datetime import timedelta # Importation nécessaire pour timedelta
+from accounts.services.login_attempt_cache import LoginAttemptCache
+from core.utils import get_client_ip
+import math
 
 # --- Exception Personnalisée ---
 class AccountLockedError(Exception):
@@ -12,59 +14,71 @@ class AccountLockedError(Exception):
 # -----------------------------
 
 UserModel = get_user_model()
-MAX_FAILED_ATTEMPTS = getattr(settings, 'MAX_FAILED_LOGIN_ATTEMPTS', 5)
-# Utiliser une valeur par défaut de 15 minutes (900 secondes)
-MAX_FAILED_ATTEMPTS_TIME = getattr(settings, 'MAX_FAILED_LOGIN_ATTEMPTS_TIME', 900) 
+
 
 class LockoutAuthBackend(ModelBackend):
+    """
+    Authentification par email avec verrouillage après trop d'échecs.
+
+    Les échecs sont comptés dans le cache partagé (LoginAttemptCache, fenêtre
+    glissante par email et par IP) : la ligne immob_users n'est écrite qu'au
+    verrouillage effectif du compte. Un email ou une IP au-delà du seuil est
+    rejeté sans requête DB ni hachage de mot de passe.
+
+    Un email inconnu coûte un hachage factice, comme un compte existant.
+    Un échec lève PermissionDenied, ce qui arrête authenticate() : les
+    backends suivants (ModelBackend) ne refont ni la recherche ni le hachage.
+    """
 
     def authenticate(self, request, username=None, password=None, **kwargs):
         if username is None:
             username = kwargs.get(UserModel.USERNAME_FIELD)
-        
+        if username is None or password is None:
+            return None
+
+        ip = get_client_ip(request)
+
+        # 1. IP en rafale (credential stuffing) : rejet sans accès DB
+        if LoginAttemptCache.is_ip_blocked(ip):
+            LoginAttemptCache.record_failure(username, ip)
+            raise PermissionDenied
+
+        # 2. Email au-delà du seuil : compte verrouillé (ou inexistant, même réponse)
+        if LoginAttemptCache.is_email_blocked(username):
+            LoginAttemptCache.record_failure(username, ip)
+            raise AccountLockedError(_("This account has been locked due to too many failed login attempts."))
+
         try:
             user = UserModel._default_manager.get_by_natural_key(username)
-          
         except UserModel.DoesNotExist:
-            return None 
+            # Hachage factice au même coût qu'un compte existant : la durée de
+            # la réponse ne révèle pas l'existence de l'email
+            UserModel().set_password(password)
+            LoginAttemptCache.record_failure(username, ip)
+            raise PermissionDenied
 
-        # 1. Vérification du statut de l'utilisateur (verrouillage permanent)
+        # 3. Vérification du statut de l'utilisateur (verrouillage permanent)
         if not user.is_active:
             raise AccountLockedError(_("This account has been locked due to too many failed login attempts."))
-        
-        # 2. Authentification réussie
+
+        # 4. Authentification réussie (le hachage est recalculé et enregistré
+        # s'il n'a pas le facteur de travail courant)
         if user.check_password(password):
-            # Succès : Réinitialisation complète
+            LoginAttemptCache.reset(username)
+            # Compteur persisté par un verrouillage antérieur (compte réactivé depuis)
             if user.failed_login_attempts > 0:
                 user.failed_login_attempts = 0
                 user.last_failed_login = None
                 user.save(update_fields=['failed_login_attempts', 'last_failed_login'])
             return user
-        
-        # 3. Authentification échouée (Mot de passe incorrect)
-        
-        
-        # 3.1. Vérifier si le compteur doit être réinitialisé en raison du temps
-        time_limit = timezone.now() - timedelta(seconds=MAX_FAILED_ATTEMPTS_TIME)
-        
-        if user.last_failed_login and user.last_failed_login < time_limit:
-            # Plus de temps que la limite s'est écoulé depuis la dernière erreur.
-            # Réinitialiser le compteur pour la nouvelle série de tentatives.
-            user.failed_login_attempts = 0
-            # Note: last_failed_login sera mis à jour juste après
-        
-        # 3.2. Incrémenter et mettre à jour l'horodatage pour la tentative actuelle
-        user.failed_login_attempts += 1
-        user.last_failed_login = timezone.now()
 
-        # 3.3. Vérifier si la limite est atteinte et verrouiller
-        if user.failed_login_attempts >= MAX_FAILED_ATTEMPTS:
+        # 5. Authentification échouée (Mot de passe incorrect) : seul le
+        # verrouillage est écrit en base
+        failures = LoginAttemptCache.record_failure(username, ip)
+        if failures >= LoginAttemptCache.max_per_email():
             user.is_active = False
-            # Sauvegarder l'état de verrouillage
+            user.failed_login_attempts = math.ceil(failures)
+            user.last_failed_login = timezone.now()
             user.save(update_fields=['failed_login_attempts', 'last_failed_login', 'is_active'])
-            
-        else:
-            # Sauvegarder l'incrémentation
-            user.save(update_fields=['failed_login_attempts', 'last_failed_login'])
 
-        return None
\ No newline at end of file
+        raise PermissionDenied
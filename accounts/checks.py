@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS
+from django.core.checks import Error, Tags, Warning, register
+from django.utils.module_loading import import_string
+
+# Backends dont incr() est atomique : Redis et Memcached (partagés entre les
+# workers), LocMem (un seul processus : développement et tests)
+ATOMIC_CACHE_BACKENDS = (
+    'django.core.cache.backends.redis.RedisCache',
+    'django.core.cache.backends.memcached.PyMemcacheCache',
+    'django.core.cache.backends.memcached.PyLibMCCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+@register(Tags.caches, Tags.security)
+def check_login_attempt_cache(app_configs, **kwargs):
+    """
+    Le verrouillage des connexions (LockoutAuthBackend) compte les échecs avec
+    cache.incr(). Sur un backend sans incr atomique (fichier, base de données),
+    des échecs simultanés se perdent et un attaquant dépasse le seuil : erreur
+    en production, avertissement en développement.
+    """
+    if 'accounts.auth_backends.LockoutAuthBackend' not in settings.AUTHENTICATION_BACKENDS:
+        return []
+    backend = settings.CACHES.get(DEFAULT_CACHE_ALIAS, {}).get('BACKEND', '')
+    try:
+        backend_class = import_string(backend)
+    except ImportError:
+        return []
+    if any(issubclass(backend_class, import_string(path)) for path in ATOMIC_CACHE_BACKENDS):
+        return []
+
+    message = f"Le cache '{DEFAULT_CACHE_ALIAS}' ({backend}) n'a pas d'incr() atomique : les échecs de connexion concurrents peuvent être perdus."
+    hint = 'Définissez CACHE_URL=redis://… (ou memcached) pour le verrouillage des connexions.'
+    if settings.DEBUG:
+        return [Warning(message, hint=hint, id='accounts.W001')]
+    return [Error(message, hint=hint, id='accounts.E001')]
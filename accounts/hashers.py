@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+
+
+class ConfigurablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 dont le facteur de travail vient de PASSWORD_HASHER_ITERATIONS.
+
+    L'algorithme reste 'pbkdf2_sha256' : les hachages existants restent valides.
+    Lorsqu'un hachage stocké n'a pas le nombre d'itérations courant
+    (must_update), check_password le recalcule et l'enregistre à la connexion
+    suivante réussie.
+    """
+
+    @property
+    def iterations(self) -> int:
+        return getattr(settings, 'PASSWORD_HASHER_ITERATIONS', PBKDF2PasswordHasher.iterations)
+
+
+def init_hashing_worker() -> None:
+    """Initialise Django dans un processus de hachage (ProcessPoolExecutor en mode spawn)."""
+    import django
+    django.setup()
+
+
+def hash_password(password: str) -> str:
+    """Hache un mot de passe avec le hasher par défaut (exécuté dans un processus du pool)."""
+    from django.contrib.auth.hashers import make_password
+    return make_password(password)
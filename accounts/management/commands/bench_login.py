@@ -0,0 +1,143 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from statistics import quantiles
+from accounts.auth_backends import AccountLockedError
+from accounts.models import ImmobUser
+from accounts.services.login_attempt_cache import LoginAttemptCache
+import random
+import threading
+import time
+import uuid
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test LockoutAuthBackend with a credential-stuffing pattern against throwaway accounts '
+        'and report login throughput, latency and immob_users writes. Writes to the configured database '
+        'and cache (under a dedicated key prefix): refuses to run unless DEBUG is on or --i-know is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=500, help='Total login attempts')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent worker threads')
+        parser.add_argument('--targets', type=int, default=20, help='Existing accounts targeted by the attack')
+        parser.add_argument(
+            '--unknown-ratio', type=float, default=0.7,
+            help='Share of attack attempts on emails that do not exist'
+        )
+        parser.add_argument('--ips', type=int, default=5, help='Number of attacking IP addresses')
+        parser.add_argument(
+            '--legit-every', type=int, default=20,
+            help='Send one legitimate login (correct password, own IP) every N attempts'
+        )
+        parser.add_argument(
+            '--i-know', action='store_true',
+            help='Run even with DEBUG off (the accounts and counters are removed at the end)'
+        )
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['i_know']:
+            raise CommandError('DEBUG is off: this command writes to the configured database. Pass --i-know to run it.')
+        if options['attempts'] < 2 or options['targets'] < 1 or options['ips'] < 1:
+            raise CommandError('--attempts must be >= 2, --targets and --ips >= 1.')
+
+        run = uuid.uuid4().hex[:8]
+        # Préfixe dédié : les compteurs du benchmark ne touchent pas ceux des vrais comptes/IP
+        bench_caches = {
+            alias: {**config, 'KEY_PREFIX': f"bench-login-{run}"}
+            for alias, config in settings.CACHES.items()
+        }
+        with override_settings(CACHES=bench_caches):
+            self._run(run, options)
+
+    def _run(self, run: str, options) -> None:
+        password = f"bench-{run}"
+        # Un seul hachage pour tous les comptes jetables
+        hashed = make_password(password)
+        users = ImmobUser.objects.bulk_create([
+            ImmobUser(
+                email=f"bench-login-{run}-{i}@example.invalid",
+                username=f"bench-login-{run}-{i}",
+                password=hashed,
+            )
+            for i in range(options['targets'])
+        ])
+        legit_user = users[0]
+        targets = [user.email for user in users[1:]] or [legit_user.email]
+
+        subnet = random.randint(0, 255)
+        attack_ips = [f"10.{subnet}.{i // 256}.{i % 256}" for i in range(options['ips'])]
+        factory = RequestFactory()
+        stats_lock = threading.Lock()
+        used_emails = set()
+        used_ips = set()
+        stats = {'queries': 0, 'user_updates': 0, 'legit_ok': 0, 'legit_total': 0, 'locked': 0, 'denied': 0}
+
+        def count_queries(execute, sql, params, many, context):
+            with stats_lock:
+                stats['queries'] += 1
+                if sql.lstrip().upper().startswith('UPDATE') and '"immob_users"' in sql:
+                    stats['user_updates'] += 1
+            return execute(sql, params, many, context)
+
+        def attempt(index: int) -> float:
+            legit = options['legit_every'] > 0 and index % options['legit_every'] == 0
+            if legit:
+                email, secret, ip = legit_user.email, password, f"192.0.2.{index % 250 + 1}"
+            elif random.random() < options['unknown_ratio']:
+                email, secret, ip = f"nobody-{run}-{index}@example.invalid", 'guess', random.choice(attack_ips)
+            else:
+                email, secret, ip = random.choice(targets), f"guess-{index}", random.choice(attack_ips)
+
+            with stats_lock:
+                used_emails.add(email)
+                used_ips.add(ip)
+            request = factory.post('/accounts/login/', REMOTE_ADDR=ip)
+            start = time.perf_counter()
+            with connection.execute_wrapper(count_queries):
+                try:
+                    user = authenticate(request, username=email, password=secret)
+                    outcome = 'ok' if user is not None else 'denied'
+                except AccountLockedError:
+                    outcome = 'locked'
+            elapsed = (time.perf_counter() - start) * 1000
+            connection.close()
+
+            with stats_lock:
+                if legit:
+                    stats['legit_total'] += 1
+                    stats['legit_ok'] += outcome == 'ok'
+                elif outcome in ('locked', 'denied'):
+                    stats[outcome] += 1
+            return elapsed
+
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                timings = list(executor.map(attempt, range(options['attempts'])))
+            duration = time.perf_counter() - started
+            locked_accounts = ImmobUser.objects.filter(pk__in=[u.pk for u in users], is_active=False).count()
+        finally:
+            for email in used_emails:
+                LoginAttemptCache.reset(email)
+            for ip in used_ips:
+                LoginAttemptCache.reset_ip(ip)
+            ImmobUser.objects.filter(pk__in=[u.pk for u in users]).delete()
+
+        cuts = quantiles(timings, n=100, method='inclusive')
+        self.stdout.write(f"{options['attempts']} attempts in {duration:.2f}s ({options['attempts'] / duration:.1f} logins/s)")
+        self.stdout.write(f"latency p50 {cuts[49]:.1f}ms  p95 {cuts[94]:.1f}ms  p99 {cuts[98]:.1f}ms")
+        self.stdout.write(
+            f"DB queries {stats['queries']}, immob_users UPDATEs {stats['user_updates']}, "
+            f"accounts locked {locked_accounts}"
+        )
+        self.stdout.write(
+            f"attack attempts rejected: {stats['denied']} denied, {stats['locked']} reported locked; "
+            f"legitimate logins {stats['legit_ok']}/{stats['legit_total']}"
+        )
@@ -0,0 +1,86 @@
+from django.conf import settings
+from django.contrib.auth import authenticate
+from django.core.exceptions import PermissionDenied
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory
+from django.test.utils import override_settings
+from statistics import median
+from accounts.auth_backends import AccountLockedError
+from accounts.models import ImmobUser
+from accounts.services.login_attempt_cache import LoginAttemptCache
+import math
+import time
+import uuid
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the CPU time of one login (success, wrong password, unknown email) for a password '
+        'hasher work factor, and the cores needed for a peak login rate.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--samples', type=int, default=10, help='Logins measured per scenario')
+        parser.add_argument(
+            '--iterations', type=int, action='append',
+            help='PBKDF2 iterations to measure (repeatable, defaults to PASSWORD_HASHER_ITERATIONS)'
+        )
+        parser.add_argument(
+            '--peak', type=float, default=10.0,
+            help='Peak logins per second used to size the workers'
+        )
+
+    def _measure(self, email: str, password: str, samples: int) -> float:
+        """CPU médian (ms) d'un appel à authenticate() dans ce thread."""
+        factory = RequestFactory()
+        timings = []
+        for index in range(samples):
+            # IP distincte et compteurs remis à zéro : on mesure le hachage, pas le rejet anticipé
+            request = factory.post('/accounts/login/', REMOTE_ADDR=f"192.0.2.{index % 250 + 1}")
+            LoginAttemptCache.reset(email)
+            start = time.thread_time()
+            try:
+                authenticate(request, username=email, password=password)
+            except (AccountLockedError, PermissionDenied):
+                pass
+            timings.append((time.thread_time() - start) * 1000)
+        LoginAttemptCache.reset(email)
+        return median(timings)
+
+    def handle(self, *args, **options):
+        if options['samples'] < 1 or options['peak'] <= 0:
+            raise CommandError('--samples must be >= 1 and --peak > 0.')
+
+        run = uuid.uuid4().hex[:8]
+        password = f"bench-{run}"
+        iterations_list = options['iterations'] or [settings.PASSWORD_HASHER_ITERATIONS]
+
+        self.stdout.write(
+            f"{'iterations':>11} {'success':>10} {'wrong pwd':>10} {'unknown':>10} "
+            f"{'logins/s/core':>14} {'cores @ peak':>13}"
+        )
+        for iterations in iterations_list:
+            with override_settings(PASSWORD_HASHER_ITERATIONS=iterations):
+                user = ImmobUser.objects.create_user(
+                    email=f"bench-cpu-{run}-{iterations}@example.invalid",
+                    username=f"bench-cpu-{run}-{iterations}",
+                    password=password,
+                )
+                try:
+                    success = self._measure(user.email, password, options['samples'])
+                    wrong = self._measure(user.email, f"wrong-{run}", options['samples'])
+                    unknown = self._measure(f"nobody-{run}@example.invalid", password, options['samples'])
+                finally:
+                    ImmobUser.objects.filter(pk=user.pk).delete()
+
+            worst = max(success, wrong, unknown)
+            per_core = 1000 / worst
+            self.stdout.write(
+                f"{iterations:>11} {success:>8.1f}ms {wrong:>8.1f}ms {unknown:>8.1f}ms "
+                f"{per_core:>14.1f} {math.ceil(options['peak'] / per_core):>13}"
+            )
+
+        self.stdout.write(
+            "Gunicorn workers x threads only add login throughput up to the number of CPU cores: "
+            "size the login capacity on the 'cores @ peak' column."
+        )
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from accounts.models import ImmobUser
+from accounts.services.team_import_service import TeamImportService, team_import_service
+from pathlib import Path
+import json
+import time
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk-create MANAGER/VIEWER team members (and their building permissions) from a CSV or JSON file. '
+        'CSV header: email,password,first_name,last_name,phone,role,building_ids,permission_level '
+        '(building_ids separated by ";").'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('path', help='CSV or JSON file to import')
+        parser.add_argument('--owner', required=True,
+                            help='Email of the OWNER whose workspace receives the members')
+        parser.add_argument('--format', choices=TeamImportService.FORMATS,
+                            help='File format (defaults to the file extension)')
+        parser.add_argument('--workers', type=int,
+                            help='Password hashing processes (defaults to TEAM_IMPORT_HASH_WORKERS or the CPU count)')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only validate the rows, without hashing or writing anything')
+        return super().add_arguments(parser)
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        fmt = options['format'] or path.suffix.lstrip('.').lower()
+        if fmt not in TeamImportService.FORMATS:
+            raise CommandError("Unknown file format: use a .csv/.json file or --format.")
+
+        try:
+            owner = ImmobUser.objects.get(email=options['owner'], role=ImmobUser.UserRole.OWNER)
+        except ImmobUser.DoesNotExist:
+            raise CommandError(f"No OWNER account with email {options['owner']}.")
+
+        try:
+            rows = team_import_service.parse_rows(path.read_text(encoding='utf-8-sig'), fmt)
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        started = time.perf_counter()
+        result = team_import_service.import_members(
+            acting_user=owner,
+            rows=rows,
+            dry_run=options['dry_run'],
+            workers=options['workers'],
+        )
+        duration = time.perf_counter() - started
+
+        for error in result['errors']:
+            row = f"row {error['row']}" if error['row'] else "batch"
+            self.stderr.write(f"{row} ({error['email'] or '-'}): {json.dumps(error['errors'], ensure_ascii=False)}")
+
+        rejected = len(result['errors'])
+        if options['dry_run']:
+            self.stdout.write(f"{len(rows) - rejected} valid rows, {rejected} rejected (dry run).")
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(result['created'])} members created, {result['permissions_granted']} permissions granted, "
+            f"{rejected} rows rejected in {duration:.2f}s."
+        ))
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:49
+
+from django.db import migrations, models
+
+
+def backfill_deleted_at(apps, schema_editor):
+    """Lignes déjà supprimées : la dernière modification tient lieu de date de suppression."""
+    for model_name in ['ImmobUser', 'Workspace']:
+        model = apps.get_model('accounts', model_name)
+        model._base_manager.filter(is_deleted=True, deleted_at__isnull=True).update(
+            deleted_at=models.F('updated_at')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_userbuildingpermission_permission_level_score_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='immobuser',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='workspace',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AlterField(
+            model_name='immobuser',
+            name='is_deleted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='workspace',
+            name='is_deleted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(backfill_deleted_at, migrations.RunPython.noop),
+    ]
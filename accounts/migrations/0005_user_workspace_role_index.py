@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-18 04:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_soft_delete_deleted_at'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='immobuser',
+            index=models.Index(fields=['workspace', 'role', 'is_deleted'], name='user_ws_role_deleted'),
+        ),
+    ]
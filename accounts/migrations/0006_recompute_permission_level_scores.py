@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+# Copie figée de UserBuildingPermission.SCORE_MAPPING au moment de la migration
+SCORE_MAPPING = {
+    'VIEW': 1,
+    'CREATE': 2,
+    'UPDATE': 3,
+    'DELETE': 4,
+}
+
+
+def recompute_permission_level_scores(apps, schema_editor):
+    """
+    Les permissions créées par bulk_create (sans save()) ont gardé le score
+    par défaut de 1 : le score est recalculé pour toutes les lignes existantes.
+    """
+    UserBuildingPermission = apps.get_model('accounts', 'UserBuildingPermission')
+    UserBuildingPermission._base_manager.update(
+        permission_level_score=models.Case(
+            *[models.When(permission_level=level, then=models.Value(score)) for level, score in SCORE_MAPPING.items()],
+            default=models.Value(1),
+            output_field=models.PositiveIntegerField(),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0005_user_workspace_role_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(recompute_permission_level_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:05
+
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+OWNER = 'OWNER'
+
+
+def create_owner_workspaces(apps, schema_editor):
+    """
+    Rattache chaque Owner à un workspace (celui qu'il administre, sinon un
+    nouveau), puis les membres sans workspace à celui de l'Owner qui les a
+    créés : un utilisateur sans workspace ne voit plus aucune ligne.
+    """
+    ImmobUser = apps.get_model('accounts', 'ImmobUser')
+    Workspace = apps.get_model('accounts', 'Workspace')
+
+    for owner in ImmobUser._base_manager.filter(role=OWNER, workspace__isnull=True):
+        workspace = Workspace._base_manager.filter(admin=owner).first()
+        if workspace is None:
+            workspace = Workspace._base_manager.create(admin=owner, full_address='')
+        owner.workspace = workspace
+        owner.save(update_fields=['workspace'])
+
+    ImmobUser._base_manager.filter(
+        workspace__isnull=True,
+        created_by__role=OWNER,
+        created_by__workspace__isnull=False,
+    ).exclude(role=OWNER).update(
+        workspace_id=Subquery(
+            ImmobUser._base_manager.filter(pk=OuterRef('created_by_id')).values('workspace_id')[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_recompute_permission_level_scores'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_owner_workspaces, migrations.RunPython.noop),
+    ]
@@ -61,6 +61,7 @@ class ImmobUser(SoftDeletedModelMixin, ImmobBaseModel, AbstractUser):
         indexes = [
             models.Index(fields=['email', 'is_active']),
             models.Index(fields=['role', 'is_deleted']),
+            models.Index(fields=['workspace', 'role', 'is_deleted'], name='user_ws_role_deleted'),
         ]
     
     class InertiaMeta:
@@ -119,6 +120,54 @@ class Workspace(SoftDeletedModelMixin, ImmobBaseModel):
 
 
 
+class UserBuildingPermissionManager(models.Manager):
+    """Manager des permissions avec octroi en masse"""
+
+    def bulk_grant(self, permissions, batch_size=None):
+        """
+        Crée ou met à jour un ensemble de permissions en une seule requête
+        (upsert sur le couple (user, building)).
+
+        Contrairement à bulk_create seul, le permission_level_score est calculé
+        pour chaque permission (save() n'est pas appelé par bulk_create).
+        Les permissions en cache des utilisateurs concernés sont invalidées.
+
+        :param permissions: Instances UserBuildingPermission non sauvegardées.
+        :return: La liste des permissions créées ou mises à jour.
+        :raises ValueError: Si une permission n'a pas de bâtiment (NULL n'entre
+            jamais en conflit : l'upsert créerait un doublon au lieu de mettre à jour).
+        """
+        # Dédoublonnage sur (user, building) : la dernière occurrence l'emporte,
+        # une même ligne ne peut pas être mise à jour deux fois par l'upsert
+        grants = {}
+        for permission in permissions:
+            if permission.building_id is None:
+                raise ValueError("Une permission octroyée en masse doit viser un bâtiment.")
+            grants[(permission.user_id, permission.building_id)] = permission
+        grants = list(grants.values())
+        if not grants:
+            return []
+
+        # Calcul des scores en une passe (sans passer par save())
+        score_for = self.model.SCORE_MAPPING.get
+        for permission in grants:
+            permission.permission_level_score = score_for(permission.permission_level, 1)
+
+        created = self.bulk_create(
+            grants,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['user', 'building'],
+            update_fields=['permission_level', 'permission_level_score', 'granted_by', 'expires_at', 'updated_at'],
+        )
+
+        # bulk_create n'émet pas post_save : même invalidation que le signal
+        from accounts.signals import invalidate_user_permissions
+        invalidate_user_permissions({permission.user_id for permission in grants})
+
+        return created
+
+
 class UserBuildingPermission(ImmobBaseModel):
     """Permissions granulaires par bâtiment"""
     
@@ -128,6 +177,13 @@ class UserBuildingPermission(ImmobBaseModel):
         UPDATE = 'UPDATE', _('Update')
         DELETE = 'DELETE', _('Delete')
 
+    SCORE_MAPPING = {
+        PermissionLevel.VIEW: 1,
+        PermissionLevel.CREATE: 2,
+        PermissionLevel.UPDATE: 3,
+        PermissionLevel.DELETE: 4,
+    }
+
     user = models.ForeignKey(
         ImmobUser,
         on_delete=models.CASCADE,
@@ -163,14 +219,10 @@ class UserBuildingPermission(ImmobBaseModel):
     granted_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField(null=True, blank=True)
 
+    objects = UserBuildingPermissionManager()
+
     def save(self, *args, **kwargs):
-        SCORE_MAPPING = {
-            self.PermissionLevel.VIEW: 1,
-            self.PermissionLevel.CREATE: 2,
-            self.PermissionLevel.UPDATE: 3,
-            self.PermissionLevel.DELETE: 4,
-        }
-        self.permission_level_score = SCORE_MAPPING.get(self.PermissionLevel[self.permission_level], 1) 
+        self.permission_level_score = self.SCORE_MAPPING.get(self.PermissionLevel[self.permission_level], 1) 
         super().save(*args, **kwargs)
 
     class Meta:
@@ -1,4 +1,5 @@
 from accounts.models import ImmobUser, UserBuildingPermission
+from accounts.services.permission_cache import PermissionCache
 from django.utils import timezone
 from django.db.models import Q
 from typing import Dict
@@ -55,28 +56,17 @@ class AccessControlService:
                 'building_scope_perm': UserBuildingPermission.PermissionLevel.DELETE,
             }
 
-        # 2. Récupérer le QuerySet des permissions valides
-        permissions_queryset = AccessControlService._get_user_permissions_queryset(user)
+        # 2. Meilleur score valide, servi par le cache partagé
+        # (aucune requête DB tant que l'entrée de l'utilisateur est en cache)
+        best_level_score = PermissionCache.get_global_score(user.pk)
 
-        # 3. Extraire les niveaux de permission distincts (Optimisation)
-        # 1 seule requête DB pour obtenir la liste des droits (ex: ['VIEW', 'UPDATE'])
-        distinct_levels = permissions_queryset.values_list('permission_level', flat=True).distinct()
-
-        if not distinct_levels:
+        if not best_level_score:
             # L'utilisateur (MANAGER/VIEWER) n'a aucune permission valide
             return {
                 'building_scope_perm': 'none',
             }
 
-        # 4. Logique de Recherche du Meilleur Droit (en Python, très rapide)
-        # Nous trouvons le score le plus élevé parmi les permissions de l'utilisateur
-        best_level_score = 0
-        for level in distinct_levels:
-            score = AccessControlService.PERMISSION_HIERARCHY.get(level, 0)
-            if score > best_level_score:
-                best_level_score = score
-
-        # 5. Construction du Résultat Final
+        # 3. Construction du Résultat Final
         # Convertit le meilleur score trouvé (ex: 3) en string (ex: 'UPDATE')
         final_permission_str = AccessControlService.HIERARCHY_TO_STRING.get(best_level_score, 'none')
 
@@ -84,4 +74,17 @@ class AccessControlService:
         # globale sur Property, car elle reflète le droit maximal de l'utilisateur.
         return {
             'building_scope_perm': final_permission_str,
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    async def aget_global_permission(user: ImmobUser) -> Dict[str, str]:
+        """Version asynchrone de get_global_permission (vues async)."""
+        if user.role == ImmobUser.UserRole.OWNER:
+            return {
+                'building_scope_perm': UserBuildingPermission.PermissionLevel.DELETE,
+            }
+
+        best_level_score = await PermissionCache.aget_global_score(user.pk)
+        return {
+            'building_scope_perm': AccessControlService.HIERARCHY_TO_STRING.get(best_level_score, 'none'),
+        }
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, EmailStr, Field, field_validator
-from typing import Optional
-from accounts.models import ImmobUser
+from typing import List, Literal, Optional
+from uuid import UUID
+from accounts.models import ImmobUser, UserBuildingPermission
 
 class UserCreateDTO(BaseModel):
     """
@@ -45,4 +46,62 @@ class UserUpdateDTO(BaseModel):
             valid_roles = [ImmobUser.UserRole.MANAGER, ImmobUser.UserRole.VIEWER]
             if value not in valid_roles:
                 raise ValueError(f"Le rôle doit être l'un des suivants : {', '.join(valid_roles)}")
-        return value
\ No newline at end of file
+        return value
+
+
+class TeamMemberListQueryDTO(BaseModel):
+    """
+    Recherche, filtres, tri et pagination par curseur de la liste de l'équipe.
+    Utilisé par TeamService.list_team_members_page.
+    """
+    search: Optional[str] = Field(None, min_length=1, max_length=100) # Nom, prénom ou email
+    role: Optional[str] = None # MANAGER ou VIEWER
+    is_active: Optional[bool] = None
+    sort: Literal[
+        'created_at', '-created_at',
+        'last_name', '-last_name',
+        'email', '-email',
+    ] = '-created_at'
+    cursor: Optional[str] = None
+    page_size: int = Field(50, ge=1, le=200)
+
+    @field_validator('role')
+    def validate_role(cls, value):
+        """
+        Vérifie que si un rôle est fourni, il est valide (MANAGER ou VIEWER).
+        """
+        if value is not None:
+            valid_roles = [ImmobUser.UserRole.MANAGER, ImmobUser.UserRole.VIEWER]
+            if value not in valid_roles:
+                raise ValueError(f"Le rôle doit être l'un des suivants : {', '.join(valid_roles)}")
+        return value
+
+
+class TeamImportRowDTO(UserCreateDTO):
+    """
+    Ligne d'un import d'équipe : le membre à créer et ses permissions de bâtiment.
+    Utilisé par TeamImportService.import_members.
+    """
+    building_ids: List[UUID] = Field(default_factory=list) # CSV : identifiants séparés par ';'
+    permission_level: str = Field(default=UserBuildingPermission.PermissionLevel.VIEW)
+
+    @field_validator('building_ids', mode='before')
+    def split_building_ids(cls, value):
+        """
+        Accepte une liste ou une chaîne 'id1;id2' (colonne CSV).
+        """
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [part.strip() for part in value.split(';') if part.strip()]
+        return value
+
+    @field_validator('permission_level')
+    def validate_permission_level(cls, value):
+        """
+        Vérifie que le niveau de permission est valide.
+        """
+        valid_levels = [choice[0] for choice in UserBuildingPermission.PermissionLevel.choices]
+        if value not in valid_levels:
+            raise ValueError(f"Le niveau de permission doit être l'un des suivants : {', '.join(valid_levels)}")
+        return value
@@ -0,0 +1,102 @@
+from django.conf import settings
+from django.core.cache import cache
+from typing import Optional
+import hashlib
+import time
+
+
+class LoginAttemptCache:
+    """
+    Compteurs d'échecs de connexion dans le cache partagé, par email et par IP.
+
+    Chaque compteur est une fenêtre glissante approchée par deux fenêtres
+    fixes : estimation = précédente * (part restante de la fenêtre) + courante.
+    Aucun accès DB : seul le verrouillage effectif d'un compte est écrit
+    (par le LockoutAuthBackend).
+    """
+
+    NAMESPACE = 'login_attempts'
+
+    @staticmethod
+    def window() -> int:
+        return getattr(settings, 'MAX_FAILED_LOGIN_ATTEMPTS_TIME', 900)
+
+    @staticmethod
+    def max_per_email() -> int:
+        return getattr(settings, 'MAX_FAILED_LOGIN_ATTEMPTS', 5)
+
+    @staticmethod
+    def max_per_ip() -> int:
+        return getattr(settings, 'MAX_FAILED_LOGIN_ATTEMPTS_PER_IP', 50)
+
+    @classmethod
+    def _key(cls, scope: str, identifier: str, bucket: int) -> str:
+        # Empreinte : les emails/IP ne sont pas des clés de cache valides partout
+        digest = hashlib.sha256(identifier.strip().lower().encode()).hexdigest()[:32]
+        return f"{cls.NAMESPACE}:{scope}:{digest}:{bucket}"
+
+    @classmethod
+    def _buckets(cls):
+        window = cls.window()
+        now = time.time()
+        bucket = int(now // window)
+        return bucket, 1 - (now % window) / window
+
+    @classmethod
+    def _estimate(cls, scope: str, identifier: str, current: Optional[int] = None) -> float:
+        bucket, previous_weight = cls._buckets()
+        if current is None:
+            current = cache.get(cls._key(scope, identifier, bucket), 0)
+        previous = cache.get(cls._key(scope, identifier, bucket - 1), 0)
+        return previous * previous_weight + current
+
+    @classmethod
+    def _increment(cls, scope: str, identifier: str) -> float:
+        bucket, _ = cls._buckets()
+        key = cls._key(scope, identifier, bucket)
+        # La fenêtre courante doit survivre jusqu'à la fin de la suivante
+        cache.add(key, 0, timeout=2 * cls.window())
+        try:
+            current = cache.incr(key)
+        except ValueError:
+            # Clé évincée entre add() et incr()
+            cache.set(key, 1, timeout=2 * cls.window())
+            current = 1
+        return cls._estimate(scope, identifier, current)
+
+    @classmethod
+    def email_failures(cls, email: str) -> float:
+        return cls._estimate('email', email)
+
+    @classmethod
+    def ip_failures(cls, ip: Optional[str]) -> float:
+        return cls._estimate('ip', ip) if ip else 0
+
+    @classmethod
+    def is_email_blocked(cls, email: str) -> bool:
+        return cls.email_failures(email) >= cls.max_per_email()
+
+    @classmethod
+    def is_ip_blocked(cls, ip: Optional[str]) -> bool:
+        return cls.ip_failures(ip) >= cls.max_per_ip()
+
+    @classmethod
+    def record_failure(cls, email: str, ip: Optional[str]) -> float:
+        """Enregistre un échec ; retourne l'estimation glissante pour l'email."""
+        if ip:
+            cls._increment('ip', ip)
+        return cls._increment('email', email)
+
+    @classmethod
+    def reset(cls, email: str) -> None:
+        """Efface les échecs d'un email (connexion réussie ou déverrouillage)."""
+        bucket, _ = cls._buckets()
+        cache.delete_many([cls._key('email', email, bucket), cls._key('email', email, bucket - 1)])
+
+    @classmethod
+    def reset_ip(cls, ip: Optional[str]) -> None:
+        """Efface les échecs d'une IP (déblocage manuel, nettoyage des benchmarks)."""
+        if not ip:
+            return
+        bucket, _ = cls._buckets()
+        cache.delete_many([cls._key('ip', ip, bucket), cls._key('ip', ip, bucket - 1)])
@@ -0,0 +1,110 @@
+from accounts.models import UserBuildingPermission
+from core.cache import aversioned_key, bump_version, versioned_key
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from typing import Dict, Any, Iterable, Optional, Tuple
+from uuid import UUID
+
+
+class PermissionCache:
+    """
+    Cache partagé (inter-processus) des permissions de bâtiment d'un utilisateur.
+
+    Chaque entrée contient les scores par bâtiment et le meilleur score global.
+    Elle est versionnée par utilisateur (la version est incrémentée à chaque
+    octroi, révocation ou modification) et expire au plus tard à la prochaine
+    date `expires_at` de ses permissions.
+    """
+
+    NAMESPACE = 'permissions'
+
+    @staticmethod
+    def _default_timeout() -> int:
+        return getattr(settings, 'PERMISSION_CACHE_TIMEOUT', 300)
+
+    @staticmethod
+    def _rows_queryset(user_id: Any):
+        """Permissions valides de l'utilisateur : (building_id, score, expires_at)."""
+        return UserBuildingPermission.objects.filter(
+            user_id=user_id,
+        ).filter(
+            Q(expires_at__isnull=True) | Q(expires_at__gte=timezone.now())
+        ).values_list('building_id', 'permission_level_score', 'expires_at')
+
+    @staticmethod
+    def _aggregate(rows: Iterable[Tuple[UUID, int, Any]]) -> Dict[str, Any]:
+        scores: Dict[UUID, int] = {}
+        next_expiry = None
+        for building_id, score, expires_at in rows:
+            if score > scores.get(building_id, 0):
+                scores[building_id] = score
+            if expires_at and (next_expiry is None or expires_at < next_expiry):
+                next_expiry = expires_at
+
+        return {
+            'scores': scores,
+            'global_score': max(scores.values(), default=0),
+            'next_expiry': next_expiry,
+        }
+
+    @classmethod
+    def _build_entry(cls, user_id: Any) -> Dict[str, Any]:
+        """Calcule l'entrée de cache depuis la DB (1 seule requête)."""
+        return cls._aggregate(cls._rows_queryset(user_id))
+
+    @classmethod
+    def _timeout(cls, next_expiry: Optional[Any]) -> int:
+        """Durée de vie de l'entrée : jusqu'à la prochaine expiration de permission."""
+        timeout = cls._default_timeout()
+        if next_expiry is not None:
+            seconds = int((next_expiry - timezone.now()).total_seconds())
+            timeout = max(1, min(timeout, seconds))
+        return timeout
+
+    @classmethod
+    def get_entry(cls, user_id: Any) -> Dict[str, Any]:
+        """
+        Retourne l'entrée de permissions de l'utilisateur.
+        Aucun aller-retour DB dans le cas courant (entrée présente dans le cache).
+        """
+        key = versioned_key(cls.NAMESPACE, user_id)
+        entry = cache.get(key)
+        if entry is None:
+            entry = cls._build_entry(user_id)
+            cache.set(key, entry, timeout=cls._timeout(entry['next_expiry']))
+        return entry
+
+    @classmethod
+    async def aget_entry(cls, user_id: Any) -> Dict[str, Any]:
+        """Version asynchrone de get_entry (cache et ORM asynchrones)."""
+        key = await aversioned_key(cls.NAMESPACE, user_id)
+        entry = await cache.aget(key)
+        if entry is None:
+            entry = cls._aggregate([row async for row in cls._rows_queryset(user_id)])
+            await cache.aset(key, entry, timeout=cls._timeout(entry['next_expiry']))
+        return entry
+
+    @classmethod
+    def get_scores(cls, user_id: Any) -> Dict[UUID, int]:
+        """Scores valides par bâtiment : {building_id: permission_level_score}."""
+        return cls.get_entry(user_id)['scores']
+
+    @classmethod
+    def get_global_score(cls, user_id: Any) -> int:
+        """Meilleur score atteint par l'utilisateur sur l'ensemble de son périmètre."""
+        return cls.get_entry(user_id)['global_score']
+
+    @classmethod
+    async def aget_scores(cls, user_id: Any) -> Dict[UUID, int]:
+        return (await cls.aget_entry(user_id))['scores']
+
+    @classmethod
+    async def aget_global_score(cls, user_id: Any) -> int:
+        return (await cls.aget_entry(user_id))['global_score']
+
+    @classmethod
+    def invalidate(cls, user_id: Any) -> None:
+        """Invalide les permissions en cache d'un utilisateur."""
+        bump_version(cls.NAMESPACE, user_id)
@@ -0,0 +1,89 @@
+from accounts.models import ImmobUser, UserBuildingPermission
+from accounts.services.access_services import AccessControlService
+from accounts.services.permission_cache import PermissionCache
+from django.http import HttpRequest
+from typing import Dict, Optional, Any
+from uuid import UUID
+
+
+# Compteur de génération (local au processus) incrémenté à chaque modification
+# d'une UserBuildingPermission. Un resolver dont la génération est dépassée
+# recharge ses scores à la prochaine vérification.
+_generation = 0
+
+
+def invalidate_permission_resolvers() -> None:
+    """Invalide tous les resolvers de permissions existants du processus."""
+    global _generation
+    _generation += 1
+
+
+class PermissionResolver:
+    """
+    Résout les scores de permission d'un utilisateur sur ses bâtiments.
+
+    Toutes les paires (building_id, permission_level_score) valides sont
+    chargées en une seule fois (depuis le PermissionCache partagé), puis chaque
+    vérification est servie depuis la mémoire pendant toute la durée de la requête HTTP.
+    """
+
+    REQUEST_ATTR = '_permission_resolvers'
+    DEFAULT_SCORE = 0
+
+    def __init__(self, user: ImmobUser):
+        self.user = user
+        self._scores: Optional[Dict[UUID, int]] = None
+        self._generation: Optional[int] = None
+
+    @classmethod
+    def for_user(cls, user: ImmobUser, request: Optional[HttpRequest] = None) -> 'PermissionResolver':
+        """
+        Retourne le resolver de l'utilisateur attaché à la requête (créé au besoin).
+        Sans requête, un resolver éphémère est retourné.
+        """
+        if request is None:
+            return cls(user)
+
+        resolvers: Optional[Dict[Any, PermissionResolver]] = getattr(request, cls.REQUEST_ATTR, None)
+        if resolvers is None:
+            resolvers = {}
+            setattr(request, cls.REQUEST_ATTR, resolvers)
+
+        resolver = resolvers.get(user.pk)
+        if resolver is None:
+            resolver = resolvers[user.pk] = cls(user)
+        return resolver
+
+    def _load_scores(self) -> Dict[UUID, int]:
+        """Charge le meilleur score valide par bâtiment (cache partagé, sinon 1 requête DB)."""
+        return PermissionCache.get_scores(self.user.pk)
+
+    @property
+    def scores(self) -> Dict[UUID, int]:
+        """Scores par bâtiment, rechargés si une permission a changé entre-temps."""
+        if self._scores is None or self._generation != _generation:
+            self._generation = _generation
+            self._scores = self._load_scores()
+        return self._scores
+
+    async def ascores(self) -> Dict[UUID, int]:
+        """Version asynchrone de `scores` (vues async)."""
+        if self._scores is None or self._generation != _generation:
+            self._generation = _generation
+            self._scores = await PermissionCache.aget_scores(self.user.pk)
+        return self._scores
+
+    def get_score(self, building_id: UUID) -> int:
+        """Retourne le score de l'utilisateur sur un bâtiment (0 = aucun droit)."""
+        if self.user.role == ImmobUser.UserRole.OWNER:
+            return max(AccessControlService.PERMISSION_HIERARCHY.values())
+        return self.scores.get(building_id, self.DEFAULT_SCORE)
+
+    def has_permission(
+        self,
+        building_id: UUID,
+        required_permission: UserBuildingPermission.PermissionLevel
+    ) -> bool:
+        """Vérifie que l'utilisateur atteint le niveau requis sur le bâtiment."""
+        required_score = AccessControlService.PERMISSION_HIERARCHY.get(required_permission, self.DEFAULT_SCORE)
+        return self.get_score(building_id) >= required_score
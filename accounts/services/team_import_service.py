@@ -0,0 +1,224 @@
+from accounts.hashers import hash_password, init_hashing_worker
+from accounts.models import ImmobUser, UserBuildingPermission
+from accounts.services.dtos import TeamImportRowDTO
+from concurrent.futures import ProcessPoolExecutor
+from core.models import AuditLog
+from core.services.audit_log_service import AuditLogService
+from core.utils import format_pydantic_errors
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from holdings.models import Building
+from pydantic import ValidationError
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+import csv
+import io
+import json
+import multiprocessing
+import os
+
+
+class TeamImportService:
+    """
+    Import en masse des membres d'une équipe (MANAGER, VIEWER) depuis un
+    fichier CSV ou JSON.
+
+    Chaque ligne est validée séparément (TeamImportRowDTO) : une ligne
+    invalide est rapportée sans bloquer les autres. Les mots de passe des
+    lignes valides sont hachés dans un pool de processus, puis les comptes
+    et leurs permissions de bâtiment sont insérés en masse dans une seule
+    transaction, avec une seule entrée d'audit pour le lot.
+    """
+
+    FORMATS = ('csv', 'json')
+
+    @staticmethod
+    def parse_rows(content: str, fmt: str) -> List[Dict[str, Any]]:
+        """
+        Lit les lignes brutes d'un fichier d'import.
+        CSV : en-tête email,password,first_name,last_name,phone,role,building_ids,permission_level
+        JSON : liste d'objets avec les mêmes clés.
+        """
+        if fmt == 'csv':
+            rows = list(csv.DictReader(io.StringIO(content)))
+        elif fmt == 'json':
+            rows = json.loads(content)
+            if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                raise ValueError("Le fichier JSON doit contenir une liste d'objets.")
+        else:
+            raise ValueError(f"Format d'import non supporté : {fmt}")
+
+        # Cellules vides : valeur par défaut du DTO (ou champ requis manquant)
+        return [{key: value for key, value in row.items() if value not in ('', None)} for row in rows]
+
+    @staticmethod
+    def _hash_workers() -> int:
+        return getattr(settings, 'TEAM_IMPORT_HASH_WORKERS', None) or os.cpu_count() or 1
+
+    @classmethod
+    def _hash_passwords(cls, passwords: List[str], workers: Optional[int] = None) -> List[str]:
+        """
+        Hache les mots de passe en parallèle (le hachage est lié au CPU).
+        Les processus sont démarrés en mode spawn : ils n'héritent pas des
+        connexions DB du processus parent.
+        """
+        workers = min(workers or cls._hash_workers(), len(passwords))
+        if workers <= 1:
+            return [hash_password(password) for password in passwords]
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_hashing_worker,
+        ) as executor:
+            chunksize = max(1, len(passwords) // (workers * 4))
+            return list(executor.map(hash_password, passwords, chunksize=chunksize))
+
+    @staticmethod
+    def _validate(
+        acting_user: ImmobUser,
+        rows: List[Dict[str, Any]]
+    ) -> Tuple[List[Tuple[int, TeamImportRowDTO]], List[Dict[str, Any]]]:
+        """Valide chaque ligne ; retourne ([(n° de ligne, DTO)], [erreurs par ligne])."""
+        valid: List[Tuple[int, TeamImportRowDTO]] = []
+        errors: List[Dict[str, Any]] = []
+
+        for index, row in enumerate(rows, start=1):
+            try:
+                valid.append((index, TeamImportRowDTO.model_validate(row)))
+            except ValidationError as ve:
+                errors.append({'row': index, 'email': row.get('email'), 'errors': format_pydantic_errors(ve.errors())})
+
+        # Emails en double dans le fichier ou déjà utilisés
+        emails = [ImmobUser.objects.normalize_email(dto.email) for _, dto in valid]
+        # Comparaison insensible à la casse : normalize_email ne met en minuscules que le domaine
+        existing = set(
+            ImmobUser.objects.annotate(email_lower=Lower('email'))
+            .filter(email_lower__in={email.lower() for email in emails})
+            .values_list('email_lower', flat=True)
+        )
+        # Bâtiments hors du workspace de l'Owner
+        building_ids = {building_id for _, dto in valid for building_id in dto.building_ids}
+        workspace_buildings = set(
+            Building.objects.filter(id__in=building_ids, workspace_id=acting_user.workspace_id).values_list('id', flat=True)
+        )
+
+        seen = set()
+        accepted = []
+        for (index, dto), email in zip(valid, emails):
+            row_errors: Dict[str, List[str]] = {}
+            if email.lower() in existing:
+                row_errors.setdefault('email', []).append("Un compte existe déjà avec cet email.")
+            elif email.lower() in seen:
+                row_errors.setdefault('email', []).append("Email en double dans le fichier.")
+            unknown_buildings = [str(b) for b in dto.building_ids if b not in workspace_buildings]
+            if unknown_buildings:
+                row_errors.setdefault('building_ids', []).append(
+                    f"Bâtiments introuvables dans le workspace : {', '.join(unknown_buildings)}"
+                )
+            seen.add(email.lower())
+
+            if row_errors:
+                errors.append({'row': index, 'email': dto.email, 'errors': row_errors})
+            else:
+                accepted.append((index, dto))
+
+        errors.sort(key=lambda error: error['row'])
+        return accepted, errors
+
+    def import_members(
+        self,
+        acting_user: ImmobUser,
+        rows: List[Dict[str, Any]],
+        dry_run: bool = False,
+        workers: Optional[int] = None,
+        request=None
+    ) -> Dict[str, Any]:
+        """
+        Crée les membres valides et leurs permissions ; les lignes invalides sont rapportées.
+
+        :param acting_user: L'utilisateur qui exécute l'action (doit être OWNER).
+        :param rows: Lignes brutes (voir parse_rows).
+        :param dry_run: Valide seulement, sans hachage ni écriture.
+        :param workers: Nombre de processus de hachage (défaut : TEAM_IMPORT_HASH_WORKERS ou nb de CPU).
+        :param request: L'objet HttpRequest pour l'audit (IP, User-Agent).
+        :return: {'created': [{'row', 'id', 'email', 'role'}], 'permissions_granted': int, 'errors': [...]}
+        """
+        if acting_user.role != ImmobUser.UserRole.OWNER:
+            AuditLogService.log_action(
+                user=acting_user,
+                action=AuditLog.AuditAction.ACCESS_DENIED,
+                entity_type='ImmobUser',
+                entity_id='N/A (Tentative d\'import)',
+                request=request
+            )
+            raise PermissionError("Seul un Owner peut importer des membres d'équipe.")
+
+        accepted, errors = self._validate(acting_user, rows)
+        result = {'created': [], 'permissions_granted': 0, 'errors': errors}
+        if dry_run or not accepted:
+            return result
+
+        hashed_passwords = self._hash_passwords([dto.password for _, dto in accepted], workers)
+
+        users = [
+            ImmobUser(
+                username=ImmobUser.normalize_username(ImmobUser.objects.normalize_email(dto.email)),
+                email=ImmobUser.objects.normalize_email(dto.email),
+                password=hashed_password,
+                first_name=dto.first_name,
+                last_name=dto.last_name,
+                phone=dto.phone,
+                role=dto.role,
+                created_by=acting_user,
+                workspace_id=acting_user.workspace_id,
+            )
+            for (_, dto), hashed_password in zip(accepted, hashed_passwords)
+        ]
+
+        try:
+            with transaction.atomic():
+                ImmobUser.objects.bulk_create(users)
+                granted = UserBuildingPermission.objects.bulk_grant([
+                    UserBuildingPermission(
+                        user=user,
+                        building_id=building_id,
+                        permission_level=dto.permission_level,
+                        granted_by=acting_user,
+                    )
+                    for (_, dto), user in zip(accepted, users)
+                    for building_id in dto.building_ids
+                ])
+
+                # Une seule entrée d'audit pour l'ensemble du lot
+                AuditLogService.log_action(
+                    user=acting_user,
+                    action=AuditLog.AuditAction.CREATE,
+                    entity_type='ImmobUser',
+                    entity_id=str(UUID(int=0)),
+                    new_values={
+                        'imported_count': len(users),
+                        'users': [
+                            {'id': str(user.id), 'email': user.email, 'role': user.role}
+                            for user in users
+                        ],
+                        'permissions_granted': len(granted),
+                        'rejected_rows': [error['row'] for error in errors],
+                    },
+                    request=request,
+                )
+        except IntegrityError as e:
+            # Compte créé entre la validation et l'insertion : le lot est annulé
+            result['errors'].append({'row': None, 'email': None, 'errors': {'__all__': [str(e)]}})
+            return result
+
+        result['created'] = [
+            {'row': index, 'id': str(user.id), 'email': user.email, 'role': user.role}
+            for (index, _), user in zip(accepted, users)
+        ]
+        result['permissions_granted'] = len(granted)
+        return result
+
+
+team_import_service = TeamImportService()
@@ -1,8 +1,11 @@
 from accounts.models import ImmobUser
-from accounts.services.dtos import UserCreateDTO, UserUpdateDTO
+from accounts.services.dtos import UserCreateDTO, UserUpdateDTO, TeamMemberListQueryDTO
 from core.services.audit_log_service import AuditLogService
 from core.models import AuditLog
+from core.pagination import keyset_paginate, validate_cursor
 from django.db import transaction
+from django.db.models import Q
+from typing import Any, Dict, List
 from uuid import UUID
 
 class TeamService:
@@ -44,7 +47,7 @@ class TeamService:
             phone=user_data.phone,
             role=user_data.role,
             created_by=acting_user, # Trace qui a créé le compte
-            workspace=acting_user.workspace
+            workspace_id=acting_user.workspace_id
         )
 
         # --- 3. Audit Log ---
@@ -128,15 +131,76 @@ class TeamService:
     
     def list_team_members(self, acting_user: ImmobUser):
         """
-        Liste tous les membres de l'équipe.
+        Liste tous les membres de l'équipe du workspace de l'Owner.
 
         :param acting_user: L'utilisateur qui exécute l'action (doit être OWNER).
         :return: Une liste d'objets ImmobUser.
         """
         if acting_user.role != ImmobUser.UserRole.OWNER:
             raise PermissionError("Seul un Owner peut lister les membres de l'équipe.")
-        
-        return ImmobUser.objects.filter(is_deleted=False).exclude(role=ImmobUser.UserRole.OWNER)
+        # Sans workspace, aucun membre : jamais de filtre « workspace IS NULL »
+        if acting_user.workspace_id is None: # type: ignore
+            return ImmobUser.objects.none()
+
+        return ImmobUser.objects.filter(
+            workspace_id=acting_user.workspace_id,
+            role__in=self.TEAM_ROLES,
+            is_deleted=False,
+        )
+
+    # Rôles des membres de l'équipe (l'Owner n'en fait pas partie)
+    TEAM_ROLES = (ImmobUser.UserRole.MANAGER, ImmobUser.UserRole.VIEWER)
+    PAGE_FIELDS = ImmobUser.InertiaMeta.fields
+
+    @staticmethod
+    def _page_ordering(filters: TeamMemberListQueryDTO) -> List[str]:
+        # Clé de tri unique : départage par id dans le même sens
+        tie_breaker = '-id' if filters.sort.startswith('-') else 'id'
+        return [filters.sort, tie_breaker]
+
+    def validate_page_cursor(self, filters: TeamMemberListQueryDTO) -> None:
+        """
+        Vérifie le curseur de la page demandée avant toute requête.
+
+        :raises InvalidCursorError: Curseur invalide.
+        """
+        validate_cursor(ImmobUser, self._page_ordering(filters), filters.cursor)
+
+    def list_team_members_page(self, acting_user: ImmobUser, filters: TeamMemberListQueryDTO) -> Dict[str, Any]:
+        """
+        Retourne une page des membres de l'équipe du workspace de l'Owner,
+        paginée par curseur (index (workspace, role, is_deleted)).
+
+        :param acting_user: L'utilisateur qui exécute l'action (doit être OWNER).
+        :param filters: Recherche (nom, prénom, email), rôle, statut, tri et curseur.
+        :return: {'results': [...], 'next_cursor': str | None, 'has_more': bool}
+        :raises InvalidCursorError: Curseur invalide.
+        """
+        if acting_user.role != ImmobUser.UserRole.OWNER:
+            raise PermissionError("Seul un Owner peut lister les membres de l'équipe.")
+        if acting_user.workspace_id is None: # type: ignore
+            return {'results': [], 'next_cursor': None, 'has_more': False}
+
+        members_qs = ImmobUser.objects.filter(
+            workspace_id=acting_user.workspace_id,
+            role__in=[filters.role] if filters.role else self.TEAM_ROLES,
+            is_deleted=False,
+        )
+        if filters.is_active is not None:
+            members_qs = members_qs.filter(is_active=filters.is_active)
+        if filters.search:
+            members_qs = members_qs.filter(
+                Q(first_name__icontains=filters.search)
+                | Q(last_name__icontains=filters.search)
+                | Q(email__icontains=filters.search)
+            )
+
+        return keyset_paginate(
+            members_qs.values(*self.PAGE_FIELDS),
+            ordering=self._page_ordering(filters),
+            cursor=filters.cursor,
+            page_size=filters.page_size,
+        )
 # Initialisation du Service pour l'export
 
 team_service = TeamService()
\ No newline at end of file
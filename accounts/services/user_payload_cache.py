@@ -0,0 +1,55 @@
+from django.contrib.auth import SESSION_KEY
+from django.http import HttpRequest
+from core.cache import bump_version, get_version
+from typing import Any, Dict
+
+
+class UserPayloadCache:
+    """
+    Cache, dans la session, de la prop Inertia partagée `auth.user`.
+
+    L'entrée est versionnée par utilisateur (version incrémentée à chaque
+    modification du profil) : tant qu'elle est à jour, le payload est servi
+    sans charger l'utilisateur ni recalculer ses champs dérivés.
+    """
+
+    NAMESPACE = 'auth_user'
+    SESSION_ATTR = '_auth_user_payload'
+
+    @staticmethod
+    def _build_payload(user) -> Dict[str, Any]:
+        # Valeurs sérialisables en JSON (stockage en session)
+        return {
+            "id": str(user.id),
+            "name": user.get_full_name(),
+            "username": user.username,
+            "email": user.email,
+            "role": str(user.role),
+        }
+
+    @classmethod
+    def get(cls, request: HttpRequest) -> Dict[str, Any]:
+        """Payload de l'utilisateur connecté ({} pour un visiteur anonyme)."""
+        user_id = request.session.get(SESSION_KEY)
+        if user_id is None:
+            return {}
+
+        version = get_version(cls.NAMESPACE, user_id)
+        entry = request.session.get(cls.SESSION_ATTR)
+        if entry and entry['user_id'] == user_id and entry['version'] == version:
+            return entry['user']
+
+        if not request.user.is_authenticated:
+            return {}
+        payload = cls._build_payload(request.user)
+        request.session[cls.SESSION_ATTR] = {
+            'user_id': user_id,
+            'version': version,
+            'user': payload,
+        }
+        return payload
+
+    @classmethod
+    def invalidate(cls, user_id: Any) -> None:
+        """Invalide le payload de l'utilisateur dans toutes ses sessions."""
+        bump_version(cls.NAMESPACE, user_id)
@@ -0,0 +1,102 @@
+from accounts.models import ImmobUser
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.http import HttpRequest
+from core.cache import aversioned_key, bump_version, versioned_key
+from typing import Any, Dict, Optional
+
+
+class UserSnapshotCache:
+    """
+    Cache partagé de l'utilisateur de session (chargé par l'AuthenticationMiddleware).
+
+    Une entrée est un instantané de l'utilisateur (toutes ses colonnes sauf le
+    hash du mot de passe) indexé par utilisateur et par hash d'authentification
+    de session : elle n'est créée qu'après une vérification complète de la
+    session par django.contrib.auth. Tant qu'elle existe, l'utilisateur est
+    reconstruit sans requête DB ; seul le mot de passe, qui reste hors du
+    cache partagé, est chargé à la demande (vérification ou changement).
+    La version de l'utilisateur est incrémentée à chaque sauvegarde.
+    """
+
+    NAMESPACE = 'user_snapshot'
+    FIELDS = tuple(
+        field.attname for field in ImmobUser._meta.concrete_fields if field.attname != 'password'
+    )
+
+    @staticmethod
+    def _timeout() -> int:
+        return getattr(settings, 'USER_SNAPSHOT_CACHE_TIMEOUT', 300)
+
+    @staticmethod
+    def _session_ids(request: HttpRequest) -> Optional[Dict[str, Any]]:
+        """Identifiants d'authentification de la session (None si incomplets)."""
+        user_id = request.session.get(SESSION_KEY)
+        backend_path = request.session.get(BACKEND_SESSION_KEY)
+        session_hash = request.session.get(HASH_SESSION_KEY)
+        if not (user_id and session_hash) or backend_path not in settings.AUTHENTICATION_BACKENDS:
+            return None
+        return {'user_id': user_id, 'backend': backend_path, 'hash': session_hash}
+
+    @classmethod
+    def _snapshot(cls, user: ImmobUser) -> Dict[str, Any]:
+        return {field: getattr(user, field) for field in cls.FIELDS}
+
+    @classmethod
+    def _from_snapshot(cls, snapshot: Dict[str, Any], backend_path: str) -> ImmobUser:
+        # from_db attend les valeurs dans l'ordre des champs du modèle
+        field_names = [f.attname for f in ImmobUser._meta.concrete_fields if f.attname in snapshot]
+        user = ImmobUser.from_db(DEFAULT_DB_ALIAS, field_names, [snapshot[name] for name in field_names])
+        user.backend = backend_path
+        return user
+
+    @classmethod
+    def _is_cacheable(cls, user, ids: Dict[str, Any]) -> bool:
+        return (
+            user.is_authenticated
+            and str(user.pk) == str(ids['user_id'])
+            and user.get_session_auth_hash() == ids['hash']
+        )
+
+    @classmethod
+    def get_user(cls, request: HttpRequest):
+        """Remplaçant de django.contrib.auth.get_user servi depuis le cache."""
+        ids = cls._session_ids(request)
+        if ids is None:
+            return auth.get_user(request)
+
+        key = f"{versioned_key(cls.NAMESPACE, ids['user_id'])}:{ids['hash']}"
+        snapshot = cache.get(key)
+        if snapshot is not None:
+            return cls._from_snapshot(snapshot, ids['backend'])
+
+        user = auth.get_user(request)
+        if cls._is_cacheable(user, ids):
+            cache.set(key, cls._snapshot(user), timeout=cls._timeout())
+        return user
+
+    @classmethod
+    async def aget_user(cls, request: HttpRequest):
+        """Version asynchrone de get_user."""
+        ids = await sync_to_async(cls._session_ids)(request)
+        if ids is None:
+            return await auth.aget_user(request)
+
+        key = f"{await aversioned_key(cls.NAMESPACE, ids['user_id'])}:{ids['hash']}"
+        snapshot = await cache.aget(key)
+        if snapshot is not None:
+            return cls._from_snapshot(snapshot, ids['backend'])
+
+        user = await auth.aget_user(request)
+        if cls._is_cacheable(user, ids):
+            await cache.aset(key, cls._snapshot(user), timeout=cls._timeout())
+        return user
+
+    @classmethod
+    def invalidate(cls, user_id: Any) -> None:
+        """Invalide les instantanés de l'utilisateur (toutes sessions confondues)."""
+        bump_version(cls.NAMESPACE, user_id)
@@ -0,0 +1,73 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .models import ImmobUser, UserBuildingPermission, Workspace
+from .services.login_attempt_cache import LoginAttemptCache
+from .services.permission_cache import PermissionCache
+from .services.permission_resolver import invalidate_permission_resolvers
+from .services.user_payload_cache import UserPayloadCache
+from .services.user_snapshot_cache import UserSnapshotCache
+
+
+def invalidate_user_permissions(user_ids):
+    """Invalide les permissions en mémoire et en cache des utilisateurs donnés"""
+    user_ids = set(user_ids)
+    invalidate_permission_resolvers()
+
+    def invalidate():
+        for user_id in user_ids:
+            PermissionCache.invalidate(user_id)
+
+    # Immédiatement (lectures dans la transaction courante) puis au commit
+    # (empêche un autre worker de remettre en cache l'état antérieur)
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=UserBuildingPermission)
+@receiver(post_delete, sender=UserBuildingPermission)
+def invalidate_permissions_on_change(sender, instance, **kwargs):
+    """Invalide les permissions en mémoire et en cache lorsqu'une permission change"""
+    invalidate_user_permissions([instance.user_id])
+
+
+@receiver(post_save, sender=ImmobUser)
+@receiver(post_delete, sender=ImmobUser)
+def invalidate_user_caches_on_change(sender, instance, update_fields=None, **kwargs):
+    """
+    Invalide l'instantané de l'utilisateur de session et la prop partagée
+    `auth.user` lorsque l'utilisateur change (profil, mot de passe, verrouillage)
+    """
+    user_id = instance.pk
+    # La mise à jour de last_login (à chaque connexion) ne touche que l'instantané
+    last_login_only = update_fields is not None and set(update_fields) <= {'last_login'}
+
+    def invalidate():
+        UserSnapshotCache.invalidate(user_id)
+        if not last_login_only:
+            UserPayloadCache.invalidate(user_id)
+
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=ImmobUser)
+def reset_login_attempts_on_unlock(sender, instance, **kwargs):
+    """Efface les échecs en cache lorsqu'un compte verrouillé est réactivé"""
+    # Un compte réactivé garde son compteur persisté jusqu'à la prochaine connexion réussie
+    if instance.is_active and instance.failed_login_attempts > 0:
+        LoginAttemptCache.reset(instance.email)
+
+
+@receiver(post_save, sender=ImmobUser)
+def create_owner_workspace(sender, instance, created, raw=False, **kwargs):
+    """
+    Crée le workspace d'un nouvel Owner (createsuperuser, administration) :
+    les données et l'équipe d'un Owner sont toujours rattachées à un workspace.
+    """
+    if not created or raw or instance.role != ImmobUser.UserRole.OWNER or instance.workspace_id is not None:
+        return
+    workspace = Workspace.all_objects.create(admin=instance, full_address='')
+    # update() : pas de second post_save pour le même utilisateur
+    ImmobUser.objects.filter(pk=instance.pk).update(workspace=workspace)
+    instance.workspace = workspace
@@ -1,3 +1,471 @@
-from django.test import TestCase
+import hashlib
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import get_hasher
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied
+from django.test import RequestFactory, TestCase, override_settings
+
+from accounts.auth_backends import AccountLockedError, LockoutAuthBackend
+from accounts.checks import check_login_attempt_cache
+from accounts.models import ImmobUser, UserBuildingPermission
+from accounts.services.dtos import TeamMemberListQueryDTO, UserUpdateDTO
+from accounts.services.login_attempt_cache import LoginAttemptCache
+from accounts.services.permission_cache import PermissionCache
+from accounts.services.team_import_service import team_import_service
+from accounts.services.team_service import team_service
+from accounts.services.user_snapshot_cache import UserSnapshotCache
+from core.models import AuditLog
+from core.utils import get_client_ip
+from holdings.models import Building
+
+
+def create_user(name, role=ImmobUser.UserRole.OWNER, **extra):
+    """Utilisateur sans mot de passe utilisable (aucun hachage) ; un Owner reçoit son workspace."""
+    return ImmobUser.objects.create_user(
+        username=name, email=f'{name}@example.com', password=None, role=role, **extra
+    )
+
+
+class TeamMemberPageTests(TestCase):
+    """Liste paginée des membres de l'équipe : curseurs, filtres et périmètre du workspace."""
+
+    INERTIA_HEADERS = {
+        'HTTP_X_INERTIA': 'true',
+        'HTTP_X_INERTIA_VERSION': '1.0',
+        'HTTP_X_INERTIA_PARTIAL_COMPONENT': 'dashboard/Teams',
+        'HTTP_X_INERTIA_PARTIAL_DATA': 'users,pagination',
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('team-owner')
+        workspace = cls.owner.workspace
+        cls.members = [
+            create_user('ada', ImmobUser.UserRole.MANAGER, workspace=workspace, last_name='Lovelace'),
+            create_user('alan', ImmobUser.UserRole.VIEWER, workspace=workspace, last_name='Turing'),
+            create_user('grace', ImmobUser.UserRole.MANAGER, workspace=workspace, last_name='Hopper'),
+            create_user('edsger', ImmobUser.UserRole.VIEWER, workspace=workspace, last_name='Dijkstra', is_active=False),
+            create_user('barbara', ImmobUser.UserRole.VIEWER, workspace=workspace, last_name='Liskov'),
+        ]
+        cls.other_owner = create_user('team-other-owner')
+        cls.other_member = create_user('other', ImmobUser.UserRole.MANAGER, workspace=cls.other_owner.workspace)
+        cls.orphan = create_user('orphan', ImmobUser.UserRole.VIEWER)
+        cls.homeless_owner = create_user('team-homeless')
+        ImmobUser.objects.filter(pk=cls.homeless_owner.pk).update(workspace=None)
+        cls.homeless_owner.workspace = None
+
+    def walk(self, acting_user, **filters):
+        """Parcourt toutes les pages ; retourne les emails dans l'ordre reçu."""
+        emails, cursor = [], None
+        while True:
+            page = team_service.list_team_members_page(
+                acting_user, TeamMemberListQueryDTO(page_size=2, cursor=cursor, **filters)
+            )
+            emails.extend(row['email'] for row in page['results'])
+            if not page['has_more']:
+                self.assertIsNone(page['next_cursor'])
+                return emails
+            cursor = page['next_cursor']
+
+    def test_cursor_round_trip_for_each_sort(self):
+        for sort, key in (('-created_at', 'created_at'), ('last_name', 'last_name'), ('-email', 'email')):
+            with self.subTest(sort=sort):
+                ordered = sorted(
+                    self.members, key=lambda user: (getattr(user, key), user.id), reverse=sort.startswith('-')
+                )
+                self.assertEqual(self.walk(self.owner, sort=sort), [user.email for user in ordered])
+
+    def test_filters(self):
+        self.assertEqual(
+            sorted(self.walk(self.owner, role=ImmobUser.UserRole.MANAGER)),
+            ['ada@example.com', 'grace@example.com'],
+        )
+        self.assertEqual(self.walk(self.owner, is_active=False), ['edsger@example.com'])
+        self.assertEqual(sorted(self.walk(self.owner, search='LI')), ['barbara@example.com'])
+        self.assertEqual(self.walk(self.owner, search='ALAN@'), ['alan@example.com'])
+
+    def test_scope_is_the_owner_workspace(self):
+        self.assertEqual(self.walk(self.other_owner), ['other@example.com'])
+        self.assertEqual(self.walk(self.homeless_owner), [])
+        self.assertFalse(team_service.list_team_members(self.homeless_owner).exists())
+
+    def test_non_owner_is_refused(self):
+        with self.assertRaises(PermissionError):
+            team_service.list_team_members_page(self.members[0], TeamMemberListQueryDTO())
+
+    def test_endpoint_pages_by_cursor(self):
+        self.client.force_login(self.owner)
+        emails, cursor = [], None
+        while True:
+            url = '/dashboard/teams/?page_size=2' + (f'&cursor={cursor}' if cursor else '')
+            response = self.client.get(url, **self.INERTIA_HEADERS)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertIn('users', data['mergeProps'])
+            emails.extend(user['email'] for user in data['props']['users'])
+            cursor = data['props']['pagination']['next_cursor']
+            if not data['props']['pagination']['has_more']:
+                break
+
+        self.assertEqual(sorted(emails), sorted(user.email for user in self.members))
+
+    def test_endpoint_rejects_invalid_cursor(self):
+        self.client.force_login(self.owner)
+        response = self.client.get(
+            '/dashboard/teams/?cursor=not-a-cursor', HTTP_X_INERTIA='true', HTTP_X_INERTIA_VERSION='1.0'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('errors', response.json()['props'])
+
+
+@override_settings(
+    PASSWORD_HASHER_ITERATIONS=1000,
+    MAX_FAILED_LOGIN_ATTEMPTS=3,
+    MAX_FAILED_LOGIN_ATTEMPTS_PER_IP=4,
+    MAX_FAILED_LOGIN_ATTEMPTS_TIME=900,
+)
+class LoginAttemptTests(TestCase):
+    """Verrouillage des connexions : fenêtre glissante, rejet par IP et IP du client derrière les proxies."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('login-user')
+        cls.user.set_password('correct horse')
+        cls.user.save(update_fields=['password'])
+
+    def setUp(self):
+        cache.clear()
+        self.backend = LockoutAuthBackend()
+
+    def request(self, ip='10.0.0.1', **meta):
+        return RequestFactory().post('/login/', REMOTE_ADDR=ip, **meta)
+
+    def login(self, password, email='login-user@example.com', ip='10.0.0.1'):
+        return self.backend.authenticate(self.request(ip), username=email, password=password)
+
+    def test_failures_slide_out_of_the_window(self):
+        clock = 'accounts.services.login_attempt_cache.time.time'
+        # Début de la fenêtre n° 10 (900 s par fenêtre)
+        with mock.patch(clock, return_value=9000.0):
+            for _ in range(2):
+                LoginAttemptCache.record_failure('slide@example.com', None)
+            self.assertEqual(LoginAttemptCache.email_failures('slide@example.com'), 2)
+
+        # Milieu de la fenêtre suivante : la précédente compte pour moitié
+        with mock.patch(clock, return_value=9900.0 + 450):
+            self.assertEqual(LoginAttemptCache.email_failures('slide@example.com'), 1)
+            LoginAttemptCache.record_failure('slide@example.com', None)
+            self.assertEqual(LoginAttemptCache.email_failures('slide@example.com'), 2)
+
+        # Deux fenêtres plus tard : plus rien
+        with mock.patch(clock, return_value=9000.0 + 3 * 900):
+            self.assertEqual(LoginAttemptCache.email_failures('slide@example.com'), 0)
+
+    def test_account_is_locked_at_the_threshold(self):
+        for _ in range(3):
+            with self.assertRaises(PermissionDenied):
+                self.login('wrong')
+
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.is_active)
+        self.assertEqual(self.user.failed_login_attempts, 3)
+        with self.assertRaises(AccountLockedError):
+            self.login('correct horse')
+
+    def test_successful_login_resets_the_email_counter(self):
+        for _ in range(2):
+            with self.assertRaises(PermissionDenied):
+                self.login('wrong')
+
+        self.assertEqual(self.login('correct horse'), self.user)
+        self.assertEqual(LoginAttemptCache.email_failures('login-user@example.com'), 0)
+
+    def test_ip_over_threshold_is_rejected_without_query(self):
+        for index in range(4):
+            LoginAttemptCache.record_failure(f'stuffing-{index}@example.com', '10.0.0.66')
+
+        with self.assertNumQueries(0), self.assertRaises(PermissionDenied):
+            self.login('correct horse', ip='10.0.0.66')
+        # Le compte visé n'est pas verrouillé : une autre IP se connecte normalement
+        self.assertEqual(self.login('correct horse', ip='10.0.0.2'), self.user)
+
+    def test_client_ip_honours_num_proxies(self):
+        meta = {'HTTP_X_FORWARDED_FOR': '6.6.6.6, 203.0.113.7, 10.0.0.5'}
+        cases = ((0, '192.168.1.1'), (1, '10.0.0.5'), (2, '203.0.113.7'), (5, '6.6.6.6'))
+        for num_proxies, expected in cases:
+            with self.subTest(num_proxies=num_proxies), override_settings(NUM_PROXIES=num_proxies):
+                self.assertEqual(get_client_ip(self.request('192.168.1.1', **meta)), expected)
+
+    def test_spoofed_header_does_not_evade_ip_lockout(self):
+        for index in range(4):
+            LoginAttemptCache.record_failure(f'stuffing-{index}@example.com', '10.0.0.66')
+
+        request = self.request('10.0.0.66', HTTP_X_FORWARDED_FOR='1.2.3.4')
+        with self.assertRaises(PermissionDenied):
+            self.backend.authenticate(request, username='login-user@example.com', password='correct horse')
+
+    def test_non_atomic_cache_is_reported(self):
+        file_cache = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/nonexistent'}}
+        redis_cache = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost'}}
+
+        with override_settings(CACHES=file_cache, DEBUG=False):
+            self.assertEqual([error.id for error in check_login_attempt_cache(None)], ['accounts.E001'])
+        with override_settings(CACHES=file_cache, DEBUG=True):
+            self.assertEqual([error.id for error in check_login_attempt_cache(None)], ['accounts.W001'])
+        with override_settings(CACHES=redis_cache, DEBUG=False):
+            self.assertEqual(check_login_attempt_cache(None), [])
+
+
+class BulkGrantTests(TestCase):
+    """Octroi de permissions en masse : upsert sur (user, building), scores et invalidation du cache."""
+
+    Level = UserBuildingPermission.PermissionLevel
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('grant-owner')
+        workspace = cls.owner.workspace
+        cls.manager = create_user('grant-manager', ImmobUser.UserRole.MANAGER, workspace=workspace)
+        cls.buildings = [
+            Building.objects.create(workspace=workspace, name=f'G{index}', street='Rue', city='Douala')
+            for index in range(2)
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def grant(self, building, level):
+        return UserBuildingPermission(user=self.manager, building=building, permission_level=level, granted_by=self.owner)
+
+    def rows(self):
+        return set(
+            UserBuildingPermission.objects.filter(user=self.manager)
+            .values_list('building__name', 'permission_level', 'permission_level_score')
+        )
+
+    def test_upsert_updates_level_and_score(self):
+        UserBuildingPermission.objects.bulk_grant([self.grant(self.buildings[0], self.Level.VIEW)])
+
+        UserBuildingPermission.objects.bulk_grant([
+            self.grant(self.buildings[0], self.Level.CREATE),
+            self.grant(self.buildings[1], self.Level.UPDATE),
+            # La dernière occurrence d'un couple (user, building) l'emporte
+            self.grant(self.buildings[0], self.Level.DELETE),
+        ])
+
+        self.assertEqual(self.rows(), {('G0', 'DELETE', 4), ('G1', 'UPDATE', 3)})
+
+    def test_cached_scores_are_invalidated(self):
+        UserBuildingPermission.objects.bulk_grant([self.grant(self.buildings[0], self.Level.VIEW)])
+        self.assertEqual(PermissionCache.get_scores(self.manager.pk), {self.buildings[0].pk: 1})
+
+        UserBuildingPermission.objects.bulk_grant([self.grant(self.buildings[0], self.Level.UPDATE)])
+
+        self.assertEqual(PermissionCache.get_scores(self.manager.pk), {self.buildings[0].pk: 3})
+
+    def test_grant_without_building_is_rejected(self):
+        with self.assertRaises(ValueError):
+            UserBuildingPermission.objects.bulk_grant([
+                self.grant(self.buildings[0], self.Level.VIEW),
+                self.grant(None, self.Level.VIEW),
+            ])
+
+        self.assertEqual(self.rows(), set())
+
+
+@override_settings(PASSWORD_HASHER_ITERATIONS=1000)
+class TeamImportTests(TestCase):
+    """Import d'équipe : nouveaux comptes, emails existants ou en double (casse comprise), une seule entrée d'audit."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('import-owner')
+        cls.buildings = [
+            Building.objects.create(workspace=cls.owner.workspace, name=f'I{index}', street='Rue', city='Douala')
+            for index in range(2)
+        ]
+        cls.foreign_building = Building.objects.create(
+            workspace=create_user('import-other-owner').workspace, name='X', street='Rue', city='Douala',
+        )
+        create_user('existing', ImmobUser.UserRole.VIEWER, workspace=cls.owner.workspace)
+
+    def csv(self):
+        b0, b1, foreign = self.buildings[0].pk, self.buildings[1].pk, self.foreign_building.pk
+        return (
+            "email,password,first_name,last_name,phone,role,building_ids,permission_level\n"
+            f"new@example.com,secret-pass,New,Member,,MANAGER,{b0};{b1},UPDATE\n"
+            "Existing@Example.com,secret-pass,Old,Member,,VIEWER,,\n"
+            "NEW@example.com,secret-pass,Twin,Member,,VIEWER,,\n"
+            "short@example.com,short,Short,Password,,VIEWER,,\n"
+            f"foreign@example.com,secret-pass,Foreign,Building,,VIEWER,{foreign},\n"
+            "second@example.com,secret-pass,Second,Member,,VIEWER,,\n"
+        )
+
+    def import_csv(self, **options):
+        rows = team_import_service.parse_rows(self.csv(), 'csv')
+        return team_import_service.import_members(self.owner, rows, workers=1, **options)
+
+    def import_logs(self):
+        return AuditLog.objects.filter(user=self.owner, action=AuditLog.AuditAction.CREATE, entity_type='ImmobUser')
+
+    def test_mixed_file(self):
+        result = self.import_csv()
+
+        self.assertEqual([(row['row'], row['email']) for row in result['created']],
+                         [(1, 'new@example.com'), (6, 'second@example.com')])
+        self.assertEqual(result['permissions_granted'], 2)
+        errors = {error['row']: error['errors'] for error in result['errors']}
+        self.assertEqual(sorted(errors), [2, 3, 4, 5])
+        self.assertEqual(errors[2], {'email': ["Un compte existe déjà avec cet email."]})
+        self.assertEqual(errors[3], {'email': ["Email en double dans le fichier."]})
+        self.assertIn('password', errors[4])
+        self.assertIn('building_ids', errors[5])
+
+        member = ImmobUser.objects.get(email='new@example.com')
+        self.assertEqual(member.workspace_id, self.owner.workspace_id)
+        self.assertEqual(member.created_by, self.owner)
+        self.assertTrue(member.check_password('secret-pass'))
+        self.assertEqual(
+            set(member.user_building_permissions.values_list('building_id', 'permission_level_score')),
+            {(self.buildings[0].pk, 3), (self.buildings[1].pk, 3)},
+        )
+        self.assertEqual(ImmobUser.objects.filter(email__iexact='existing@example.com').count(), 1)
+
+    def test_one_audit_entry_for_the_batch(self):
+        result = self.import_csv()
+
+        log = self.import_logs().get()
+        self.assertEqual(log.new_values['imported_count'], 2)
+        self.assertEqual({user['email'] for user in log.new_values['users']}, {'new@example.com', 'second@example.com'})
+        self.assertEqual(log.new_values['permissions_granted'], result['permissions_granted'])
+        self.assertEqual(log.new_values['rejected_rows'], [2, 3, 4, 5])
+
+    def test_dry_run_writes_nothing(self):
+        result = self.import_csv(dry_run=True)
+
+        self.assertEqual(result['created'], [])
+        self.assertEqual(len(result['errors']), 4)
+        self.assertFalse(ImmobUser.objects.filter(email='new@example.com').exists())
+        self.assertFalse(self.import_logs().exists())
+
+
+class UserSnapshotCacheTests(TestCase):
+    """Instantané de l'utilisateur de session : servi sans requête, invalidé à chaque modification."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_user('snapshot-owner')
+        cls.member = create_user(
+            'snapshot-member', ImmobUser.UserRole.MANAGER, workspace=cls.owner.workspace, first_name='Ada',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.member)
+        # Session chargée une fois : seules les requêtes de l'utilisateur sont comptées
+        self.session = self.client.session
+        self.session.keys()
+
+    def session_user(self):
+        request = RequestFactory().get('/')
+        request.session = self.session
+        return UserSnapshotCache.get_user(request)
+
+    def test_snapshot_is_served_without_query(self):
+        self.assertEqual(self.session_user(), self.member)
+
+        with self.assertNumQueries(0):
+            user = self.session_user()
+        self.assertEqual(user.first_name, 'Ada')
+        self.assertEqual(user.workspace_id, self.owner.workspace_id)
+
+    def test_save_invalidates_the_snapshot(self):
+        self.session_user()
+
+        self.member.first_name = 'Grace'
+        self.member.save()
+
+        self.assertEqual(self.session_user().first_name, 'Grace')
+
+    def test_role_change_invalidates_the_snapshot(self):
+        self.session_user()
+
+        team_service.update_user(self.owner, self.member.id, UserUpdateDTO(role=ImmobUser.UserRole.VIEWER))
+
+        self.assertEqual(self.session_user().role, ImmobUser.UserRole.VIEWER)
+
+    def test_deactivation_logs_the_session_out(self):
+        self.assertTrue(self.session_user().is_authenticated)
+
+        self.member.is_active = False
+        self.member.save(update_fields=['is_active'])
+
+        self.assertFalse(self.session_user().is_authenticated)
+
+    def test_other_users_keep_their_snapshot(self):
+        self.session_user()
+
+        self.owner.first_name = 'Changed'
+        self.owner.save()
+
+        with self.assertNumQueries(0):
+            self.session_user()
+
+
+@override_settings(PASSWORD_HASHER_ITERATIONS=1000)
+class PasswordHasherTests(TestCase):
+    """Facteur de travail configurable : re-hachage à la connexion et coût identique pour un email inconnu."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user('hasher-user')
+        cls.user.set_password('correct horse')
+        cls.user.save(update_fields=['password'])
+
+    def setUp(self):
+        cache.clear()
+        self.backend = LockoutAuthBackend()
+
+    def login(self, email, password):
+        return self.backend.authenticate(
+            RequestFactory().post('/login/', REMOTE_ADDR='10.0.0.1'), username=email, password=password
+        )
+
+    def pbkdf2_iterations(self, email, password):
+        """Nombre d'itérations de chaque calcul PBKDF2 effectué pendant une tentative de connexion."""
+        with mock.patch('django.utils.crypto.hashlib.pbkdf2_hmac', wraps=hashlib.pbkdf2_hmac) as pbkdf2:
+            try:
+                self.login(email, password)
+            except PermissionDenied:
+                pass
+        return [call.args[3] for call in pbkdf2.call_args_list]
+
+    def test_hash_uses_configured_iterations(self):
+        self.assertEqual(get_hasher().decode(self.user.password)['iterations'], 1000)
+
+    def test_new_iteration_count_rehashes_on_next_login(self):
+        with override_settings(PASSWORD_HASHER_ITERATIONS=2000):
+            self.assertTrue(get_hasher().must_update(self.user.password))
+
+            self.assertEqual(self.login('hasher-user@example.com', 'correct horse'), self.user)
+
+            self.user.refresh_from_db()
+            self.assertEqual(get_hasher().decode(self.user.password)['iterations'], 2000)
+            self.assertFalse(get_hasher().must_update(self.user.password))
+            self.assertTrue(self.user.check_password('correct horse'))
+
+    def test_failed_login_does_not_rehash(self):
+        with override_settings(PASSWORD_HASHER_ITERATIONS=2000), self.assertRaises(PermissionDenied):
+            self.login('hasher-user@example.com', 'wrong')
+
+        self.user.refresh_from_db()
+        self.assertEqual(get_hasher().decode(self.user.password)['iterations'], 1000)
+
+    def test_unknown_email_pays_the_same_hashing_cost(self):
+        known = self.pbkdf2_iterations('hasher-user@example.com', 'wrong')
+        unknown = self.pbkdf2_iterations('nobody@example.com', 'wrong')
+
+        self.assertEqual(known, [1000])
+        self.assertEqual(unknown, known)
@@ -0,0 +1,61 @@
+import time
+from typing import Any
+from django.core.cache import cache
+
+
+def _version_key(namespace: str, key: Any) -> str:
+    return f"{namespace}:version:{key}"
+
+
+def get_version(namespace: str, key: Any) -> int:
+    """
+    Retourne la version courante d'une entrée du cache partagé.
+
+    La version initiale est basée sur l'horloge : si la clé de version est
+    évincée du cache, la nouvelle version ne peut pas retomber sur une
+    ancienne et réactiver des données périmées.
+    """
+    version_key = _version_key(namespace, key)
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, time.time_ns(), timeout=None)
+        version = cache.get(version_key, 0)
+    return version
+
+
+def bump_version(namespace: str, key: Any) -> None:
+    """
+    Invalide toutes les entrées versionnées d'une clé (tous workers confondus).
+
+    Atomique avec Redis ou Memcached. Avec le backend fichier, incr() est une
+    lecture suivie d'une écriture : deux invalidations simultanées peuvent ne
+    produire qu'une seule nouvelle version, et une entrée recalculée entre les
+    deux peut rester périmée jusqu'à son expiration (PERMISSION_CACHE_TIMEOUT).
+    L'invalidation y est donc « au mieux ».
+    """
+    version_key = _version_key(namespace, key)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        # Clé absente ou évincée : une nouvelle version horodatée suffit
+        cache.set(version_key, time.time_ns(), timeout=None)
+
+
+def versioned_key(namespace: str, key: Any) -> str:
+    """Construit la clé de cache correspondant à la version courante."""
+    return f"{namespace}:{key}:v{get_version(namespace, key)}"
+
+
+async def aget_version(namespace: str, key: Any) -> int:
+    """Version asynchrone de get_version (vues async)."""
+    version_key = _version_key(namespace, key)
+    version = await cache.aget(version_key)
+    if version is None:
+        await cache.aadd(version_key, time.time_ns(), timeout=None)
+        version = await cache.aget(version_key, 0)
+    return version
+
+
+async def aversioned_key(namespace: str, key: Any) -> str:
+    """Version asynchrone de versioned_key (vues async)."""
+    return f"{namespace}:{key}:v{await aget_version(namespace, key)}"
@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Iterator
+
+
+# Sentinelle : aucun workspace actif (commandes, tâches de fond) -> pas de filtrage.
+# Un workspace actif valant None (utilisateur sans workspace) ne voit aucune ligne.
+UNSCOPED = object()
+
+_current_workspace: ContextVar[Any] = ContextVar('current_workspace', default=UNSCOPED)
+
+
+class LazyWorkspace:
+    """
+    Workspace actif résolu au premier usage (première requête sur un modèle
+    rattaché à un workspace), puis mémorisé : une requête qui n'en fait pas
+    n'a pas besoin de charger la session ni l'utilisateur.
+    """
+
+    def __init__(self, resolver: Callable[[], Any]):
+        self._resolver = resolver
+        self._resolved = False
+        self._workspace_id: Any = UNSCOPED
+
+    def resolve(self) -> Any:
+        if not self._resolved:
+            self._workspace_id = self._resolver()
+            self._resolved = True
+        return self._workspace_id
+
+
+def get_current_workspace_id() -> Any:
+    """Retourne l'id du workspace actif, ou UNSCOPED hors contexte de requête."""
+    workspace = _current_workspace.get()
+    if isinstance(workspace, LazyWorkspace):
+        return workspace.resolve()
+    return workspace
+
+
+def set_current_workspace(workspace_id: Any) -> Token:
+    """
+    Active un workspace pour le contexte courant (thread ou tâche asyncio).
+    Accepte un id ou un LazyWorkspace résolu au premier usage.
+    """
+    return _current_workspace.set(workspace_id)
+
+
+def reset_current_workspace(token: Token) -> None:
+    _current_workspace.reset(token)
+
+
+@contextmanager
+def workspace_scope(workspace_id: Any = UNSCOPED) -> Iterator[None]:
+    """
+    Exécute un bloc dans le périmètre d'un workspace donné.
+    Sans argument, désactive le filtrage automatique (opérations inter-workspaces).
+    """
+    token = set_current_workspace(workspace_id)
+    try:
+        yield
+    finally:
+        reset_current_workspace(token)
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from core.services.audit_partition_service import AuditLogPartitionService
+from pathlib import Path
+
+
+class Command(BaseCommand):
+    help = 'Manage monthly partitions of the audit log (PostgreSQL): create ahead, archive and detach old months'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--convert', action='store_true',
+                            help='One-time conversion of immob_audit_logs into a partitioned table')
+        parser.add_argument('--months-ahead', type=int, default=3,
+                            help='Number of future monthly partitions to create')
+        parser.add_argument('--retain-months', type=int,
+                            default=getattr(settings, 'AUDIT_LOG_RETENTION_MONTHS', None),
+                            help='Detach partitions older than this many months')
+        parser.add_argument('--archive-dir', default=getattr(settings, 'AUDIT_LOG_ARCHIVE_DIR', None),
+                            help='Export detached partitions as .jsonl.gz files in this directory')
+        parser.add_argument('--keep-detached', action='store_true',
+                            help='Keep detached partitions as standalone tables instead of dropping them')
+        return super().add_arguments(parser)
+
+    def handle(self, *args, **options):
+        service = AuditLogPartitionService
+        try:
+            if options['convert']:
+                copied = service.convert_to_partitioned(months_ahead=options['months_ahead'])
+                self.stdout.write(f"Audit log partitioned ({copied} rows copied).")
+            elif not service.is_partitioned():
+                raise CommandError("immob_audit_logs is not partitioned yet, run with --convert first.")
+
+            for name in service.ensure_partitions(months_ahead=options['months_ahead']):
+                self.stdout.write(f"Created partition {name}")
+
+            if options['retain_months'] is not None:
+                archive_dir = Path(options['archive_dir']) if options['archive_dir'] else None
+                for name, archive_path, rows in service.archive_partitions(
+                    retain_months=options['retain_months'],
+                    archive_dir=archive_dir,
+                    drop=not options['keep_detached'],
+                ):
+                    if archive_path:
+                        self.stdout.write(f"Detached {name} ({rows} rows archived to {archive_path})")
+                    else:
+                        self.stdout.write(f"Detached {name}")
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS("Audit log partitions are up to date."))
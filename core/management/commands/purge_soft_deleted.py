@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from core.services.soft_delete_purge_service import soft_delete_purge_service
+from pathlib import Path
+
+
+class Command(BaseCommand):
+    help = 'Hard-delete (optionally archiving) rows soft-deleted more than N days ago'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('--days', type=int, required=True,
+                            help='Purge rows soft-deleted more than this many days ago')
+        parser.add_argument('--archive-dir',
+                            help='Export purged rows as .jsonl.gz files (one per model) in this directory')
+        parser.add_argument('--model', action='append', dest='models',
+                            help='Only purge this model, e.g. holdings.Property (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=soft_delete_purge_service.DEFAULT_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only count the rows that would be considered')
+        return super().add_arguments(parser)
+
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError("--days must be positive.")
+        try:
+            results = soft_delete_purge_service.purge(
+                older_than_days=options['days'],
+                model_labels=options['models'],
+                archive_dir=Path(options['archive_dir']) if options['archive_dir'] else None,
+                batch_size=options['batch_size'],
+                dry_run=options['dry_run'],
+            )
+        except LookupError as e:
+            raise CommandError(str(e))
+
+        for result in results:
+            if options['dry_run']:
+                self.stdout.write(f"{result['model']}: {result['candidates']} rows would be considered")
+                continue
+            line = f"{result['model']}: {result['purged']} purged, {result['skipped']} kept (blocked)"
+            if result['archive'] and result['purged']:
+                line += f" -> {result['archive']}"
+            self.stdout.write(self.style.SUCCESS(line))
+            for cascade_label, path in result['cascade_archives'].items():
+                self.stdout.write(f"  {cascade_label} (cascade) -> {path}")
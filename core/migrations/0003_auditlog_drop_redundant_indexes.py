@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_auditlog_action_date_default'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='auditlog',
+            name='immob_audit_action__eca163_idx',
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='action',
+            field=models.CharField(choices=[('CREATE', 'Create'), ('UPDATE', 'Update'), ('DELETE', 'Delete'), ('VIEW', 'View'), ('ACCESS_DENIED', 'Access denied')], max_length=20, verbose_name='Action'),
+        ),
+        migrations.AlterField(
+            model_name='auditlog',
+            name='entity_type',
+            field=models.CharField(max_length=100, verbose_name='Entity type'),
+        ),
+    ]
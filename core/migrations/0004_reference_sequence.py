@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_auditlog_drop_redundant_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReferenceSequence',
+            fields=[
+                ('prefix', models.CharField(max_length=50, primary_key=True, serialize=False, verbose_name='Prefix')),
+                ('last_value', models.BigIntegerField(default=0, verbose_name='Last value')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Reference Sequence',
+                'verbose_name_plural': 'Reference Sequences',
+                'db_table': 'immob_reference_sequences',
+            },
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from core.context import UNSCOPED, get_current_workspace_id
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 import uuid
 
@@ -21,13 +23,22 @@ class ImmobBaseModel(models.Model):
 
 class SoftDeletedModelMixin(models.Model):
     """Mixin pour la suppression logique"""
-    is_deleted = models.BooleanField(default=False, db_index=True)
+    # Pas d'index simple sur is_deleted (peu sélectif) : les index composites
+    # des modèles sont déclarés partiels via live_index()
+    is_deleted = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False, verbose_name=_('Deleted at'))
 
     class Meta:
         abstract = True
 
+    @staticmethod
+    def live_index(*fields, name):
+        """Index partiel limité aux lignes non supprimées (WHERE is_deleted = false)."""
+        return models.Index(fields=list(fields), name=name, condition=models.Q(is_deleted=False))
+
     def delete(self, using=None, keep_parents=False):
         self.is_deleted = True
+        self.deleted_at = timezone.now()
         self.save()
 
     def hard_delete(self, using=None, keep_parents=False):
@@ -38,7 +49,40 @@ class ImmobDefaultManager(models.Manager):
     """Manager par défaut qui exclut les objets supprimés"""
     def get_queryset(self):
         return super().get_queryset().filter(is_deleted=False)
-    
+
+
+class WorkspaceScopedQuerySet(models.QuerySet):
+    """
+    QuerySet des modèles rattachés à un workspace. Le chemin vers le workspace
+    est donné par l'attribut de modèle WORKSPACE_LOOKUP (par défaut 'workspace').
+    """
+
+    def _workspace_filter(self, workspace_id):
+        # Sans workspace (None), aucune ligne : jamais de filtre « workspace IS NULL »
+        if workspace_id is None:
+            return self.none()
+        lookup = getattr(self.model, 'WORKSPACE_LOOKUP', 'workspace')
+        return self.filter(**{f"{lookup}_id": workspace_id})
+
+    def for_workspace(self, workspace_id):
+        """Restreint explicitement le queryset à un workspace (None : queryset vide)."""
+        return self._workspace_filter(workspace_id)
+
+
+class WorkspaceScopedManager(ImmobDefaultManager.from_queryset(WorkspaceScopedQuerySet)):
+    """
+    Manager par défaut des modèles rattachés à un workspace : exclut les objets
+    supprimés et filtre d'abord sur le workspace actif de la requête
+    (core.context, positionné par WorkspaceContextMiddleware). Hors requête
+    (commandes, tâches de fond), aucun filtrage automatique n'est appliqué.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        workspace_id = get_current_workspace_id()
+        if workspace_id is not UNSCOPED:
+            queryset = queryset._workspace_filter(workspace_id)
+        return queryset
 
 
 # ============================================================================
@@ -62,18 +106,18 @@ class AuditLog(ImmobBaseModel):
         null=True,
         related_name='audit_logs'
     )
+    # Pas d'index simple sur action / entity_type : ils sont couverts par les
+    # index composites (action, action_date) et (entity_type, entity_id)
     action = models.CharField(
         max_length=20,
         choices=AuditAction.choices,
         verbose_name=_('Action'),
-        db_index=True
     )
     
     # Informations sur l'entité concernée
     entity_type = models.CharField(
         max_length=100,
         verbose_name=_('Entity type'),
-        db_index=True
     )
     entity_id = models.UUIDField(verbose_name=_('Entity ID'), db_index=True)
     
@@ -100,7 +144,8 @@ class AuditLog(ImmobBaseModel):
         verbose_name=_('User agent')
     )
     
-    action_date = models.DateTimeField(auto_now_add=True, db_index=True)
+    # Horodatage au moment de l'action (et non de l'écriture groupée différée)
+    action_date = models.DateTimeField(default=timezone.now, editable=False, db_index=True)
 
     class Meta:
         db_table = 'immob_audit_logs'
@@ -111,8 +156,32 @@ class AuditLog(ImmobBaseModel):
             models.Index(fields=['user', 'action_date']),
             models.Index(fields=['entity_type', 'entity_id']),
             models.Index(fields=['action', 'action_date']),
-            models.Index(fields=['action_date']),
         ]
 
     def __str__(self):
         return f"{self.user} - {self.get_action_display()} - {self.entity_type} - {self.action_date}" # type: ignore
+
+
+# ============================================================================
+# NUMÉROTATION DES RÉFÉRENCES
+# ============================================================================
+
+
+class ReferenceSequence(models.Model):
+    """
+    Compteur de numérotation par préfixe (ex. « APT-2510 », « CTR-20251018 »).
+
+    `last_value` est la dernière valeur attribuée : les processus réservent des
+    blocs de valeurs consécutives en une seule mise à jour atomique.
+    """
+    prefix = models.CharField(max_length=50, primary_key=True, verbose_name=_('Prefix'))
+    last_value = models.BigIntegerField(default=0, verbose_name=_('Last value'))
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'immob_reference_sequences'
+        verbose_name = _('Reference Sequence')
+        verbose_name_plural = _('Reference Sequences')
+
+    def __str__(self):
+        return f"{self.prefix} - {self.last_value}"
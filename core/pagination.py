@@ -0,0 +1,155 @@
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, QuerySet
+from typing import Any, Dict, List, Optional
+import base64
+import binascii
+import datetime
+import json
+
+
+class InvalidCursorError(ValueError):
+    """Exception levée lorsqu'un curseur de pagination est invalide."""
+    pass
+
+
+class _CursorEncoder(DjangoJSONEncoder):
+    """Conserve la précision complète (microsecondes) des dates dans les curseurs."""
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode les valeurs de la clé de tri de la dernière ligne en curseur opaque."""
+    raw = json.dumps(values, cls=_CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Décode un curseur produit par encode_cursor."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise InvalidCursorError("Curseur de pagination invalide.")
+    if not isinstance(values, list):
+        raise InvalidCursorError("Curseur de pagination invalide.")
+    return values
+
+
+def _resolve_field(model, path: str):
+    """Retourne le champ de modèle correspondant à un chemin 'a__b' (ou None)."""
+    field = None
+    for part in path.split('__'):
+        field = model._meta.get_field(part)
+        if field.is_relation and field.related_model is not None:
+            model = field.related_model
+    return field
+
+
+def _keyset_filter(model, ordering: List[str], values: List[Any]) -> Q:
+    """
+    Construit la condition « strictement après la ligne curseur » pour une
+    clé de tri composite, par exemple pour ['-action_date', '-id'] :
+    action_date < v1 OR (action_date = v1 AND id < v2)
+
+    Les valeurs viennent du client : une valeur non convertible dans le type
+    de sa colonne (curseur forgé ou périmé) lève InvalidCursorError.
+    """
+    condition = Q()
+    equal_prefix = Q()
+    for order, value in zip(ordering, values):
+        name = order.lstrip('-')
+        # Colonnes de tri non nulles : seules des valeurs JSON scalaires sont valides
+        if value is None or isinstance(value, (list, dict)):
+            raise InvalidCursorError("Curseur de pagination invalide.")
+        field = _resolve_field(model, name)
+        if field is not None:
+            try:
+                value = field.to_python(value)
+            except (ValidationError, TypeError, ValueError, AttributeError):
+                raise InvalidCursorError("Curseur de pagination invalide.")
+        lookup = 'lt' if order.startswith('-') else 'gt'
+        condition |= equal_prefix & Q(**{f"{name}__{lookup}": value})
+        equal_prefix &= Q(**{name: value})
+    return condition
+
+
+def _row_value(row: Any, name: str) -> Any:
+    if isinstance(row, dict):
+        return row[name]
+    for part in name.split('__'):
+        row = getattr(row, part)
+    return row
+
+
+def validate_cursor(model, ordering: List[str], cursor: Optional[str]) -> Optional[Q]:
+    """
+    Vérifie entièrement un curseur (encodage, nombre et type des valeurs) pour
+    une clé de tri, sans requête. À appeler avant de construire des props
+    différées, qui ne sont évaluées qu'après le retour de la vue.
+
+    :return: La condition de la page suivante (None sans curseur).
+    :raises InvalidCursorError: Curseur invalide.
+    """
+    if not cursor:
+        return None
+    values = decode_cursor(cursor)
+    if len(values) != len(ordering):
+        raise InvalidCursorError("Curseur de pagination invalide.")
+    return _keyset_filter(model, ordering, values)
+
+
+def _keyset_queryset(queryset: QuerySet, ordering: List[str], cursor: Optional[str]) -> QuerySet:
+    """Requête d'une page (+1 ligne pour détecter la suite) après le curseur."""
+    condition = validate_cursor(queryset.model, ordering, cursor)
+    if condition is not None:
+        queryset = queryset.filter(condition)
+    return queryset.order_by(*ordering)
+
+
+def _keyset_page(rows: List[Any], ordering: List[str], page_size: int) -> Dict[str, Any]:
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    next_cursor = None
+    if has_more and rows:
+        next_cursor = encode_cursor([_row_value(rows[-1], order.lstrip('-')) for order in ordering])
+
+    return {
+        'results': rows,
+        'next_cursor': next_cursor,
+        'has_more': has_more,
+    }
+
+
+def keyset_paginate(
+    queryset: QuerySet,
+    ordering: List[str],
+    cursor: Optional[str] = None,
+    page_size: int = 50
+) -> Dict[str, Any]:
+    """
+    Pagination par clé (keyset) : chaque page est lue par un parcours d'index
+    borné, à coût constant quelle que soit la profondeur de la page.
+
+    La clé de tri doit être unique (terminer par 'id' ou '-id') et ses colonnes
+    non nulles. Avec .values(), les champs de la clé de tri doivent être sélectionnés.
+
+    :return: {'results': [...], 'next_cursor': str | None, 'has_more': bool}
+    """
+    rows = list(_keyset_queryset(queryset, ordering, cursor)[:page_size + 1])
+    return _keyset_page(rows, ordering, page_size)
+
+
+async def akeyset_paginate(
+    queryset: QuerySet,
+    ordering: List[str],
+    cursor: Optional[str] = None,
+    page_size: int = 50
+) -> Dict[str, Any]:
+    """Version asynchrone de keyset_paginate (ORM asynchrone)."""
+    rows = [row async for row in _keyset_queryset(queryset, ordering, cursor)[:page_size + 1]]
+    return _keyset_page(rows, ordering, page_size)
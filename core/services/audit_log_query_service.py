@@ -0,0 +1,82 @@
+from accounts.models import ImmobUser
+from core.models import AuditLog
+from core.pagination import keyset_paginate, validate_cursor
+from core.services.dtos import AuditLogQueryDTO
+from django.db.models.query import QuerySet
+from typing import Any, Dict, Iterator
+
+
+class AuditLogQueryService:
+    """
+    Consultation du journal d'audit (revues de conformité).
+
+    La pagination par clé sur (action_date, id) garde chaque page à coût
+    constant, même sur des millions de lignes, et les filtres correspondent
+    aux index composites (user, action_date), (action, action_date) et
+    (entity_type, entity_id).
+    """
+
+    ORDERING = ['-action_date', '-id']
+    FIELDS = (
+        'id', 'action_date', 'action', 'entity_type', 'entity_id',
+        'old_values', 'new_values', 'ip_address', 'user_agent',
+        'user_id', 'user__email',
+    )
+
+    def _get_queryset(self, acting_user: ImmobUser, filters: AuditLogQueryDTO) -> QuerySet:
+        if acting_user.role != ImmobUser.UserRole.OWNER:
+            raise PermissionError("Seul un Owner peut consulter le journal d'audit.")
+
+        # Périmètre : actions des utilisateurs du workspace de l'Owner (aucune
+        # sans workspace : le filtre deviendrait « workspace IS NULL »)
+        if acting_user.workspace_id is None: # type: ignore
+            return AuditLog.objects.none().values(*self.FIELDS)
+        queryset = AuditLog.objects.filter(user__workspace_id=acting_user.workspace_id) # type: ignore
+
+        if filters.user_id:
+            queryset = queryset.filter(user_id=filters.user_id)
+        if filters.action:
+            queryset = queryset.filter(action=filters.action)
+        if filters.entity_type:
+            queryset = queryset.filter(entity_type=filters.entity_type)
+        if filters.entity_id:
+            queryset = queryset.filter(entity_id=filters.entity_id)
+        # Bornes temporelles : seules les partitions concernées sont lues
+        if filters.date_from:
+            queryset = queryset.filter(action_date__gte=filters.date_from)
+        if filters.date_to:
+            queryset = queryset.filter(action_date__lt=filters.date_to)
+
+        return queryset.values(*self.FIELDS)
+
+    def list_logs(self, acting_user: ImmobUser, filters: AuditLogQueryDTO) -> Dict[str, Any]:
+        """
+        Retourne une page du journal d'audit, de la plus récente à la plus ancienne.
+
+        :raises PermissionError: Si l'utilisateur n'est pas OWNER.
+        :raises InvalidCursorError: Si le curseur est invalide.
+        :return: {'results': [...], 'next_cursor': str | None, 'has_more': bool}
+        """
+        queryset = self._get_queryset(acting_user, filters)
+        return keyset_paginate(queryset, self.ORDERING, filters.cursor, filters.page_size)
+
+    def iter_logs(self, acting_user: ImmobUser, filters: AuditLogQueryDTO) -> Iterator[Dict[str, Any]]:
+        """
+        Parcourt toutes les pages à partir du curseur (export en flux).
+        Les droits et le curseur sont vérifiés immédiatement, avant la première page.
+        """
+        queryset = self._get_queryset(acting_user, filters)
+        validate_cursor(AuditLog, self.ORDERING, filters.cursor)
+
+        def pages(cursor):
+            while True:
+                page = keyset_paginate(queryset, self.ORDERING, cursor, filters.page_size)
+                yield from page['results']
+                if not page['has_more']:
+                    return
+                cursor = page['next_cursor']
+
+        return pages(filters.cursor)
+
+
+audit_log_query_service = AuditLogQueryService()
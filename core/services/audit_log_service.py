@@ -1,7 +1,96 @@
 from accounts.models import ImmobUser 
 from core.models import AuditLog       
+from core.utils import get_client_ip
+from django.conf import settings
+from django.db import connections, transaction
 from django.http import HttpRequest
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List
+import atexit
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogBuffer:
+    """
+    Tampon en mémoire des entrées d'audit, écrites par lots (bulk_create).
+
+    Une entrée est ajoutée au tampon au COMMIT de la transaction qui l'a produite
+    (elle disparaît donc avec un ROLLBACK, comme un INSERT synchrone). Le tampon
+    est vidé lorsqu'il atteint AUDIT_LOG_BATCH_SIZE entrées, toutes les
+    AUDIT_LOG_FLUSH_INTERVAL secondes par un thread de fond, et à l'arrêt du worker.
+    """
+
+    def __init__(self):
+        self._entries: List[AuditLog] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer_pid: Optional[int] = None
+        atexit.register(self.flush)
+
+    @property
+    def batch_size(self) -> int:
+        return getattr(settings, 'AUDIT_LOG_BATCH_SIZE', 100)
+
+    @property
+    def flush_interval(self) -> float:
+        return getattr(settings, 'AUDIT_LOG_FLUSH_INTERVAL', 2.0)
+
+    def _ensure_timer(self) -> None:
+        """Démarre le thread de vidage périodique (une fois par processus, y compris après un fork)."""
+        pid = os.getpid()
+        if self._timer_pid == pid:
+            return
+        self._timer_pid = pid
+        thread = threading.Thread(target=self._run_timer, name='audit-log-flusher', daemon=True)
+        thread.start()
+
+    def _run_timer(self) -> None:
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            finally:
+                # Le thread de fond possède sa propre connexion : ne pas la garder ouverte
+                connections.close_all()
+
+    def add(self, entry: AuditLog) -> None:
+        """Ajoute une entrée au tampon et le vide s'il est plein."""
+        with self._lock:
+            self._entries.append(entry)
+            is_full = len(self._entries) >= self.batch_size
+            self._ensure_timer()
+        if is_full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Écrit toutes les entrées en attente en un seul INSERT. Retourne le nombre d'entrées écrites."""
+        with self._flush_lock:
+            with self._lock:
+                entries, self._entries = self._entries, []
+            if not entries:
+                return 0
+            try:
+                AuditLog.objects.bulk_create(entries, batch_size=self.batch_size)
+            except Exception:
+                # Repli entrée par entrée : une entrée invalide ne doit pas faire perdre le lot
+                logger.exception("Échec de l'écriture groupée de %d entrées d'audit", len(entries))
+                for entry in entries:
+                    try:
+                        entry.save(force_insert=True)
+                    except Exception:
+                        logger.exception("Entrée d'audit perdue : %s %s %s", entry.action, entry.entity_type, entry.entity_id)
+            return len(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+audit_log_buffer = AuditLogBuffer()
+
 
 class AuditLogService:
     """
@@ -20,14 +109,7 @@ class AuditLogService:
         }
         
         if request:
-            # Meilleure pratique Django pour obtenir l'IP réelle, même derrière un proxy (via X_FORWARDED_FOR)
-            x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-            if x_forwarded_for:
-                ip = x_forwarded_for.split(',')[0].strip()
-            else:
-                ip = request.META.get('REMOTE_ADDR')
-            
-            info['ip_address'] = ip or '0.0.0.0'
+            info['ip_address'] = get_client_ip(request) or '0.0.0.0'
             info['user_agent'] = request.META.get('HTTP_USER_AGENT', '')
         
         return info
@@ -52,13 +134,12 @@ class AuditLogService:
         :param request: L'objet HttpRequest pour les infos d'accès (IP, User-Agent).
         :param old_values: Données originales de l'entité (pour UPDATE/DELETE).
         :param new_values: Nouvelles données de l'entité (pour CREATE/UPDATE).
-        :return: L'objet AuditLog créé.
+        :return: L'objet AuditLog créé (écrit en base au plus tard au prochain vidage du tampon).
         """
         
         request_info = AuditLogService._extract_request_info(request)
 
-        # Création de l'enregistrement AuditLog
-        audit_log = AuditLog.objects.create(
+        audit_log = AuditLog(
             user=user,
             action=action,
             entity_type=entity_type,
@@ -68,5 +149,18 @@ class AuditLogService:
             ip_address=request_info['ip_address'],
             user_agent=request_info['user_agent']
         )
-        
-        return audit_log
\ No newline at end of file
+
+        # Mode synchrone (tests, scripts) : INSERT immédiat dans la transaction courante
+        if not getattr(settings, 'AUDIT_LOG_ASYNC', True):
+            audit_log.save(force_insert=True)
+            return audit_log
+
+        # Mode asynchrone : mise en tampon au COMMIT, écriture groupée hors du chemin critique
+        transaction.on_commit(lambda: audit_log_buffer.add(audit_log))
+
+        return audit_log
+
+    @staticmethod
+    def flush() -> int:
+        """Force l'écriture des entrées d'audit en attente (fin de commande, arrêt du worker)."""
+        return audit_log_buffer.flush()
\ No newline at end of file
@@ -0,0 +1,215 @@
+from core.models import AuditLog
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+from dateutil.relativedelta import relativedelta
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from typing import List, Optional, Tuple
+import gzip
+import json
+import re
+
+
+class AuditLogPartitionService:
+    """
+    Stockage partitionné par mois (PostgreSQL, partitionnement déclaratif par
+    RANGE sur action_date) de la table immob_audit_logs.
+
+    Les requêtes bornées dans le temps ne parcourent que les partitions
+    concernées (partition pruning) et les mois expirés sont archivés en JSONL
+    compressé puis détachés, sans DELETE massif sur la table vivante.
+    """
+
+    TABLE = AuditLog._meta.db_table
+    DEFAULT_PARTITION = f"{TABLE}_default"
+    PARTITION_RE = re.compile(rf"^{TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+    @staticmethod
+    def _check_vendor() -> None:
+        if connection.vendor != 'postgresql':
+            raise RuntimeError("Le partitionnement du journal d'audit nécessite PostgreSQL.")
+
+    @staticmethod
+    def _month_start(value: datetime) -> datetime:
+        value = value.astimezone(dt_timezone.utc)
+        return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+    @classmethod
+    def partition_name(cls, month_start: datetime) -> str:
+        return f"{cls.TABLE}_y{month_start.year:04d}m{month_start.month:02d}"
+
+    @classmethod
+    def is_partitioned(cls) -> bool:
+        """Indique si immob_audit_logs est déjà une table partitionnée."""
+        cls._check_vendor()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relkind FROM pg_class c "
+                "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+                [cls.TABLE]
+            )
+            row = cursor.fetchone()
+        return bool(row) and row[0] == 'p'
+
+    @classmethod
+    def _create_partition(cls, cursor, month_start: datetime) -> bool:
+        """Crée la partition d'un mois si elle n'existe pas. Retourne True si elle a été créée."""
+        name = cls.partition_name(month_start)
+        cursor.execute("SELECT to_regclass(%s)", [name])
+        if cursor.fetchone()[0] is not None:
+            return False
+        cursor.execute(
+            f"CREATE TABLE {connection.ops.quote_name(name)} "
+            f"PARTITION OF {connection.ops.quote_name(cls.TABLE)} "
+            f"FOR VALUES FROM (%s) TO (%s)",
+            [month_start, month_start + relativedelta(months=1)]
+        )
+        return True
+
+    @classmethod
+    @transaction.atomic
+    def convert_to_partitioned(cls, months_ahead: int = 3) -> int:
+        """
+        Conversion unique de immob_audit_logs en table partitionnée par mois.
+        Les lignes existantes sont recopiées dans leurs partitions mensuelles.
+
+        La clé primaire devient (id, action_date) : PostgreSQL exige que la clé
+        de partitionnement en fasse partie. L'ORM continue d'utiliser id seul.
+
+        :return: Le nombre de lignes recopiées.
+        """
+        cls._check_vendor()
+        if cls.is_partitioned():
+            return 0
+
+        table = connection.ops.quote_name(cls.TABLE)
+        legacy = connection.ops.quote_name(f"{cls.TABLE}_legacy")
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+            cursor.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+            cursor.execute(
+                f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS) "
+                f"PARTITION BY RANGE (action_date)"
+            )
+
+            # Partitions couvrant l'historique existant, puis les mois à venir
+            cursor.execute(f"SELECT MIN(action_date) FROM {legacy}")
+            oldest = cursor.fetchone()[0] or timezone.now()
+            month = cls._month_start(oldest)
+            last_month = cls._month_start(timezone.now()) + relativedelta(months=months_ahead)
+            while month <= last_month:
+                cls._create_partition(cursor, month)
+                month += relativedelta(months=1)
+            cursor.execute(
+                f"CREATE TABLE {connection.ops.quote_name(cls.DEFAULT_PARTITION)} "
+                f"PARTITION OF {table} DEFAULT"
+            )
+
+            cursor.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+            copied = cursor.rowcount
+            cursor.execute(f"DROP TABLE {legacy}")
+            cursor.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {connection.ops.quote_name(cls.TABLE + '_pkey')} "
+                f"PRIMARY KEY (id, action_date)"
+            )
+
+        # Index et clé étrangère recréés sur la table parente (propagés aux partitions)
+        with connection.schema_editor(atomic=False) as schema_editor:
+            for sql in schema_editor._model_indexes_sql(AuditLog):
+                schema_editor.execute(sql)
+            user_field = AuditLog._meta.get_field('user')
+            schema_editor.execute(
+                schema_editor._create_fk_sql(AuditLog, user_field, "_fk_%(to_table)s_%(to_column)s")
+            )
+
+        return copied
+
+    @classmethod
+    def ensure_partitions(cls, months_ahead: int = 3) -> List[str]:
+        """Crée à l'avance les partitions du mois courant et des `months_ahead` mois suivants."""
+        cls._check_vendor()
+        created = []
+        month = cls._month_start(timezone.now())
+        with transaction.atomic(), connection.cursor() as cursor:
+            for _ in range(months_ahead + 1):
+                if cls._create_partition(cursor, month):
+                    created.append(cls.partition_name(month))
+                month += relativedelta(months=1)
+        return created
+
+    @classmethod
+    def list_partitions(cls) -> List[Tuple[str, datetime]]:
+        """Liste les partitions mensuelles attachées : [(nom, début du mois)] triées par date."""
+        cls._check_vendor()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE parent.relname = %s",
+                [cls.TABLE]
+            )
+            names = [row[0] for row in cursor.fetchall()]
+
+        partitions = []
+        for name in names:
+            match = cls.PARTITION_RE.match(name)
+            if match:
+                year, month = int(match.group(1)), int(match.group(2))
+                partitions.append((name, datetime(year, month, 1, tzinfo=dt_timezone.utc)))
+        return sorted(partitions, key=lambda partition: partition[1])
+
+    @classmethod
+    def _archive_partition(cls, name: str, archive_dir: Path) -> Tuple[Path, int]:
+        """Exporte une partition en JSONL compressé (lecture en flux par curseur serveur)."""
+        archive_path = archive_dir / f"{name}.jsonl.gz"
+        rows = 0
+        with transaction.atomic(), connection.chunked_cursor() as cursor:
+            cursor.execute(f"SELECT * FROM {connection.ops.quote_name(name)} ORDER BY action_date")
+            columns = None
+            with gzip.open(archive_path, 'wt', encoding='utf-8') as archive:
+                for row in cursor:
+                    if columns is None:
+                        columns = [col[0] for col in cursor.description]
+                    archive.write(json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n")
+                    rows += 1
+        return archive_path, rows
+
+    @classmethod
+    def archive_partitions(
+        cls,
+        retain_months: int,
+        archive_dir: Optional[Path] = None,
+        drop: bool = True
+    ) -> List[Tuple[str, Optional[Path], int]]:
+        """
+        Détache les partitions antérieures aux `retain_months` derniers mois.
+        Si `archive_dir` est fourni, chaque partition est d'abord exportée en
+        JSONL compressé. Sans `drop`, la table détachée est conservée telle quelle.
+
+        :return: [(partition, fichier d'archive ou None, nombre de lignes archivées)]
+        """
+        cls._check_vendor()
+        cutoff = cls._month_start(timezone.now()) - relativedelta(months=retain_months)
+        if archive_dir is not None:
+            archive_dir.mkdir(parents=True, exist_ok=True)
+
+        archived = []
+        for name, month_start in cls.list_partitions():
+            if month_start >= cutoff:
+                continue
+
+            archive_path, rows = (None, 0)
+            if archive_dir is not None:
+                archive_path, rows = cls._archive_partition(name, archive_dir)
+
+            quoted = connection.ops.quote_name(name)
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {connection.ops.quote_name(cls.TABLE)} DETACH PARTITION {quoted}")
+                if drop:
+                    cursor.execute(f"DROP TABLE {quoted}")
+
+            archived.append((name, archive_path, rows))
+        return archived
@@ -0,0 +1,29 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional
+from uuid import UUID
+from datetime import datetime
+from core.models import AuditLog
+
+
+class AuditLogQueryDTO(BaseModel):
+    """
+    Filtres et pagination de la consultation du journal d'audit.
+    Utilisé par AuditLogQueryService.list_logs.
+    """
+    user_id: Optional[UUID] = None
+    action: Optional[str] = None
+    entity_type: Optional[str] = Field(None, max_length=100)
+    entity_id: Optional[UUID] = None
+    date_from: Optional[datetime] = None
+    date_to: Optional[datetime] = None
+    cursor: Optional[str] = None
+    page_size: int = Field(100, ge=1, le=500)
+
+    @field_validator('action')
+    def validate_action(cls, value):
+        """
+        Vérifie que l'action fournie est une action d'audit valide.
+        """
+        if value is not None and value not in AuditLog.AuditAction.values:
+            raise ValueError(f"L'action doit être l'une des suivantes : {', '.join(AuditLog.AuditAction.values)}")
+        return value
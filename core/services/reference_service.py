@@ -0,0 +1,97 @@
+from core.models import ReferenceSequence
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+from typing import Dict, List, Optional, Tuple
+import os
+import threading
+
+
+class ReferenceService:
+    """
+    Attribution de numéros de référence sans collision, par préfixe.
+
+    Chaque processus réserve des blocs de valeurs consécutives dans
+    ReferenceSequence (un seul UPSERT atomique par bloc) puis les distribue
+    depuis la mémoire : aucune sonde d'unicité ni nouvelle tentative par ligne.
+
+    Les réservations passent par une connexion dédiée en autocommit : un bloc
+    reste acquis même si la transaction appelante est annulée, il ne peut donc
+    jamais être attribué deux fois. Cette connexion est rendue au pool (ou
+    fermée) aussitôt le bloc réservé : elle n'occupe pas de place du pool entre
+    deux réservations. Les valeurs non utilisées d'un bloc (arrêt du processus,
+    ROLLBACK) laissent des trous dans la numérotation.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._blocks: Dict[str, Tuple[int, int]] = {}
+        self._pid: Optional[int] = None
+
+    @property
+    def block_size(self) -> int:
+        return getattr(settings, 'REFERENCE_BLOCK_SIZE', 20)
+
+    def _check_process(self) -> None:
+        """Après un fork, les blocs hérités du parent sont abandonnés."""
+        pid = os.getpid()
+        if self._pid != pid:
+            self._pid = pid
+            self._blocks = {}
+
+    def _reserve(self, prefix: str, count: int) -> range:
+        """Réserve `count` valeurs consécutives pour le préfixe (appelant verrouillé)."""
+        # Hors de la transaction de l'appelant (connexion du thread) : autocommit immédiat
+        connection = connections.create_connection(DEFAULT_DB_ALIAS)
+        try:
+            table = connection.ops.quote_name(ReferenceSequence._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {table} (prefix, last_value, updated_at) VALUES (%s, %s, %s) "
+                    f"ON CONFLICT (prefix) DO UPDATE "
+                    f"SET last_value = {table}.last_value + EXCLUDED.last_value, updated_at = EXCLUDED.updated_at "
+                    f"RETURNING last_value",
+                    [prefix, count, timezone.now()]
+                )
+                last_value = cursor.fetchone()[0]
+        finally:
+            connection.close()
+        return range(last_value - count + 1, last_value + 1)
+
+    def reserve(self, prefix: str, count: int) -> range:
+        """
+        Réserve un intervalle de `count` valeurs consécutives, définitivement
+        acquis par l'appelant (création en masse).
+        """
+        if count < 1:
+            raise ValueError("count doit être strictement positif.")
+        with self._lock:
+            self._check_process()
+            return self._reserve(prefix, count)
+
+    def allocate(self, prefix: str, count: int = 1) -> List[int]:
+        """
+        Attribue `count` valeurs pour le préfixe, depuis le bloc local du
+        processus (réservé à nouveau lorsqu'il est épuisé).
+        """
+        if count < 1:
+            raise ValueError("count doit être strictement positif.")
+        with self._lock:
+            self._check_process()
+            values: List[int] = []
+            while len(values) < count:
+                next_value, last_value = self._blocks.get(prefix, (1, 0))
+                if next_value > last_value:
+                    block = self._reserve(prefix, max(self.block_size, count - len(values)))
+                    next_value, last_value = block.start, block.stop - 1
+                take = min(count - len(values), last_value - next_value + 1)
+                values.extend(range(next_value, next_value + take))
+                self._blocks[prefix] = (next_value + take, last_value)
+            return values
+
+    def next_value(self, prefix: str) -> int:
+        """Attribue une seule valeur pour le préfixe."""
+        return self.allocate(prefix, 1)[0]
+
+
+reference_service = ReferenceService()
@@ -0,0 +1,204 @@
+from django.apps import apps
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Model, ProtectedError, RestrictedError
+from django.db.models.deletion import Collector
+from django.utils import timezone
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+import gzip
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class SoftDeletePurgeService:
+    """
+    Purge définitive (avec archivage optionnel en JSONL compressé) des lignes
+    supprimées logiquement depuis plus de N jours, pour que les index partiels
+    des lignes vivantes restent compacts.
+
+    Une ligne n'est jamais purgée si sa suppression est bloquée (PROTECT /
+    RESTRICT) ou si elle entraînerait en cascade des lignes encore vivantes.
+    Les lignes emportées en cascade (photos d'une propriété, permissions d'un
+    bâtiment...) sont archivées avec elles, dans un fichier par modèle.
+    """
+
+    # Ordre de purge : les dépendants avant leurs parents
+    DEFAULT_MODELS = (
+        'finance.Contrat',
+        'holdings.MaintenanceLog',
+        'holdings.Property',
+        'finance.Tenant',
+        'holdings.Building',
+        'accounts.Workspace',
+    )
+    DEFAULT_BATCH_SIZE = 500
+
+    @staticmethod
+    def _has_live_cascade(collector: Collector, roots: Sequence[Model]) -> bool:
+        """Vrai si la suppression emporterait une ligne non supprimée logiquement."""
+        root_keys = {(type(obj), obj.pk) for obj in roots}
+        for model, instances in collector.data.items():
+            if not hasattr(model, 'is_deleted'):
+                continue
+            for obj in instances:
+                if (model, obj.pk) not in root_keys and not obj.is_deleted:
+                    return True
+        for queryset in collector.fast_deletes:
+            if hasattr(queryset.model, 'is_deleted') and queryset.filter(is_deleted=False).exists():
+                return True
+        return False
+
+    @staticmethod
+    def _cascaded_rows(collector: Collector, roots: Sequence[Model]) -> Dict[type, List[Dict[str, Any]]]:
+        """Lignes (colonnes concrètes) que la suppression emporterait en plus des racines."""
+        root_keys = {(type(obj), obj.pk) for obj in roots}
+        pks_by_model: Dict[type, List[Any]] = {}
+        for model, instances in collector.data.items():
+            pks = [obj.pk for obj in instances if (model, obj.pk) not in root_keys]
+            if pks:
+                pks_by_model.setdefault(model, []).extend(pks)
+
+        querysets = [model._base_manager.filter(pk__in=pks) for model, pks in pks_by_model.items()]
+        querysets.extend(collector.fast_deletes)
+        rows: Dict[type, List[Dict[str, Any]]] = {}
+        for queryset in querysets:
+            model = queryset.model
+            model_rows = list(queryset.values(*[f.attname for f in model._meta.concrete_fields]))
+            if model_rows:
+                rows.setdefault(model, []).extend(model_rows)
+        return rows
+
+    def _try_delete(self, objects: Sequence[Model], cascaded: Optional[Dict[type, List[Dict[str, Any]]]] = None) -> bool:
+        """
+        Supprime les objets (savepoint) si rien ne l'interdit. Retourne True si supprimés.
+
+        :param cascaded: Si fourni, reçoit les lignes supprimées en cascade {modèle: [lignes]}.
+        """
+        try:
+            with transaction.atomic():
+                collector = Collector(using=DEFAULT_DB_ALIAS)
+                collector.collect(objects)
+                if self._has_live_cascade(collector, objects):
+                    return False
+                rows = self._cascaded_rows(collector, objects) if cascaded is not None else {}
+                collector.delete()
+        except (ProtectedError, RestrictedError):
+            return False
+        for model, model_rows in rows.items():
+            cascaded.setdefault(model, []).extend(model_rows) # type: ignore
+        return True
+
+    @staticmethod
+    def _batches(queryset, size: int) -> Iterator[List[Model]]:
+        """Lots par clé primaire croissante (stable pendant les suppressions)."""
+        last_pk = None
+        while True:
+            batch_qs = queryset.order_by('pk')
+            if last_pk is not None:
+                batch_qs = batch_qs.filter(pk__gt=last_pk)
+            batch = list(batch_qs[:size])
+            if not batch:
+                return
+            last_pk = batch[-1].pk
+            yield batch
+
+    def purge_model(
+        self,
+        model: type,
+        older_than_days: int,
+        archive_dir: Optional[Path] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        dry_run: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Purge un modèle. Chaque lot est traité dans sa propre transaction ; en cas
+        de blocage, le lot est repris ligne par ligne et les lignes bloquées sont ignorées.
+
+        :return: {'model', 'candidates', 'purged', 'skipped', 'archive', 'cascade_archives'}
+            ('cascade_archives' : {modèle emporté en cascade: fichier}).
+        """
+        cutoff = timezone.now() - timedelta(days=older_than_days)
+        queryset = model._base_manager.filter(is_deleted=True, deleted_at__lt=cutoff)
+        label = model._meta.label
+        result: Dict[str, Any] = {
+            'model': label, 'candidates': 0, 'purged': 0, 'skipped': 0, 'archive': None, 'cascade_archives': {}
+        }
+
+        if dry_run:
+            result['candidates'] = queryset.count()
+            return result
+
+        archive = None
+        cascade_archives: Dict[str, Any] = {}
+        if archive_dir is not None:
+            archive_dir.mkdir(parents=True, exist_ok=True)
+            stamp = timezone.now().strftime('%Y%m%dT%H%M%S')
+            result['archive'] = archive_dir / f"{model._meta.label_lower.replace('.', '_')}_{stamp}.jsonl.gz"
+            archive = gzip.open(result['archive'], 'wt', encoding='utf-8')
+
+        try:
+            for batch in self._batches(queryset, batch_size):
+                result['candidates'] += len(batch)
+                pk_name = model._meta.pk.attname
+                rows = {row[pk_name]: row for row in model._base_manager.filter(
+                    pk__in=[obj.pk for obj in batch]
+                ).values(*[f.attname for f in model._meta.concrete_fields])}
+
+                # Collector.delete() remet pk à None : les clés sont relevées avant
+                pks = [obj.pk for obj in batch]
+                cascaded = {} if archive is not None else None
+                with transaction.atomic():
+                    if self._try_delete(batch, cascaded):
+                        purged = pks
+                    else:
+                        purged = [pk for obj, pk in zip(batch, pks) if self._try_delete([obj], cascaded)]
+                    if archive is not None:
+                        for pk in purged:
+                            archive.write(json.dumps(rows[pk], cls=DjangoJSONEncoder) + "\n")
+                        for cascade_model, cascade_rows in cascaded.items(): # type: ignore
+                            cascade_label = cascade_model._meta.label
+                            if cascade_label not in cascade_archives:
+                                path = archive_dir / ( # type: ignore
+                                    f"{cascade_model._meta.label_lower.replace('.', '_')}_cascade_{stamp}.jsonl.gz"
+                                )
+                                result['cascade_archives'][cascade_label] = path
+                                cascade_archives[cascade_label] = gzip.open(path, 'wt', encoding='utf-8')
+                            for row in cascade_rows:
+                                cascade_archives[cascade_label].write(json.dumps(row, cls=DjangoJSONEncoder) + "\n")
+
+                result['purged'] += len(purged)
+                result['skipped'] += len(batch) - len(purged)
+        finally:
+            for cascade_archive in cascade_archives.values():
+                cascade_archive.close()
+            if archive is not None:
+                archive.close()
+                if not result['purged']:
+                    result['archive'].unlink()
+                    result['archive'] = None
+
+        if result['skipped']:
+            logger.info("%s : %s ligne(s) conservée(s) (suppression bloquée)", label, result['skipped'])
+        return result
+
+    def purge(
+        self,
+        older_than_days: int,
+        model_labels: Optional[Sequence[str]] = None,
+        archive_dir: Optional[Path] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        dry_run: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Purge les modèles donnés (par défaut DEFAULT_MODELS, dans cet ordre)."""
+        results = []
+        for label in model_labels or self.DEFAULT_MODELS:
+            model = apps.get_model(label)
+            results.append(self.purge_model(model, older_than_days, archive_dir, batch_size, dry_run))
+        return results
+
+
+soft_delete_purge_service = SoftDeletePurgeService()
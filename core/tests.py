@@ -1,3 +1,346 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from unittest import mock
+from uuid import uuid4
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import ImmobUser
+from core.cache import bump_version, versioned_key
+from core.context import workspace_scope
+from core.models import AuditLog
+from core.services.audit_log_query_service import audit_log_query_service
+from core.services.audit_log_service import AuditLogBuffer, AuditLogService
+from core.services.dtos import AuditLogQueryDTO
+from core.services.reference_service import ReferenceService
+from holdings.models import Building
+from immob.middleware import WorkspaceContextMiddleware
+
+
+def create_owner(name):
+    """Owner et son workspace (créé par le signal create_owner_workspace)."""
+    return ImmobUser.objects.create_user(
+        username=name, email=f'{name}@example.com', password='x',
+        role=ImmobUser.UserRole.OWNER,
+    )
+
+
+def create_building(workspace, name):
+    return Building.objects.create(workspace=workspace, name=name, street='Rue', city='Douala')
+
+
+class WorkspaceScopingTests(TestCase):
+    """Un workspace ne voit jamais les lignes d'un autre workspace."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner_a = create_owner('owner-a')
+        cls.owner_b = create_owner('owner-b')
+        cls.building_a = create_building(cls.owner_a.workspace, 'A')
+        cls.building_b = create_building(cls.owner_b.workspace, 'B')
+        cls.orphan = ImmobUser.objects.create_user(
+            username='orphan', email='orphan@example.com', password='x',
+            role=ImmobUser.UserRole.VIEWER,
+        )
+
+    def test_new_owner_gets_own_workspace(self):
+        self.assertIsNotNone(self.owner_a.workspace_id)
+        self.assertNotEqual(self.owner_a.workspace_id, self.owner_b.workspace_id)
+        self.assertEqual(self.owner_a.workspace.admin_id, self.owner_a.pk)
+
+    def test_scope_only_sees_own_rows(self):
+        with workspace_scope(self.owner_a.workspace_id):
+            self.assertEqual(list(Building.objects.values_list('name', flat=True)), ['A'])
+        with workspace_scope(self.owner_b.workspace_id):
+            self.assertEqual(list(Building.objects.values_list('name', flat=True)), ['B'])
+
+    def test_without_workspace_sees_nothing(self):
+        with workspace_scope(None):
+            self.assertFalse(Building.objects.exists())
+        self.assertFalse(Building.objects.for_workspace(None).exists())
+
+    def test_unscoped_sees_every_workspace(self):
+        self.assertEqual(Building.objects.count(), 2)
+
+    def test_middleware_scopes_sync_request(self):
+        middleware = WorkspaceContextMiddleware(
+            lambda request: list(Building.objects.values_list('name', flat=True))
+        )
+        for user, expected in ((self.owner_a, ['A']), (self.owner_b, ['B']), (self.orphan, [])):
+            request = RequestFactory().get('/')
+            request.user = user
+            self.assertEqual(middleware(request), expected)
+
+    async def test_middleware_scopes_async_request_from_auser(self):
+        async def get_response(request):
+            return [name async for name in Building.objects.values_list('name', flat=True)]
+
+        middleware = WorkspaceContextMiddleware(get_response)
+        request = AsyncRequestFactory().get('/')
+
+        async def auser():
+            return self.owner_b
+
+        # Pas de request.user : le chemin async ne doit pas retomber sur l'accès synchrone
+        request.auser = auser
+        self.assertEqual(await middleware(request), ['B'])
+
+
+class AuditLogQueryTests(TestCase):
+    """Consultation du journal d'audit : périmètre du workspace et pagination par clé."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner_a = create_owner('audit-owner-a')
+        cls.member_a = ImmobUser.objects.create_user(
+            username='audit-member-a', email='audit-member-a@example.com', password='x',
+            role=ImmobUser.UserRole.MANAGER, workspace=cls.owner_a.workspace,
+        )
+        cls.owner_b = create_owner('audit-owner-b')
+        cls.orphan = ImmobUser.objects.create_user(
+            username='audit-orphan', email='audit-orphan@example.com', password='x',
+            role=ImmobUser.UserRole.VIEWER,
+        )
+        cls.homeless_owner = create_owner('audit-homeless')
+        ImmobUser.objects.filter(pk=cls.homeless_owner.pk).update(workspace=None)
+        cls.homeless_owner.workspace = None
+
+        # Trois entrées par horodatage : l'ordre dépend alors de l'id
+        now = timezone.now().replace(microsecond=0)
+        cls.logs_a = [
+            AuditLog.objects.create(
+                user=user, action=AuditLog.AuditAction.UPDATE, entity_type='Contrat',
+                entity_id=uuid4(), action_date=now - timedelta(minutes=index // 3),
+            )
+            for index, user in enumerate([cls.owner_a, cls.member_a] * 4)
+        ]
+        for user in (cls.owner_b, cls.orphan, None):
+            AuditLog.objects.create(
+                user=user, action=AuditLog.AuditAction.UPDATE, entity_type='Contrat',
+                entity_id=uuid4(), action_date=now,
+            )
+
+    def expected_ids(self):
+        ordered = sorted(self.logs_a, key=lambda log: (log.action_date, log.id), reverse=True)
+        return [log.id for log in ordered]
+
+    def test_owner_only_sees_own_workspace(self):
+        page = audit_log_query_service.list_logs(self.owner_a, AuditLogQueryDTO(page_size=500))
+
+        self.assertEqual({row['id'] for row in page['results']}, {log.id for log in self.logs_a})
+
+    def test_owner_without_workspace_sees_nothing(self):
+        page = audit_log_query_service.list_logs(self.homeless_owner, AuditLogQueryDTO())
+
+        self.assertEqual(page['results'], [])
+        self.assertFalse(page['has_more'])
+        self.assertEqual(list(audit_log_query_service.iter_logs(self.homeless_owner, AuditLogQueryDTO())), [])
+
+    def test_non_owner_is_refused(self):
+        with self.assertRaises(PermissionError):
+            audit_log_query_service.list_logs(self.member_a, AuditLogQueryDTO())
+
+    def test_cursor_pages_are_continuous(self):
+        ids, cursor = [], None
+        while True:
+            page = audit_log_query_service.list_logs(self.owner_a, AuditLogQueryDTO(page_size=3, cursor=cursor))
+            ids.extend(row['id'] for row in page['results'])
+            if not page['has_more']:
+                break
+            cursor = page['next_cursor']
+
+        self.assertEqual(ids, self.expected_ids())
+
+    def test_iter_logs_walks_every_page(self):
+        rows = audit_log_query_service.iter_logs(self.owner_a, AuditLogQueryDTO(page_size=2))
+
+        self.assertEqual([row['id'] for row in rows], self.expected_ids())
+
+
+def audit_entry():
+    return AuditLog(user=None, action=AuditLog.AuditAction.UPDATE, entity_type='Test', entity_id=uuid4())
+
+
+class AuditLogBufferTests(TestCase):
+    """Écriture groupée du journal d'audit : COMMIT, lot plein, minuterie et arrêt du worker."""
+
+    def setUp(self):
+        # Tampon propre au test : l'instance du module garde son état entre les tests
+        with mock.patch('core.services.audit_log_service.atexit.register') as register:
+            self.buffer = AuditLogBuffer()
+        self.exit_callback = register.call_args.args[0]
+
+    def written(self):
+        return AuditLog.objects.filter(entity_type='Test').count()
+
+    def test_tests_write_synchronously_by_default(self):
+        self.assertFalse(settings.AUDIT_LOG_ASYNC)
+
+        log = AuditLogService.log_action(None, AuditLog.AuditAction.UPDATE, 'Test', uuid4())
+
+        self.assertTrue(AuditLog.objects.filter(pk=log.pk).exists())
+
+    @override_settings(AUDIT_LOG_ASYNC=True)
+    def test_entry_is_buffered_on_commit(self):
+        with mock.patch('core.services.audit_log_service.audit_log_buffer', self.buffer), \
+                mock.patch.object(self.buffer, '_ensure_timer'):
+            with self.captureOnCommitCallbacks(execute=True):
+                AuditLogService.log_action(None, AuditLog.AuditAction.UPDATE, 'Test', uuid4())
+                self.assertEqual(len(self.buffer), 0)
+
+        self.assertEqual(len(self.buffer), 1)
+        self.assertEqual(self.written(), 0)
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(self.written(), 1)
+
+    @override_settings(AUDIT_LOG_ASYNC=True)
+    def test_rolled_back_entry_is_dropped(self):
+        with mock.patch('core.services.audit_log_service.audit_log_buffer', self.buffer):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                try:
+                    with transaction.atomic():
+                        AuditLogService.log_action(None, AuditLog.AuditAction.UPDATE, 'Test', uuid4())
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(len(self.buffer), 0)
+
+    @override_settings(AUDIT_LOG_BATCH_SIZE=3)
+    def test_full_batch_is_flushed(self):
+        with mock.patch.object(self.buffer, '_ensure_timer'):
+            self.buffer.add(audit_entry())
+            self.buffer.add(audit_entry())
+            self.assertEqual(self.written(), 0)
+
+            self.buffer.add(audit_entry())
+
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(self.written(), 3)
+
+    @override_settings(AUDIT_LOG_FLUSH_INTERVAL=0.01)
+    def test_timer_flushes_pending_entries(self):
+        flushed = threading.Event()
+        flusher = []
+
+        def fake_flush():
+            # Le thread de fond a sa propre connexion, invisible depuis la transaction du test
+            flusher.append(threading.current_thread().name)
+            flushed.set()
+            return 0
+
+        with mock.patch.object(self.buffer, 'flush', side_effect=fake_flush):
+            self.buffer.add(audit_entry())
+            self.assertTrue(flushed.wait(timeout=5))
+            # Vidé avant de rendre le vrai flush au thread, qui tourne jusqu'à la fin du processus
+            self.buffer._entries.clear()
+
+        self.assertEqual(flusher[0], 'audit-log-flusher')
+
+    def test_exit_flushes_pending_entries(self):
+        self.assertEqual(self.exit_callback, self.buffer.flush)
+
+        with mock.patch.object(self.buffer, '_ensure_timer'):
+            self.buffer.add(audit_entry())
+            self.buffer.add(audit_entry())
+        self.assertEqual(self.written(), 0)
+
+        self.exit_callback()
+
+        self.assertEqual(len(self.buffer), 0)
+        self.assertEqual(self.written(), 2)
+
+
+class VersionedCacheTests(TestCase):
+    """Clés de cache versionnées : une invalidation rend les anciennes entrées inaccessibles."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_tests_use_a_process_local_cache(self):
+        self.assertEqual(settings.CACHES['default']['BACKEND'], 'django.core.cache.backends.locmem.LocMemCache')
+
+    def test_bump_version_changes_the_key(self):
+        key = versioned_key('test', 42)
+        cache.set(key, 'stale')
+
+        bump_version('test', 42)
+
+        self.assertNotEqual(versioned_key('test', 42), key)
+        self.assertEqual(versioned_key('test', 7), versioned_key('test', 7))
+
+    def test_evicted_version_never_reuses_an_old_key(self):
+        key = versioned_key('test', 42)
+        cache.delete('test:version:42')
+
+        self.assertNotEqual(versioned_key('test', 42), key)
+
+
+@override_settings(REFERENCE_BLOCK_SIZE=3)
+class ReferenceServiceTests(TestCase):
+    """Les blocs de références sont réservés hors transaction, sans chevauchement entre allocateurs."""
+
+    def setUp(self):
+        self.prefix = f'TEST-{uuid4().hex[:8]}'
+        # Les réservations sont validées hors de la transaction du test
+        self.addCleanup(self.delete_sequence)
+
+    def delete_sequence(self):
+        connection = connections.create_connection(DEFAULT_DB_ALIAS)
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('DELETE FROM immob_reference_sequences WHERE prefix = %s', [self.prefix])
+        finally:
+            connection.close()
+
+    def test_allocators_never_overlap(self):
+        allocators = [ReferenceService(), ReferenceService()]
+        values = {index: [] for index in range(4)}
+
+        def allocate(index):
+            for count in (1, 2, 5, 1, 3):
+                values[index].extend(allocators[index % 2].allocate(self.prefix, count))
+
+        threads = [threading.Thread(target=allocate, args=(index,)) for index in values]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        allocated = [value for chunk in values.values() for value in chunk]
+        self.assertEqual(len(allocated), 4 * 12)
+        self.assertEqual(len(set(allocated)), len(allocated))
+        self.assertEqual(len(set(ReferenceService().reserve(self.prefix, 10)) & set(allocated)), 0)
+
+    def test_block_survives_a_rolled_back_transaction(self):
+        try:
+            with transaction.atomic():
+                first = ReferenceService().allocate(self.prefix, 2)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        self.assertGreater(ReferenceService().next_value(self.prefix), max(first))
+
+    def test_connection_is_released_after_each_block(self):
+        created = []
+        create_connection = connections.create_connection
+
+        def track(alias):
+            connection = create_connection(alias)
+            created.append(connection)
+            return connection
+
+        service = ReferenceService()
+        with mock.patch.object(connections, 'create_connection', side_effect=track):
+            service.allocate(self.prefix, 2)
+            service.allocate(self.prefix, 2)
+
+        # Blocs de 3 : la seconde allocation épuise le premier bloc et en réserve un autre
+        self.assertEqual(len(created), 2)
+        self.assertTrue(all(connection.connection is None for connection in created))
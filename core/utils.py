@@ -1,5 +1,28 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+from django.conf import settings
+from django.http import HttpRequest
 from pydantic_core import ErrorDetails
+
+
+def get_client_ip(request: Optional[HttpRequest]) -> Optional[str]:
+    """
+    Adresse IP du client.
+
+    X-Forwarded-For est fourni par le client : il n'est lu que derrière
+    NUM_PROXIES proxies de confiance, dont chacun ajoute l'adresse qu'il a
+    reçue à la fin de l'en-tête. L'adresse retenue est alors la NUM_PROXIES-ième
+    en partant de la droite ; sans proxy déclaré, c'est REMOTE_ADDR.
+    """
+    if request is None:
+        return None
+    num_proxies = getattr(settings, 'NUM_PROXIES', 0)
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if num_proxies > 0 and x_forwarded_for:
+        addresses = [address.strip() for address in x_forwarded_for.split(',')]
+        return addresses[-min(num_proxies, len(addresses))]
+    return request.META.get('REMOTE_ADDR')
+
+
 def format_pydantic_errors(errors: List[ErrorDetails]) -> Dict[str, List[str]]:
     """
     Transforme la liste d'erreurs Pydantic en un dictionnaire
@@ -1,3 +1,8 @@
 from django.contrib import admin
+from .models import PortfolioStats
 
-# Register your models here.
+
+@admin.register(PortfolioStats)
+class PortfolioStatsAdmin(admin.ModelAdmin):
+    list_display = ('workspace', 'building', 'city', 'total_units', 'occupied_units', 'rent_roll', 'overdue_amount')
+    list_filter = ('city',)
@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from statistics import quantiles
+from typing import List
+from urllib.parse import urljoin
+import time
+
+import requests
+
+
+DEFAULT_PATHS = [
+    '/dashboard/',
+    '/dashboard/permissions/',
+    '/dashboard/properties/',
+    '/dashboard/search/?q=dup',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Load-test the dashboard endpoints of a running server and report p50/p95/p99 latencies. '
+        'Run it once with DATABASE_POOL=0 and once with DATABASE_POOL=1 on the server to compare.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://localhost:8000', help='Base URL of the running server')
+        parser.add_argument('--email', required=True, help='Email of the account used to log in')
+        parser.add_argument('--password', required=True, help='Password of the account used to log in')
+        parser.add_argument('--requests', type=int, default=200, help='Requests sent per path')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent client threads')
+        parser.add_argument(
+            '--path', action='append', dest='paths',
+            help='Path to benchmark (repeatable, defaults to the dashboard endpoints)'
+        )
+
+    def _login(self, base_url: str, email: str, password: str) -> requests.Session:
+        session = requests.Session()
+        login_url = urljoin(base_url, '/accounts/login/')
+        session.get(login_url).raise_for_status()
+        response = session.post(
+            login_url,
+            data={
+                'email': email,
+                'password': password,
+                'csrfmiddlewaretoken': session.cookies.get('csrftoken', ''),
+            },
+            headers={'Referer': login_url},
+            allow_redirects=False,
+        )
+        if 'sessionid' not in session.cookies:
+            raise CommandError(f"Login failed for {email} (HTTP {response.status_code}).")
+        return session
+
+    @staticmethod
+    def _timed_get(session: requests.Session, url: str) -> float:
+        start = time.perf_counter()
+        response = session.get(url, allow_redirects=False)
+        elapsed = (time.perf_counter() - start) * 1000
+        if response.status_code >= 400:
+            raise CommandError(f"GET {url} returned HTTP {response.status_code}.")
+        return elapsed
+
+    def handle(self, *args, **options):
+        base_url = options['url']
+        total = options['requests']
+        if total < 2:
+            raise CommandError('--requests must be at least 2.')
+
+        session = self._login(base_url, options['email'], options['password'])
+        # Session requests partagée entre threads : on agrandit son pool HTTP
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=options['concurrency'])
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        self.stdout.write(f"{total} requests per path, concurrency {options['concurrency']}")
+        self.stdout.write(f"{'path':<40} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            for path in options['paths'] or DEFAULT_PATHS:
+                url = urljoin(base_url, path)
+                # Échauffement (ouverture des connexions HTTP et DB)
+                self._timed_get(session, url)
+                timings: List[float] = list(executor.map(lambda _: self._timed_get(session, url), range(total)))
+                cuts = quantiles(timings, n=100, method='inclusive')
+                self.stdout.write(
+                    f"{path:<40} {cuts[49]:>7.1f}ms {cuts[94]:>7.1f}ms {cuts[98]:>7.1f}ms {max(timings):>7.1f}ms"
+                )
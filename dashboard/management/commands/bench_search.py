@@ -0,0 +1,146 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from statistics import quantiles
+from typing import List
+from accounts.models import ImmobUser, Workspace
+from dashboard.services.dtos import SearchQueryDTO
+from dashboard.services.search_service import search_service
+import time
+import uuid
+
+
+DEFAULT_TERMS = ['dup', 'marie', 'jean dup', 'martin4', 'example.com', 'Dupont.Marie1', '6912']
+
+FIRST_NAMES = [
+    'Marie', 'Jean', 'Paul', 'Claire', 'Luc', 'Anne', 'Pierre', 'Sophie', 'Louis', 'Julie',
+    'Michel', 'Nadia', 'Eric', 'Chantal', 'Yves', 'Alice', 'Hugo', 'Emma', 'Omar', 'Fatou',
+]
+LAST_NAMES = [
+    'Dupont', 'Martin', 'Bernard', 'Durand', 'Petit', 'Moreau', 'Laurent', 'Simon', 'Michel', 'Lefebvre',
+    'Mbarga', 'Ngono', 'Essomba', 'Fouda', 'Atangana', 'Tchoua', 'Kamga', 'Nkoulou', 'Owona', 'Abega',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed synthetic tenants in a throwaway workspace, then report the p50/p95/p99 latency of '
+        'SearchService typeahead queries and the EXPLAIN ANALYZE plan of the tenant query. '
+        'Writes to the configured database: refuses to run unless DEBUG is on or --i-know is given.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Synthetic tenants to insert')
+        parser.add_argument('--queries', type=int, default=50, help='Searches measured per term')
+        parser.add_argument(
+            '--term', action='append', dest='terms',
+            help='Search term to measure (repeatable, defaults to a typeahead mix)'
+        )
+        parser.add_argument(
+            '--i-know', action='store_true',
+            help='Run even with DEBUG off (the seeded rows are removed at the end)'
+        )
+
+    def _seed(self, workspace_id, rows: int, run: str) -> None:
+        """Insère les locataires en une requête (generate_series), puis met à jour les statistiques."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO immob_tenants (
+                    id, created_at, updated_at, is_deleted, workspace_id, first_name, last_name,
+                    email, phone, id_number, address, emergency_contact_name, emergency_contact_phone
+                )
+                SELECT
+                    gen_random_uuid(), now(), now(), false, %s,
+                    (%s::text[])[1 + n %% %s], (%s::text[])[1 + (n / %s) %% %s] || (n %% 97),
+                    (%s::text[])[1 + (n / %s) %% %s] || '.' || (%s::text[])[1 + n %% %s] || n || '@Example.com',
+                    '+2376' || lpad((n %% 100000000)::text, 8, '0'),
+                    %s || n, 'Adresse ' || n, 'Contact ' || n, '+2377' || lpad((n %% 100000000)::text, 8, '0')
+                FROM generate_series(1, %s) AS n
+                """,
+                [
+                    workspace_id,
+                    FIRST_NAMES, len(FIRST_NAMES), LAST_NAMES, len(FIRST_NAMES), len(LAST_NAMES),
+                    LAST_NAMES, len(FIRST_NAMES), len(LAST_NAMES), FIRST_NAMES, len(FIRST_NAMES),
+                    f"BENCH-{run}-", rows,
+                ],
+            )
+            cursor.execute("ANALYZE immob_tenants")
+
+    def _tenant_query(self, owner: ImmobUser, term: str):
+        """Capture la requête SQL des locataires exécutée par SearchService."""
+        captured = []
+
+        def capture(execute, sql, params, many, context):
+            if 'immob_tenants' in sql:
+                captured.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(capture):
+            search_service.search(owner, SearchQueryDTO(q=term, types=['tenant']))
+        return captured[-1] if captured else None
+
+    def handle(self, *args, **options):
+        if not settings.DEBUG and not options['i_know']:
+            raise CommandError('DEBUG is off: this command writes to the configured database. Pass --i-know to run it.')
+        if options['rows'] < 1 or options['queries'] < 2:
+            raise CommandError('--rows must be >= 1 and --queries >= 2.')
+
+        run = uuid.uuid4().hex[:8]
+        terms = options['terms'] or DEFAULT_TERMS
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            has_trigram = cursor.fetchone() is not None
+        if not has_trigram and any(len(term) >= search_service.MIN_TRIGRAM_LENGTH for term in terms):
+            raise CommandError(
+                f"The pg_trgm extension is not installed: terms of {search_service.MIN_TRIGRAM_LENGTH} "
+                f"characters or more use trigram lookups. Install it, or pass shorter --term values."
+            )
+        owner = ImmobUser.objects.create_user(
+            email=f"bench-search-{run}@example.com",
+            username=f"bench-search-{run}",
+            password=None,
+            role=ImmobUser.UserRole.OWNER,
+        )
+        # Workspace créé pour l'Owner par le signal create_owner_workspace
+        workspace = owner.workspace
+
+        try:
+            started = time.perf_counter()
+            self._seed(workspace.id, options['rows'], run)
+            self.stdout.write(f"Seeded {options['rows']} tenants in {time.perf_counter() - started:.1f}s")
+
+            self.stdout.write(f"{'term':<16} {'p50':>9} {'p95':>9} {'p99':>9} {'hits':>5}")
+            all_timings: List[float] = []
+            for term in terms:
+                params = SearchQueryDTO(q=term, types=['tenant'])
+                # Échauffement (cache du plan et des pages d'index)
+                hits = len(search_service.search(owner, params)['tenants'])
+                timings = []
+                for _ in range(options['queries']):
+                    start = time.perf_counter()
+                    search_service.search(owner, params)
+                    timings.append((time.perf_counter() - start) * 1000)
+                all_timings.extend(timings)
+                cuts = quantiles(timings, n=100, method='inclusive')
+                self.stdout.write(f"{term:<16} {cuts[49]:>7.1f}ms {cuts[94]:>7.1f}ms {cuts[98]:>7.1f}ms {hits:>5}")
+
+            cuts = quantiles(all_timings, n=100, method='inclusive')
+            self.stdout.write(f"{'all':<16} {cuts[49]:>7.1f}ms {cuts[94]:>7.1f}ms {cuts[98]:>7.1f}ms")
+
+            captured = self._tenant_query(owner, terms[0])
+            if captured:
+                sql, sql_params = captured
+                with connection.cursor() as cursor:
+                    cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {sql}", sql_params)
+                    self.stdout.write(f"\nEXPLAIN ANALYZE (q={terms[0]!r}):")
+                    for (line,) in cursor.fetchall():
+                        self.stdout.write(line)
+        finally:
+            # Suppression directe : la cascade de l'ORM chargerait chaque locataire
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM immob_tenants WHERE workspace_id = %s", [workspace.id])
+            owner.workspace = None
+            owner.save(update_fields=['workspace'])
+            Workspace.all_objects.filter(pk=workspace.pk).delete()
+            ImmobUser.objects.filter(pk=owner.pk).delete()
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from dashboard.services.portfolio_stats_service import portfolio_stats_service
+
+
+class Command(BaseCommand):
+    help = 'Fully rebuild the materialized dashboard portfolio statistics'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workspace', action='append', dest='workspaces',
+            help='Only rebuild this workspace id (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        totals = portfolio_stats_service.rebuild(options['workspaces'])
+        self.stdout.write(self.style.SUCCESS(
+            f"{totals['rows']} stats rows rebuilt across {totals['workspaces']} workspaces."
+        ))
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:43
+
+import django.db.models.deletion
+import uuid
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts', '0003_userbuildingpermission_permission_level_score_and_more'),
+        ('holdings', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioStats',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('city', models.CharField(blank=True, max_length=100, verbose_name='City')),
+                ('total_units', models.PositiveIntegerField(default=0, verbose_name='Total units')),
+                ('occupied_units', models.PositiveIntegerField(default=0, verbose_name='Occupied units')),
+                ('available_units', models.PositiveIntegerField(default=0, verbose_name='Available units')),
+                ('maintenance_units', models.PositiveIntegerField(default=0, verbose_name='Maintenance units')),
+                ('rent_roll', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Rent roll')),
+                ('overdue_amount', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=14, verbose_name='Overdue amount')),
+                ('overdue_count', models.PositiveIntegerField(default=0, verbose_name='Overdue payments')),
+                ('building', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='portfolio_stats', to='holdings.building')),
+                ('workspace', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='portfolio_stats', to='accounts.workspace')),
+            ],
+            options={
+                'verbose_name': 'Portfolio Stats',
+                'verbose_name_plural': 'Portfolio Stats',
+                'db_table': 'immob_portfolio_stats',
+                'ordering': ['city'],
+                'indexes': [models.Index(fields=['workspace', 'city'], name='immob_portf_workspa_338bc6_idx')],
+                'constraints': [models.UniqueConstraint(fields=('building',), name='unique_portfolio_stats_building'), models.UniqueConstraint(condition=models.Q(('building__isnull', True)), fields=('workspace',), name='unique_portfolio_stats_unassigned')],
+            },
+        ),
+    ]
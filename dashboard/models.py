@@ -1,3 +1,80 @@
 from django.db import models
+from django.db.models import Q
+from django.utils.translation import gettext_lazy as _
+from decimal import Decimal
+from core.models import ImmobBaseModel
 
-# Create your models here.
+
+class PortfolioStats(ImmobBaseModel):
+    """
+    Statistiques de portefeuille matérialisées, une ligne par bâtiment
+    (building NULL : propriétés du workspace non rattachées à un bâtiment).
+
+    Maintenues de façon incrémentale par PortfolioStatsService à chaque
+    modification d'une propriété, d'un contrat ou d'un paiement, et
+    reconstruites entièrement par la commande rebuild_portfolio_stats.
+    """
+
+    workspace = models.ForeignKey(
+        "accounts.Workspace",
+        on_delete=models.CASCADE,
+        related_name='portfolio_stats'
+    )
+    building = models.ForeignKey(
+        "holdings.Building",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='portfolio_stats'
+    )
+    city = models.CharField(max_length=100, blank=True, verbose_name=_('City'))
+
+    # Occupation
+    total_units = models.PositiveIntegerField(default=0, verbose_name=_('Total units'))
+    occupied_units = models.PositiveIntegerField(default=0, verbose_name=_('Occupied units'))
+    available_units = models.PositiveIntegerField(default=0, verbose_name=_('Available units'))
+    maintenance_units = models.PositiveIntegerField(default=0, verbose_name=_('Maintenance units'))
+
+    # Finances
+    rent_roll = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name=_('Rent roll')
+    )
+    overdue_amount = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        verbose_name=_('Overdue amount')
+    )
+    overdue_count = models.PositiveIntegerField(default=0, verbose_name=_('Overdue payments'))
+
+    class Meta:
+        db_table = 'immob_portfolio_stats'
+        verbose_name = _('Portfolio Stats')
+        verbose_name_plural = _('Portfolio Stats')
+        ordering = ['city']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['building'],
+                name='unique_portfolio_stats_building',
+            ),
+            models.UniqueConstraint(
+                fields=['workspace'],
+                condition=Q(building__isnull=True),
+                name='unique_portfolio_stats_unassigned',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['workspace', 'city']),
+        ]
+
+    def __str__(self):
+        return f"{self.workspace_id} - {self.building_id or '-'} - {self.occupied_units}/{self.total_units}" # type: ignore
+
+    @property
+    def occupancy_rate(self) -> float:
+        if not self.total_units:
+            return 0.0
+        return (self.occupied_units / self.total_units) * 100
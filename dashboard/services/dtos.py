@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import List
+
+
+SEARCH_TYPES = ('tenant', 'property', 'building')
+
+
+class SearchQueryDTO(BaseModel):
+    """
+    Paramètres de la recherche globale (typeahead).
+    Utilisé par SearchService.search.
+    """
+    q: str = Field(..., min_length=1, max_length=100)
+    types: List[str] = list(SEARCH_TYPES)
+    limit: int = Field(5, ge=1, le=20)
+
+    @field_validator('q')
+    def strip_query(cls, value):
+        """
+        Supprime les espaces superflus autour du terme recherché.
+        """
+        value = value.strip()
+        if not value:
+            raise ValueError("Le terme recherché ne peut pas être vide.")
+        return value
+
+    @field_validator('types', mode='before')
+    def validate_types(cls, value):
+        """
+        Accepte une liste ou une chaîne séparée par des virgules de types valides.
+        """
+        if isinstance(value, str):
+            value = [item.strip() for item in value.split(',') if item.strip()]
+        invalid = [item for item in value if item not in SEARCH_TYPES]
+        if invalid:
+            raise ValueError(f"Les types doivent être parmi les suivants : {', '.join(SEARCH_TYPES)}")
+        return value
@@ -0,0 +1,262 @@
+from accounts.models import ImmobUser, Workspace, UserBuildingPermission
+from accounts.services.access_services import AccessControlService
+from accounts.services.permission_resolver import PermissionResolver
+from dashboard.models import PortfolioStats
+from finance.models import Contrat, Payment
+from holdings.models import Building, Property
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+from django.http import HttpRequest
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import threading
+
+
+# (workspace_id, building_id) ; building_id None = propriétés sans bâtiment
+StatsKey = Tuple[Any, Optional[Any]]
+
+
+class PortfolioStatsService:
+    """
+    Maintient la table PortfolioStats (KPI du tableau de bord par bâtiment).
+
+    Les modifications de propriétés, contrats et paiements planifient le
+    recalcul des bâtiments touchés, exécuté une seule fois au COMMIT de la
+    transaction (3 requêtes agrégées par workspace, quel que soit le nombre
+    de lignes modifiées).
+    """
+
+    # Clé (classe) du verrou consultatif PostgreSQL sérialisant les recalculs d'un workspace
+    LOCK_CLASS = 0x5057_A75
+
+    def __init__(self):
+        self._local = threading.local()
+
+    # ------------------------------------------------------------------
+    # Planification incrémentale
+    # ------------------------------------------------------------------
+
+    def _pending(self) -> Set[StatsKey]:
+        pending = getattr(self._local, 'pending', None)
+        if pending is None:
+            pending = self._local.pending = set()
+        return pending
+
+    def _flush_scheduled(self) -> bool:
+        """Un vidage est-il encore planifié sur la transaction courante ?"""
+        # Les callbacks on_commit disparaissent avec un ROLLBACK (transaction ou savepoint)
+        connection = transaction.get_connection()
+        return any(func == self._flush_pending for _, func, _ in reversed(connection.run_on_commit))
+
+    def schedule_refresh(self, keys: Iterable[StatsKey]) -> None:
+        """
+        Planifie le recalcul des bâtiments donnés au COMMIT de la transaction
+        courante (immédiatement hors transaction). Les clés sont dédoublonnées ;
+        celles d'une transaction annulée sont abandonnées.
+        """
+        keys = [key for key in keys if key[0] is not None]
+        if not keys:
+            return
+        pending = self._pending()
+        if pending and not self._flush_scheduled():
+            pending.clear()
+        pending.update(keys)
+        transaction.on_commit(self._flush_pending)
+
+    def _flush_pending(self) -> None:
+        pending = self._pending()
+        if not pending:
+            return
+        keys = list(pending)
+        pending.clear()
+        self.refresh(keys)
+
+    def keys_for_properties(self, property_ids: Iterable[Any]) -> Set[StatsKey]:
+        """Clés de statistiques des propriétés données (1 requête)."""
+        return set(
+            Property.all_objects.filter(id__in=list(property_ids))
+            .values_list('workspace_id', 'building_id')
+            .distinct()
+        )
+
+    # ------------------------------------------------------------------
+    # Recalcul
+    # ------------------------------------------------------------------
+
+    def _lock_workspace(self, workspace_id: Any) -> None:
+        """Sérialise les recalculs d'un même workspace (libéré au COMMIT)."""
+        if connection.vendor != 'postgresql':
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, hashtext(%s))",
+                [self.LOCK_CLASS, str(workspace_id)]
+            )
+
+    @staticmethod
+    def _scope(prefix: str, building_ids: Optional[List[Any]]) -> Q:
+        """Filtre sur les bâtiments recalculés (None = tout le workspace)."""
+        if building_ids is None:
+            return Q()
+        scope = Q(**{f'{prefix}building_id__in': [b for b in building_ids if b is not None]})
+        if None in building_ids:
+            scope |= Q(**{f'{prefix}building__isnull': True})
+        return scope
+
+    def _compute(self, workspace_id: Any, building_ids: Optional[List[Any]]) -> List[PortfolioStats]:
+        """Calcule les lignes de statistiques du périmètre (4 requêtes agrégées)."""
+        rows: Dict[Optional[Any], PortfolioStats] = {}
+
+        def row(building_id: Optional[Any]) -> PortfolioStats:
+            if building_id not in rows:
+                rows[building_id] = PortfolioStats(workspace_id=workspace_id, building_id=building_id)
+            return rows[building_id]
+
+        buildings = Building.objects.filter(workspace_id=workspace_id)
+        if building_ids is not None:
+            buildings = buildings.filter(id__in=[b for b in building_ids if b is not None])
+        for building_id, city in buildings.values_list('id', 'city'):
+            row(building_id).city = city
+
+        status = Property.PropertyStatus
+        units = (
+            Property.objects.filter(workspace_id=workspace_id)
+            .filter(self._scope('', building_ids))
+            .filter(Q(building__isnull=True) | Q(building__is_deleted=False))
+            .values('building_id')
+            .annotate(
+                total=Count('id'),
+                occupied=Count('id', filter=Q(status=status.OCCUPIED)),
+                available=Count('id', filter=Q(status=status.AVAILABLE)),
+                maintenance=Count('id', filter=Q(status=status.MAINTENANCE)),
+            )
+        )
+        for entry in units:
+            stats = row(entry['building_id'])
+            stats.total_units = entry['total']
+            stats.occupied_units = entry['occupied']
+            stats.available_units = entry['available']
+            stats.maintenance_units = entry['maintenance']
+
+        rents = (
+            Contrat.objects.filter(
+                status=Contrat.ContratStatus.ACTIVE,
+                property__workspace_id=workspace_id,
+                property__is_deleted=False,
+            )
+            .filter(self._scope('property__', building_ids))
+            .values('property__building_id')
+            .annotate(rent_roll=Sum('monthly_rent'))
+        )
+        for entry in rents:
+            if entry['property__building_id'] in rows or entry['property__building_id'] is None:
+                row(entry['property__building_id']).rent_roll = entry['rent_roll'] or Decimal('0.00')
+
+        overdue = (
+            Payment.objects.filter(
+                status=Payment.PaymentStatus.LATE,
+                contrat__is_deleted=False,
+                contrat__property__workspace_id=workspace_id,
+                contrat__property__is_deleted=False,
+            )
+            .filter(self._scope('contrat__property__', building_ids))
+            .values('contrat__property__building_id')
+            .annotate(amount=Sum('amount'), count=Count('id'))
+        )
+        for entry in overdue:
+            building_id = entry['contrat__property__building_id']
+            if building_id in rows or building_id is None:
+                stats = row(building_id)
+                stats.overdue_amount = entry['amount'] or Decimal('0.00')
+                stats.overdue_count = entry['count']
+
+        return list(rows.values())
+
+    def _refresh_workspace(self, workspace_id: Any, building_ids: Optional[List[Any]]) -> int:
+        with transaction.atomic():
+            self._lock_workspace(workspace_id)
+            stats = self._compute(workspace_id, building_ids)
+            PortfolioStats.objects.filter(workspace_id=workspace_id).filter(
+                self._scope('', building_ids)
+            ).delete()
+            PortfolioStats.objects.bulk_create(stats)
+        return len(stats)
+
+    def refresh(self, keys: Iterable[StatsKey]) -> int:
+        """
+        Recalcule les statistiques des bâtiments donnés, workspace par workspace.
+
+        :return: Le nombre de lignes de statistiques écrites.
+        """
+        by_workspace: Dict[Any, Set[Optional[Any]]] = {}
+        for workspace_id, building_id in keys:
+            by_workspace.setdefault(workspace_id, set()).add(building_id)
+
+        written = 0
+        for workspace_id, building_ids in by_workspace.items():
+            written += self._refresh_workspace(workspace_id, list(building_ids))
+        return written
+
+    def rebuild(self, workspace_ids: Optional[Iterable[Any]] = None) -> Dict[str, int]:
+        """
+        Reconstruction complète (commande rebuild_portfolio_stats), un
+        workspace par transaction.
+
+        :return: {'workspaces': ..., 'rows': ...}
+        """
+        if workspace_ids is None:
+            workspace_ids = list(Workspace.objects.values_list('id', flat=True))
+            # Workspaces supprimés (logiquement) : plus de statistiques
+            PortfolioStats.objects.exclude(workspace_id__in=workspace_ids).delete()
+        totals = {'workspaces': 0, 'rows': 0}
+        for workspace_id in list(workspace_ids):
+            totals['rows'] += self._refresh_workspace(workspace_id, None)
+            totals['workspaces'] += 1
+        return totals
+
+    # ------------------------------------------------------------------
+    # Lecture
+    # ------------------------------------------------------------------
+
+    def get_portfolio_summary(
+        self,
+        acting_user: ImmobUser,
+        request: Optional[HttpRequest] = None
+    ) -> Dict[str, Any]:
+        """
+        KPI du tableau de bord lus depuis la table matérialisée (1 requête) :
+        lignes par bâtiment, agrégats par ville et totaux du portefeuille.
+        Un non-Owner ne voit que les bâtiments qu'il peut consulter.
+        """
+        stats = PortfolioStats.objects.filter(workspace_id=acting_user.workspace_id) # type: ignore
+        if acting_user.role != ImmobUser.UserRole.OWNER:
+            view_score = AccessControlService.PERMISSION_HIERARCHY[UserBuildingPermission.PermissionLevel.VIEW]
+            resolver = PermissionResolver.for_user(acting_user, request)
+            visible = [b for b, score in resolver.scores.items() if score >= view_score]
+            stats = stats.filter(building_id__in=visible)
+
+        counters = ('total_units', 'occupied_units', 'available_units', 'maintenance_units', 'overdue_count')
+        amounts = ('rent_roll', 'overdue_amount')
+        rows = list(stats.values('building_id', 'building__name', 'city', *counters, *amounts))
+
+        def summarize(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+            summary: Dict[str, Any] = {field: sum(e[field] for e in entries) for field in counters}
+            summary.update({field: sum((e[field] for e in entries), Decimal('0.00')) for field in amounts})
+            total = summary['total_units']
+            summary['occupancy_rate'] = (summary['occupied_units'] / total) * 100 if total else 0.0
+            return summary
+
+        by_city: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in rows:
+            total = entry['total_units']
+            entry['occupancy_rate'] = (entry['occupied_units'] / total) * 100 if total else 0.0
+            by_city.setdefault(entry['city'], []).append(entry)
+
+        return {
+            'buildings': rows,
+            'cities': [{'city': city, **summarize(entries)} for city, entries in sorted(by_city.items())],
+            'totals': summarize(rows),
+        }
+
+
+portfolio_stats_service = PortfolioStatsService()
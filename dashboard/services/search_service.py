@@ -0,0 +1,152 @@
+from accounts.models import ImmobUser, UserBuildingPermission
+from accounts.services.access_services import AccessControlService
+from accounts.services.permission_resolver import PermissionResolver
+from dashboard.services.dtos import SearchQueryDTO
+from finance.models import Contrat, Tenant
+from holdings.models import Building, Property
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db.models import F, FloatField, Q, QuerySet, Subquery, Value
+from django.db.models.functions import Greatest
+from django.http import HttpRequest
+from typing import Any, Dict, List, Optional, Tuple
+import re
+
+
+class SearchService:
+    """
+    Recherche globale (typeahead) sur les locataires, propriétés et bâtiments.
+
+    - Plein texte : colonnes tsvector générées (config 'simple') indexées en
+      GIN, interrogées par préfixe (chaque mot saisi est complété : « dup » → dupont).
+    - Approché : index GIN pg_trgm sur la référence, le téléphone et l'email
+      (sous-chaîne et similarité), à partir de MIN_TRIGRAM_LENGTH caractères.
+
+    Chaque type est limité à `limit` résultats, classés par pertinence parmi
+    les RANK_WINDOW premières correspondances : un préfixe court correspond
+    à une grande part des lignes, qu'il faudrait sinon toutes classer. En
+    dessous de MIN_TERM_LENGTH caractères, rien n'est cherché (mesure :
+    commande bench_search).
+    """
+
+    MIN_TERM_LENGTH = 2
+    MIN_TRIGRAM_LENGTH = 3
+    RANK_WINDOW = 500
+
+    @staticmethod
+    def _prefix_query(term: str) -> Optional[SearchQuery]:
+        """Requête tsquery « mot1:* & mot2:* » (les mots sont réduits à \\w+, sans opérateurs)."""
+        tokens = re.findall(r'\w+', term.lower())
+        if not tokens:
+            return None
+        return SearchQuery(' & '.join(f"{token}:*" for token in tokens), search_type='raw', config='simple')
+
+    @staticmethod
+    def _visible_building_ids(acting_user: ImmobUser, request: Optional[HttpRequest]) -> Optional[List[Any]]:
+        """Bâtiments consultables (None : tout le workspace, pour un Owner)."""
+        if acting_user.role == ImmobUser.UserRole.OWNER:
+            return None
+        view_score = AccessControlService.PERMISSION_HIERARCHY[UserBuildingPermission.PermissionLevel.VIEW]
+        resolver = PermissionResolver.for_user(acting_user, request)
+        return [building_id for building_id, score in resolver.scores.items() if score >= view_score]
+
+    def _rank(self, query: Optional[SearchQuery], term: str, *trigram_fields: str):
+        """Pertinence : rang plein texte, ou similarité trigramme si elle est meilleure."""
+        ranks = []
+        if query is not None:
+            ranks.append(SearchRank(F('search_vector'), query))
+        if len(term) >= self.MIN_TRIGRAM_LENGTH:
+            ranks.extend(TrigramSimilarity(field, term) for field in trigram_fields)
+        if not ranks:
+            return Value(0.0, output_field=FloatField())
+        return Greatest(*ranks) if len(ranks) > 1 else ranks[0]
+
+    def _match(self, query: Optional[SearchQuery], term: str, fuzzy: Dict[str, List[Tuple[str, str]]]) -> Q:
+        """
+        Condition de correspondance : plein texte OU lookups servis par les
+        index trigrammes {champ: [(lookup, valeur)]}. contains et trigram_similar
+        portent sur la colonne brute ; icontains (UPPER(colonne)) n'est servi
+        que par un index sur UPPER(colonne), comme pour l'email des locataires.
+        """
+        condition = Q(search_vector=query) if query is not None else Q(pk__in=[])
+        if len(term) >= self.MIN_TRIGRAM_LENGTH:
+            for field, lookups in fuzzy.items():
+                for lookup, value in lookups:
+                    condition |= Q(**{f"{field}__{lookup}": value})
+        return condition
+
+    def _top(self, queryset: QuerySet, query: Optional[SearchQuery], term: str,
+             fuzzy: Dict[str, List[Tuple[str, str]]], limit: int, fields: List[str]) -> List[Dict[str, Any]]:
+        if query is None and len(term) < self.MIN_TRIGRAM_LENGTH:
+            return []
+        # Fenêtre de classement bornée : le coût ne dépend plus du nombre de correspondances
+        candidates = queryset.filter(self._match(query, term, fuzzy)).values('pk')[:self.RANK_WINDOW]
+        return list(
+            queryset.filter(pk__in=Subquery(candidates))
+            .annotate(rank=self._rank(query, term, *fuzzy.keys()))
+            .order_by('-rank', 'id')
+            .values(*fields)[:limit]
+        )
+
+    def search(
+        self,
+        acting_user: ImmobUser,
+        params: SearchQueryDTO,
+        request: Optional[HttpRequest] = None
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Recherche dans le workspace de l'utilisateur, restreinte aux bâtiments
+        qu'il peut consulter s'il n'est pas Owner.
+
+        :return: {'tenants': [...], 'properties': [...], 'buildings': [...]}
+        """
+        results: Dict[str, List[Dict[str, Any]]] = {'tenants': [], 'properties': [], 'buildings': []}
+        workspace_id = acting_user.workspace_id # type: ignore
+        if workspace_id is None:
+            return results
+
+        term = params.q
+        if len(term) < self.MIN_TERM_LENGTH:
+            return results
+        query = self._prefix_query(term)
+        visible = self._visible_building_ids(acting_user, request)
+
+        if 'tenant' in params.types:
+            tenants = Tenant.objects.filter(workspace_id=workspace_id)
+            if visible is not None:
+                tenants = tenants.filter(id__in=Contrat.objects.filter(
+                    property__building_id__in=visible
+                ).values('tenant_id'))
+            results['tenants'] = self._top(
+                tenants, query, term,
+                {
+                    'phone': [('contains', term)],
+                    'email': [('icontains', term), ('trigram_similar', term)],
+                },
+                params.limit,
+                ['id', 'first_name', 'last_name', 'email', 'phone'],
+            )
+
+        if 'property' in params.types:
+            properties = Property.objects.filter(workspace_id=workspace_id)
+            if visible is not None:
+                properties = properties.filter(building_id__in=visible)
+            results['properties'] = self._top(
+                properties, query, term,
+                {'reference_code': [('contains', term.upper()), ('trigram_similar', term)]},
+                params.limit,
+                ['id', 'name', 'reference_code', 'door_number', 'status', 'building_id', 'building__name'],
+            )
+
+        if 'building' in params.types:
+            buildings = Building.objects.filter(workspace_id=workspace_id)
+            if visible is not None:
+                buildings = buildings.filter(id__in=visible)
+            results['buildings'] = self._top(
+                buildings, query, term, {}, params.limit,
+                ['id', 'name', 'street', 'city'],
+            )
+
+        return results
+
+
+search_service = SearchService()
@@ -0,0 +1,52 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from finance.models import Contrat, Payment
+from holdings.models import Building, Property
+from .services.portfolio_stats_service import portfolio_stats_service
+
+
+@receiver(pre_save, sender=Property)
+def remember_previous_building(sender, instance, update_fields=None, **kwargs):
+    """Mémorise le bâtiment d'origine : un changement de bâtiment recalcule les deux"""
+    if instance._state.adding or (update_fields is not None and 'building' not in update_fields):
+        return
+    instance._previous_building_id = Property.all_objects.filter(
+        pk=instance.pk
+    ).values_list('building_id', flat=True).first()
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def refresh_stats_on_property_change(sender, instance, **kwargs):
+    """Recalcule les statistiques du bâtiment de la propriété au COMMIT"""
+    keys = {(instance.workspace_id, instance.building_id)}
+    if hasattr(instance, '_previous_building_id'):
+        keys.add((instance.workspace_id, instance._previous_building_id))
+    portfolio_stats_service.schedule_refresh(keys)
+
+
+@receiver(post_save, sender=Building)
+def refresh_stats_on_building_change(sender, instance, **kwargs):
+    """Ville modifiée ou bâtiment supprimé logiquement"""
+    portfolio_stats_service.schedule_refresh([(instance.workspace_id, instance.pk)])
+
+
+@receiver(post_save, sender=Contrat)
+@receiver(post_delete, sender=Contrat)
+def refresh_stats_on_contrat_change(sender, instance, **kwargs):
+    """Loyers en cours : recalcul du bâtiment de la propriété louée"""
+    if Contrat.property.is_cached(instance): # type: ignore
+        keys = {(instance.property.workspace_id, instance.property.building_id)}
+    else:
+        keys = portfolio_stats_service.keys_for_properties([instance.property_id])
+    portfolio_stats_service.schedule_refresh(keys)
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def refresh_stats_on_payment_change(sender, instance, **kwargs):
+    """Impayés : recalcul du bâtiment du contrat"""
+    keys = Contrat.all_objects.filter(pk=instance.contrat_id).values_list(
+        'property__workspace_id', 'property__building_id'
+    )
+    portfolio_stats_service.schedule_refresh(set(keys))
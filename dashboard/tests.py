@@ -1,3 +1,184 @@
+import threading
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.db import transaction
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import ImmobUser
+from dashboard.models import PortfolioStats
+from dashboard.services.portfolio_stats_service import PortfolioStatsService, portfolio_stats_service
+from finance.models import Contrat, Payment, Tenant
+from holdings.models import Building, Property
+
+
+class PendingRefreshTests(TestCase):
+    """Clés de recalcul en attente : par thread, vidées une fois au COMMIT, abandonnées au ROLLBACK."""
+
+    def setUp(self):
+        # Instance propre au test : les callbacks on_commit du setUpTestData ne la concernent pas
+        self.service = PortfolioStatsService()
+        self.refresh = mock.patch.object(self.service, 'refresh').start()
+        self.addCleanup(mock.patch.stopall)
+
+    def test_keys_are_flushed_once_at_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.service.schedule_refresh([('ws', 'a'), ('ws', 'b')])
+            self.service.schedule_refresh([('ws', 'a'), (None, 'ignored')])
+
+        self.assertEqual(len(callbacks), 2)
+        self.refresh.assert_called_once()
+        self.assertEqual(set(self.refresh.call_args.args[0]), {('ws', 'a'), ('ws', 'b')})
+        self.assertEqual(self.service._pending(), set())
+
+    def test_rollback_discards_pending_keys(self):
+        try:
+            with transaction.atomic():
+                self.service.schedule_refresh([('ws', 'rolled-back')])
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.schedule_refresh([('ws', 'committed')])
+
+        self.assertEqual(list(self.refresh.call_args.args[0]), [('ws', 'committed')])
+
+    def test_savepoint_rollback_keeps_the_outer_keys(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.service.schedule_refresh([('ws', 'outer')])
+            try:
+                with transaction.atomic():
+                    self.service.schedule_refresh([('ws', 'inner')])
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertIn(('ws', 'outer'), set(self.refresh.call_args.args[0]))
+
+    def test_pending_keys_are_per_thread(self):
+        self.service._pending().add(('ws', 'main'))
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(set(self.service._pending())))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(seen, [set()])
+
+
+class PortfolioStatsConsistencyTests(TestCase):
+    """Les statistiques matérialisées restent égales à un agrégat direct après chaque modification."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = ImmobUser.objects.create_user(
+            username='stats-owner', email='stats-owner@example.com', password=None, role=ImmobUser.UserRole.OWNER,
+        )
+        cls.workspace = cls.owner.workspace
+        cls.buildings = [
+            Building.objects.create(workspace=cls.workspace, name=name, street='Rue', city=city)
+            for name, city in (('S0', 'Douala'), ('S1', 'Yaoundé'))
+        ]
+        cls.tenant = Tenant.objects.create(
+            workspace=cls.workspace, first_name='Stats', phone='600000000', id_number='ID-STATS',
+            address='Douala', emergency_contact_name='Contact', emergency_contact_phone='600000001',
+        )
+
+    def setUp(self):
+        # Recalcul en attente depuis setUpTestData (transaction de classe jamais validée)
+        portfolio_stats_service._flush_pending()
+
+    def add_property(self, building, code):
+        return Property.objects.create(
+            building=building, workspace=self.workspace, reference_code=code, name=code,
+            type=Property.PropertyType.APARTMENT, surface_area=40, room_count=2, monthly_rent=Decimal('100000'),
+        )
+
+    def add_contrat(self, property, number, status=Contrat.ContratStatus.ACTIVE):
+        return Contrat.objects.create(
+            workspace=self.workspace, property=property, tenant=self.tenant, contrat_number=number,
+            start_date=date(2026, 1, 1), end_date=date(2026, 12, 31), monthly_rent=Decimal('90000'), status=status,
+        )
+
+    def live(self):
+        """Agrégat calculé directement sur les tables, bâtiment par bâtiment."""
+        rows = {}
+        for building in Building.objects.filter(workspace=self.workspace):
+            properties = Property.objects.filter(building=building)
+            contrats = Contrat.objects.filter(property__building=building, status=Contrat.ContratStatus.ACTIVE)
+            late = Payment.objects.filter(contrat__property__building=building, status=Payment.PaymentStatus.LATE)
+            rows[building.pk] = (
+                building.city,
+                properties.count(),
+                properties.filter(status=Property.PropertyStatus.OCCUPIED).count(),
+                sum((contrat.monthly_rent for contrat in contrats), Decimal('0.00')),
+                sum((payment.amount for payment in late), Decimal('0.00')),
+                late.count(),
+            )
+        return rows
+
+    def stored(self):
+        return {
+            stats.building_id: (
+                stats.city, stats.total_units, stats.occupied_units,
+                stats.rent_roll, stats.overdue_amount, stats.overdue_count,
+            )
+            for stats in PortfolioStats.objects.filter(workspace=self.workspace)
+        }
+
+    def assertStatsMatchLive(self):
+        self.assertEqual(self.stored(), self.live())
+
+    def test_stats_follow_property_contrat_and_payment_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.add_property(self.buildings[0], 'S0-1')
+            second = self.add_property(self.buildings[0], 'S0-2')
+            self.add_property(self.buildings[1], 'S1-1')
+        self.assertStatsMatchLive()
+
+        # Contrat activé : propriété occupée, loyer en cours et échéancier généré
+        contrat = self.add_contrat(first, 'CTR-S-1', status=Contrat.ContratStatus.DRAFT)
+        with self.captureOnCommitCallbacks(execute=True):
+            contrat.activate()
+        self.assertStatsMatchLive()
+        self.assertEqual(self.stored()[self.buildings[0].pk][2:4], (1, Decimal('90000.00')))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Payment.objects.filter(contrat=contrat, due_date__gte=date(2026, 6, 1)).update(
+                status=Payment.PaymentStatus.PENDING
+            )
+            for payment in Payment.objects.filter(contrat=contrat, due_date__lt=date(2026, 6, 1)):
+                payment.status = Payment.PaymentStatus.LATE
+                payment.save()
+        self.assertStatsMatchLive()
+        self.assertEqual(self.stored()[self.buildings[0].pk][4:], (Decimal('450000.00'), 5))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Payment.objects.get(contrat=contrat, due_date=date(2026, 1, 1)).mark_as_paid()
+            contrat.terminate()
+        self.assertStatsMatchLive()
+        self.assertEqual(self.stored()[self.buildings[0].pk][2:], (0, Decimal('0.00'), Decimal('360000.00'), 4))
+
+        # Propriété déplacée : les deux bâtiments sont recalculés
+        with self.captureOnCommitCallbacks(execute=True):
+            second.building = self.buildings[1]
+            second.save()
+        self.assertStatsMatchLive()
+        self.assertEqual(self.stored()[self.buildings[1].pk][1], 2)
+
+    def test_rolled_back_change_leaves_stats_untouched(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_property(self.buildings[0], 'S0-1')
+        before = self.stored()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.add_property(self.buildings[0], 'S0-2')
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(self.stored(), before)
+        self.assertStatsMatchLive()
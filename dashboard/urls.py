@@ -7,14 +7,21 @@ from .views.contrats import ContratsView
 from .views.tenants import TenantsView
 from .views.finances import FinancesView
 from .views.maintenances import MaintenancesView
+from .views.audit_logs import get_audit_logs
+from .views.search import search
+from .views.listings import list_buildings, list_properties
 
 urlpatterns = [
    path("", DashboardView.as_view(), name="dashboard"),
    path("teams/", TeamsView.as_view(), name="teams"),
    path("properties/", PropertiesView.as_view(), name="properties"),
+   path("properties/list/", list_properties, name="list_properties"),
+   path("buildings/list/", list_buildings, name="list_buildings"),
    path("contrats/", ContratsView.as_view(), name="contrats"),
    path("tenants/", TenantsView.as_view(), name="tenants"),
    path("finances/", FinancesView.as_view(), name="finances"),
    path("maintenances/", MaintenancesView.as_view(), name="maintenances"),
    path("permissions/", get_global_permissions, name="get_global_permissions"),
+   path("audit-logs/", get_audit_logs, name="audit_logs"),
+   path("search/", search, name="search"),
 ]
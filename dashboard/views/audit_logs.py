@@ -0,0 +1,33 @@
+from django.contrib.auth.decorators import login_required
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http.response import JsonResponse, StreamingHttpResponse
+from pydantic import ValidationError
+from core.pagination import InvalidCursorError
+from core.services.audit_log_query_service import audit_log_query_service
+from core.services.dtos import AuditLogQueryDTO
+from core.utils import format_pydantic_errors
+import json
+
+
+@login_required(login_url="/accounts/login")
+def get_audit_logs(request, *args, **kwargs):
+    """
+    Journal d'audit paginé par curseur (JSON).
+    Avec ?stream=1, toutes les pages sont envoyées en flux (NDJSON, une entrée par ligne).
+    """
+    try:
+        filters = AuditLogQueryDTO.model_validate(request.GET.dict())
+        if request.GET.get("stream"):
+            logs = audit_log_query_service.iter_logs(request.user, filters)
+            lines = (json.dumps(log, cls=DjangoJSONEncoder) + "\n" for log in logs)
+            return StreamingHttpResponse(lines, content_type="application/x-ndjson")
+
+        page = audit_log_query_service.list_logs(request.user, filters)
+    except ValidationError as ve:
+        return JsonResponse({"errors": format_pydantic_errors(ve.errors())}, status=400)
+    except InvalidCursorError as e:
+        return JsonResponse({"errors": {"cursor": [str(e)]}}, status=400)
+    except PermissionError as e:
+        return JsonResponse({"errors": [{"msg": str(e)}]}, status=403)
+
+    return JsonResponse(page)
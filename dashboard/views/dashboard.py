@@ -3,22 +3,35 @@ from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.decorators import login_required
 from django.http.response import JsonResponse
+from accounts.models import ImmobUser
+from accounts.services.dtos import TeamMemberListQueryDTO
 from accounts.services.team_service import team_service
 from accounts.services.access_services import AccessControlService
+from dashboard.services.portfolio_stats_service import portfolio_stats_service
 
 
 class DashboardView(LoginRequiredMixin, View):
     login_url = "/accounts/login"
 
     def get(self, request):
-        users = team_service.list_team_members(acting_user=request.user)
+        def team_members():
+            # Équipe réservée à l'Owner ; première page seulement (charge bornée)
+            if request.user.role != ImmobUser.UserRole.OWNER:
+                return []
+            return team_service.list_team_members_page(
+                acting_user=request.user, filters=TeamMemberListQueryDTO()
+            )["results"]
+
         return render_inertia(request, "dashboard/Index", {
-            "users" : defer(users)
+            "users" : defer(team_members),
+            "portfolio": defer(
+                lambda: portfolio_stats_service.get_portfolio_summary(request.user, request=request)
+            ),
         })
 
 
 @login_required(login_url="/accounts/login")
-def get_global_permissions(request, *args, **kwargs):
-   
-    permissions = AccessControlService.get_global_permission(request.user)
+async def get_global_permissions(request, *args, **kwargs):
+    user = await request.auser()
+    permissions = await AccessControlService.aget_global_permission(user)
     return JsonResponse(permissions)
\ No newline at end of file
@@ -0,0 +1,34 @@
+from django.contrib.auth.decorators import login_required
+from django.http.response import JsonResponse
+from pydantic import ValidationError
+from core.pagination import InvalidCursorError
+from core.utils import format_pydantic_errors
+from holdings.services.building_service import building_service
+from holdings.services.dtos import PropertyListQueryDTO
+from holdings.services.property_service import property_service
+
+
+@login_required(login_url="/accounts/login")
+async def list_buildings(request, *args, **kwargs):
+    """Bâtiments visibles par l'utilisateur, avec leur occupation (JSON, vue async)."""
+    user = await request.auser()
+    buildings = await building_service.alist_buildings_for_user(user)
+    return JsonResponse({"results": buildings})
+
+
+@login_required(login_url="/accounts/login")
+async def list_properties(request, *args, **kwargs):
+    """
+    Page de propriétés visibles par l'utilisateur (JSON, vue async), mêmes
+    filtres et curseur que la page Propriétés : ?status=&type=&sort=&cursor=...
+    """
+    try:
+        filters = PropertyListQueryDTO.model_validate(request.GET.dict())
+        user = await request.auser()
+        page = await property_service.alist_properties_page(user, filters, request=request)
+    except ValidationError as ve:
+        return JsonResponse({"errors": format_pydantic_errors(ve.errors())}, status=400)
+    except InvalidCursorError as e:
+        return JsonResponse({"errors": {"cursor": [str(e)]}}, status=400)
+
+    return JsonResponse(page)
@@ -8,19 +8,43 @@ from core.utils import format_pydantic_errors
 from django.contrib import messages
 from holdings.services.dtos import (BuildingCreateDTO, PropertyCreateDTO,
                                     AddressDTO, PropertyUpdateDTO, 
-                                    BuildingUpdateDTO)
+                                    BuildingUpdateDTO, PropertyListQueryDTO)
+from core.pagination import InvalidCursorError
+import functools
 import json
 
 class PropertiesView(LoginRequiredMixin, View):
     login_url = "/accounts/login"
 
     def get(self, request):
+        try:
+            filters = PropertyListQueryDTO.model_validate(request.GET.dict())
+            # Curseur vérifié ici : les props différées sont évaluées après le retour de la vue
+            property_service.validate_page_cursor(filters)
+        except ValidationError as ve:
+            return render_inertia(request, "dashboard/Properties", {
+                "errors": format_pydantic_errors(ve.errors())
+            })
+        except InvalidCursorError as e:
+            return render_inertia(request, "dashboard/Properties", {
+                "errors": [{"msg": str(e)}]
+            })
+
         list_buildings = building_service.list_buildings_for_user(request.user)
-        list_properties = property_service.list_all_properties_for_user(request.user)
-        
+
+        # Une seule page calculée pour les props "properties" et "pagination"
+        @functools.cache
+        def properties_page():
+            return property_service.list_properties_page(request.user, filters, request=request)
+
+        # Les pages suivantes (?cursor=...) sont fusionnées côté client
         return render_inertia(request, "dashboard/Properties", {
             "buildings": defer(list_buildings, merge=True),
-            "properties": defer(list_properties, merge=True),
+            "properties": defer(lambda: properties_page()["results"], merge=True),
+            "pagination": defer(lambda: {
+                "next_cursor": properties_page()["next_cursor"],
+                "has_more": properties_page()["has_more"],
+            }),
         })
     
     def _parse_request_data(self, request):
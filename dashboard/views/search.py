@@ -0,0 +1,20 @@
+from django.contrib.auth.decorators import login_required
+from django.http.response import JsonResponse
+from pydantic import ValidationError
+from core.utils import format_pydantic_errors
+from dashboard.services.dtos import SearchQueryDTO
+from dashboard.services.search_service import search_service
+
+
+@login_required(login_url="/accounts/login")
+def search(request, *args, **kwargs):
+    """
+    Recherche globale pour l'autocomplétion (typeahead) :
+    ?q=<terme>&types=tenant,property,building&limit=5
+    """
+    try:
+        params = SearchQueryDTO.model_validate(request.GET.dict())
+    except ValidationError as ve:
+        return JsonResponse({"errors": format_pydantic_errors(ve.errors())}, status=400)
+
+    return JsonResponse(search_service.search(request.user, params, request=request))
@@ -3,21 +3,42 @@ from django.views import View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from pydantic import ValidationError
-from accounts.services.dtos import UserCreateDTO, UserUpdateDTO
+from accounts.services.dtos import UserCreateDTO, UserUpdateDTO, TeamMemberListQueryDTO
 from accounts.services.team_service import team_service
+from core.pagination import InvalidCursorError
 from core.utils import format_pydantic_errors
+import functools
 import json
 
 class TeamsView(LoginRequiredMixin, View):
     login_url = "/accounts/login"
 
     def get(self, request):
-        # TODO: Implement pagination and filtering later
-        # TODO: Implement search functionality later
-        users = team_service.list_team_members(acting_user=request.user)
+        try:
+            filters = TeamMemberListQueryDTO.model_validate(request.GET.dict())
+            # Curseur vérifié ici : les props différées sont évaluées après le retour de la vue
+            team_service.validate_page_cursor(filters)
+        except ValidationError as ve:
+            return render_inertia(request, "dashboard/Teams", {
+                "errors": format_pydantic_errors(ve.errors())
+            })
+        except InvalidCursorError as e:
+            return render_inertia(request, "dashboard/Teams", {
+                "errors": [{"msg": str(e)}]
+            })
+
+        # Une seule page calculée pour les props "users" et "pagination"
+        @functools.cache
+        def users_page():
+            return team_service.list_team_members_page(acting_user=request.user, filters=filters)
 
+        # Les pages suivantes (?cursor=...) sont fusionnées côté client
         return render_inertia(request, "dashboard/Teams", {
-            "users": defer(lambda: users, merge=True)
+            "users": defer(lambda: users_page()["results"], merge=True),
+            "pagination": defer(lambda: {
+                "next_cursor": users_page()["next_cursor"],
+                "has_more": users_page()["has_more"],
+            }),
         })
     
     def post(self, request):
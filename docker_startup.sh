@@ -9,5 +9,18 @@ PORT=${PORT:-8000}
 echo "Running migrations..."
 python ./manage.py migrate --noinput
 
-echo "Starting Gunicorn..."
-gunicorn --bind 0.0.0.0:$PORT --workers 2 --threads 8 --timeout 0 immob.wsgi
+# SERVER_MODE=asgi : workers uvicorn (vues async, clients lents servis par la
+# boucle d'événements) ; wsgi (défaut) : workers synchrones à threads.
+SERVER_MODE=${SERVER_MODE:-wsgi}
+WEB_CONCURRENCY=${WEB_CONCURRENCY:-2}
+
+# Les connexions PostgreSQL sont mutualisées par worker (DATABASE_POOL_*),
+# DATABASE_POOL_MAX_SIZE doit rester >= --threads.
+if [ "$SERVER_MODE" = "asgi" ]; then
+    echo "Starting Gunicorn (ASGI, uvicorn workers)..."
+    exec gunicorn --bind 0.0.0.0:$PORT --workers $WEB_CONCURRENCY \
+        --worker-class uvicorn_worker.UvicornWorker --timeout 0 immob.asgi:application
+else
+    echo "Starting Gunicorn..."
+    exec gunicorn --bind 0.0.0.0:$PORT --workers $WEB_CONCURRENCY --threads 8 --timeout 0 immob.wsgi
+fi
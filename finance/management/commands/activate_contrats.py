@@ -0,0 +1,83 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from accounts.models import ImmobUser
+from finance.models import Contrat
+from finance.services.contrat_service import contrat_service, ContratService
+from core.services.audit_log_service import AuditLogService
+
+
+class Command(BaseCommand):
+    help = 'Activate DRAFT contrats in bulk (portfolio onboarding)'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('contrat_ids', nargs='*', help='IDs of the contrats to activate')
+        parser.add_argument('--file', help='File containing one contrat ID per line')
+        parser.add_argument('--all-drafts', action='store_true', help='Activate every DRAFT contrat')
+        parser.add_argument('--workspace', help='Restrict --all-drafts to a workspace ID')
+        parser.add_argument('--chunk-size', type=int, default=ContratService.DEFAULT_CHUNK_SIZE)
+        parser.add_argument(
+            '--user',
+            help='Email of the acting Owner: restricts the run to their workspace and is recorded in the audit log'
+        )
+        parser.add_argument(
+            '--all-workspaces', action='store_true',
+            help='Run without an acting user across every workspace (audit entries have no user)'
+        )
+        return super().add_arguments(parser)
+
+    def _read_ids(self, options, acting_user):
+        if options['all_drafts']:
+            queryset = Contrat.objects.filter(status=Contrat.ContratStatus.DRAFT)
+            if acting_user is not None:
+                queryset = queryset.filter(property__workspace_id=acting_user.workspace_id)
+            if options['workspace']:
+                queryset = queryset.filter(workspace_id=options['workspace'])
+            total = queryset.count()
+            return queryset.order_by('id').values_list('id', flat=True).iterator(), total
+
+        ids = list(options['contrat_ids'])
+        if options['file']:
+            with open(options['file']) as f:
+                ids.extend(line.strip() for line in f if line.strip())
+        return ids, len(ids)
+
+    def handle(self, *args, **options):
+        # Un lancement sans utilisateur n'est limité à aucun workspace : il doit être explicite
+        if bool(options['user']) == options['all_workspaces']:
+            raise CommandError("Pass either --user <owner email> or --all-workspaces.")
+
+        acting_user = None
+        if options['user']:
+            try:
+                acting_user = ImmobUser.objects.get(email=options['user'])
+            except ImmobUser.DoesNotExist:
+                raise CommandError(f"Unknown user: {options['user']}")
+
+        ids, total = self._read_ids(options, acting_user)
+        if not total:
+            self.stdout.write("No contrat to activate.")
+            return
+
+        def progress(totals):
+            processed = totals['activated'] + totals['skipped'] + totals['not_found']
+            self.stdout.write(
+                f"[{processed}/{total}] activated={totals['activated']} skipped={totals['skipped']} "
+                f"not_found={totals['not_found']} payments={totals['payments_created']}"
+            )
+
+        try:
+            totals = contrat_service.bulk_activate(
+                ids,
+                acting_user=acting_user,
+                chunk_size=options['chunk_size'],
+                progress=progress,
+            )
+        except PermissionError as e:
+            raise CommandError(str(e))
+        finally:
+            AuditLogService.flush()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Activated {totals['activated']} contrats in {totals['chunks']} chunks "
+            f"({totals['payments_created']} payments created, {totals['skipped']} skipped, "
+            f"{totals['not_found']} not found)."
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from finance.services.payment_service import payment_service
+from core.services.audit_log_service import AuditLogService
+
+
+class Command(BaseCommand):
+    help = 'Mark overdue PENDING payments as LATE (safe to run from cron on several nodes)'
+
+    def handle(self, *args, **kwargs):
+        updated = payment_service.sweep_late_payments()
+        AuditLogService.flush()
+        if updated is None:
+            self.stdout.write("Another node is already sweeping late payments, skipping.")
+            return
+        self.stdout.write(self.style.SUCCESS(f"{updated} payments marked as LATE."))
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:34
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+# Échéance conservée en priorité parmi des doublons
+STATUS_PRIORITY = {'PAID': 0, 'LATE': 1, 'PENDING': 2, 'CANCELLED': 3}
+
+
+def dedupe_payment_schedules(apps, schema_editor):
+    """
+    Supprime les échéances en double (même contrat, même date) laissées par
+    les anciennes générations d'échéanciers, avant la contrainte d'unicité.
+    L'échéance payée est conservée en priorité, sinon la plus ancienne ; les
+    factures des doublons lui sont rattachées.
+    """
+    Payment = apps.get_model('finance', 'Payment')
+    Invoice = apps.get_model('finance', 'Invoice')
+
+    duplicates = list(
+        Payment.objects.order_by().values('contrat_id', 'due_date')
+        .annotate(count=Count('id')).filter(count__gt=1)
+    )
+    for group in duplicates:
+        payments = sorted(
+            Payment.objects.filter(contrat_id=group['contrat_id'], due_date=group['due_date']),
+            key=lambda payment: (STATUS_PRIORITY.get(payment.status, len(STATUS_PRIORITY)), payment.created_at, payment.pk),
+        )
+        kept, removed_ids = payments[0], [payment.pk for payment in payments[1:]]
+        Invoice.objects.filter(payment_id__in=removed_ids).update(payment=kept)
+        Payment.objects.filter(pk__in=removed_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='payment',
+            name='immob_payme_contrat_bce939_idx',
+        ),
+        migrations.RunPython(dedupe_payment_schedules, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='payment',
+            constraint=models.UniqueConstraint(fields=('contrat', 'due_date'), name='unique_payment_contrat_due_date'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:45
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_userbuildingpermission_permission_level_score_and_more'),
+        ('finance', '0002_payment_unique_contrat_due_date'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='tenant',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('first_name', 'last_name', 'email', config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='tenant_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['phone'], name='tenant_phone_trgm', opclasses=['gin_trgm_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['email'], name='tenant_email_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_deleted_at(apps, schema_editor):
+    """Lignes déjà supprimées : la dernière modification tient lieu de date de suppression."""
+    for model_name in ['Tenant', 'Contrat']:
+        model = apps.get_model('finance', model_name)
+        model._base_manager.filter(is_deleted=True, deleted_at__isnull=True).update(
+            deleted_at=models.F('updated_at')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_soft_delete_deleted_at'),
+        ('finance', '0003_tenant_search'),
+        ('holdings', '0003_soft_delete_live_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='contrat',
+            name='immob_contr_propert_98b8f5_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='contrat',
+            name='immob_contr_tenant__9b9750_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='contrat',
+            name='immob_contr_start_d_f145d4_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='contrat',
+            name='immob_contr_status_c95811_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tenant',
+            name='immob_tenan_email_1f1a97_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='tenant',
+            name='immob_tenan_last_na_5b2a4a_idx',
+        ),
+        migrations.AddField(
+            model_name='contrat',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='tenant',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AlterField(
+            model_name='contrat',
+            name='is_deleted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='tenant',
+            name='is_deleted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='contrat',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['property', 'status'], name='contrat_prop_status_live'),
+        ),
+        migrations.AddIndex(
+            model_name='contrat',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['tenant', 'status'], name='contrat_tenant_status_live'),
+        ),
+        migrations.AddIndex(
+            model_name='contrat',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['start_date', 'end_date'], name='contrat_dates_live'),
+        ),
+        migrations.AddIndex(
+            model_name='contrat',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['status', 'end_date'], name='contrat_status_end_live'),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['workspace', 'email'], name='tenant_ws_email_live'),
+        ),
+        migrations.AddIndex(
+            model_name='tenant',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['workspace', 'last_name', 'first_name'], name='tenant_ws_name_live'),
+        ),
+        migrations.RunPython(backfill_deleted_at, migrations.RunPython.noop),
+    ]
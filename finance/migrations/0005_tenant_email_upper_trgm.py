@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-18 04:20
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0006_recompute_permission_level_scores'),
+        ('finance', '0004_soft_delete_live_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tenant',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='tenant_email_upper_trgm'),
+        ),
+    ]
@@ -1,8 +1,11 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.validators import MinValueValidator, EmailValidator
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 from decimal import Decimal
-from core.models import SoftDeletedModelMixin, ImmobBaseModel, ImmobDefaultManager
+from core.models import SoftDeletedModelMixin, ImmobBaseModel, ImmobDefaultManager, WorkspaceScopedManager
 from django.utils import timezone
 
 class Tenant(SoftDeletedModelMixin, ImmobBaseModel):
@@ -47,7 +50,14 @@ class Tenant(SoftDeletedModelMixin, ImmobBaseModel):
         verbose_name=_('Emergency contact phone')
     )
 
-    objects = ImmobDefaultManager()
+    # Recherche plein texte (colonne générée, maintenue par PostgreSQL)
+    search_vector = models.GeneratedField(
+        expression=SearchVector('first_name', 'last_name', 'email', config='simple'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = WorkspaceScopedManager()
     all_objects = models.Manager()
 
     class Meta:
@@ -55,8 +65,14 @@ class Tenant(SoftDeletedModelMixin, ImmobBaseModel):
         verbose_name = _('Tenant')
         verbose_name_plural = _('Tenants')
         indexes = [
-            models.Index(fields=['email']),
-            models.Index(fields=['last_name', 'first_name']),
+            SoftDeletedModelMixin.live_index('workspace', 'email', name='tenant_ws_email_live'),
+            SoftDeletedModelMixin.live_index('workspace', 'last_name', 'first_name', name='tenant_ws_name_live'),
+            GinIndex(fields=['search_vector'], name='tenant_search_vector_gin'),
+            # Recherche approchée (pg_trgm) : similarité et LIKE/ILIKE
+            GinIndex(fields=['phone'], opclasses=['gin_trgm_ops'], name='tenant_phone_trgm'),
+            GinIndex(fields=['email'], opclasses=['gin_trgm_ops'], name='tenant_email_trgm'),
+            # email__icontains (UPPER(email) LIKE UPPER(...)) : emails stockés sans mise en minuscules
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='tenant_email_upper_trgm'),
         ]
 
     def __str__(self):
@@ -177,7 +193,10 @@ class Contrat(SoftDeletedModelMixin, ImmobBaseModel):
         blank=True
     )
 
-    objects = ImmobDefaultManager()
+    # Le contrat est rattaché à son workspace via la propriété louée
+    WORKSPACE_LOOKUP = 'property__workspace'
+
+    objects = WorkspaceScopedManager()
     all_objects = models.Manager()
 
     class Meta:
@@ -185,10 +204,10 @@ class Contrat(SoftDeletedModelMixin, ImmobBaseModel):
         verbose_name = _('Contrat')
         verbose_name_plural = _('Contrats')
         indexes = [
-            models.Index(fields=['property', 'status']),
-            models.Index(fields=['tenant', 'status']),
-            models.Index(fields=['start_date', 'end_date']),
-            models.Index(fields=['status', 'end_date']),
+            SoftDeletedModelMixin.live_index('property', 'status', name='contrat_prop_status_live'),
+            SoftDeletedModelMixin.live_index('tenant', 'status', name='contrat_tenant_status_live'),
+            SoftDeletedModelMixin.live_index('start_date', 'end_date', name='contrat_dates_live'),
+            SoftDeletedModelMixin.live_index('status', 'end_date', name='contrat_status_end_live'),
         ]
 
     def __str__(self):
@@ -218,36 +237,15 @@ class Contrat(SoftDeletedModelMixin, ImmobBaseModel):
         )
 
     def generate_payments(self):
-        """Génère les paiements pour le contrat"""
-        from dateutil.relativedelta import relativedelta
-        
-        if self.status != self.ContratStatus.ACTIVE:
-            return
-        
-        current_date = self.start_date
-        payment_number = 1
-        
-        while current_date <= self.end_date:
-            Payment.objects.get_or_create(
-                contrat=self,
-                due_date=current_date,
-                defaults={
-                    'amount': self.monthly_rent + self.charges,
-                    'status': Payment.PaymentStatus.PENDING,
-                    'reference_number': f"{self.contrat_number}-{payment_number:03d}",
-                    'created_by': self.created_by
-                }
-            )
-            
-            # Incrémenter selon la fréquence
-            if self.payment_frequency == self.PaymentFrequency.MONTHLY:
-                current_date += relativedelta(months=1)
-            elif self.payment_frequency == self.PaymentFrequency.QUARTERLY:
-                current_date += relativedelta(months=3)
-            elif self.payment_frequency == self.PaymentFrequency.ANNUALLY:
-                current_date += relativedelta(years=1)
-            
-            payment_number += 1
+        """
+        Génère les paiements pour le contrat.
+        L'échéancier est calculé en mémoire et inséré en une seule requête.
+
+        :return: (nombre de paiements créés, nombre d'échéances déjà existantes)
+        """
+        from finance.services.payment_schedule_service import PaymentScheduleService
+
+        return PaymentScheduleService.generate_for_contrats([self])
 
 
 # ============================================================================
@@ -317,8 +315,10 @@ class Payment(ImmobBaseModel):
         db_table = 'immob_payments'
         verbose_name = _('Payment')
         verbose_name_plural = _('Payments')
+        constraints = [
+            models.UniqueConstraint(fields=['contrat', 'due_date'], name='unique_payment_contrat_due_date'),
+        ]
         indexes = [
-            models.Index(fields=['contrat', 'due_date']),
             models.Index(fields=['status', 'due_date']),
             models.Index(fields=['reference_number']),
         ]
@@ -342,7 +342,9 @@ class Payment(ImmobBaseModel):
         """Vérifie si le paiement est en retard"""
         from django.utils import timezone
         
-        return (
+        # Le statut LATE est posé par la commande sweep_late_payments ;
+        # un paiement PENDING échu non encore balayé est aussi en retard.
+        return self.status == self.PaymentStatus.LATE or (
             self.status == self.PaymentStatus.PENDING and
             self.due_date < timezone.now().date()
         )
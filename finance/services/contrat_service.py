@@ -0,0 +1,140 @@
+from accounts.models import ImmobUser
+from core.services.audit_log_service import AuditLogService, AuditLog
+from finance.models import Contrat
+from finance.services.payment_schedule_service import PaymentScheduleService
+from holdings.models import Property
+from dashboard.services.portfolio_stats_service import portfolio_stats_service
+from django.db import transaction
+from django.utils import timezone
+from uuid import UUID
+from typing import Optional, Iterable, Iterator, List, Dict, Any, Callable
+
+
+class ContratService:
+    """
+    Gère la logique métier des contrats de location, notamment les opérations en masse.
+    """
+
+    DEFAULT_CHUNK_SIZE = 1000
+
+    @staticmethod
+    def _chunks(ids: Iterable[Any], size: int) -> Iterator[List[Any]]:
+        chunk: List[Any] = []
+        for contrat_id in ids:
+            chunk.append(contrat_id)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @transaction.atomic
+    def _activate_chunk(self, contrat_ids: List[Any], acting_user: Optional[ImmobUser], request=None) -> Dict[str, int]:
+        """
+        Active un lot de contrats DRAFT avec des UPDATE ensemblistes, génère
+        leurs échéanciers en un seul INSERT et écrit une entrée d'audit récapitulative.
+        Avec un acting_user, seuls les contrats de son workspace sont pris en compte :
+        les autres identifiants sont comptés comme introuvables.
+        """
+        queryset = Contrat.objects.filter(id__in=contrat_ids)
+        if acting_user is not None:
+            queryset = queryset.filter(property__workspace_id=acting_user.workspace_id)
+        found = list(
+            queryset.only(
+                'id', 'property_id', 'contrat_number', 'start_date', 'end_date',
+                'monthly_rent', 'charges', 'payment_frequency', 'created_by_id', 'status'
+            ).select_for_update(of=('self',))
+        )
+        contrats = [c for c in found if c.status == Contrat.ContratStatus.DRAFT]
+        not_found = len(contrat_ids) - len(found)
+        if not contrats:
+            return {'activated': 0, 'skipped': len(found), 'not_found': not_found, 'payments_created': 0}
+
+        now = timezone.now()
+        activated_ids = [c.id for c in contrats]
+        property_ids = {c.property_id for c in contrats} # type: ignore
+
+        # 1. Statuts : 1 UPDATE pour les contrats, 1 UPDATE pour les propriétés
+        Contrat.objects.filter(id__in=activated_ids).update(
+            status=Contrat.ContratStatus.ACTIVE,
+            updated_by=acting_user,
+            updated_at=now
+        )
+        Property.objects.filter(id__in=property_ids).update(
+            status=Property.PropertyStatus.OCCUPIED,
+            updated_at=now
+        )
+
+        # 2. Échéanciers : 1 seul INSERT en masse pour tout le lot
+        for contrat in contrats:
+            contrat.status = Contrat.ContratStatus.ACTIVE
+        payments_created, _ = PaymentScheduleService.generate_for_contrats(contrats)
+
+        # 3. Statistiques du tableau de bord des bâtiments touchés (au COMMIT du lot)
+        portfolio_stats_service.schedule_refresh(
+            portfolio_stats_service.keys_for_properties(property_ids)
+        )
+
+        # 4. AUDIT LOG (une entrée récapitulative par lot)
+        AuditLogService.log_action(
+            user=acting_user, # type: ignore
+            action=AuditLog.AuditAction.UPDATE,
+            entity_type='Contrat',
+            entity_id=str(UUID(int=0)),
+            new_values={
+                'status': Contrat.ContratStatus.ACTIVE,
+                'contrat_ids': [str(contrat_id) for contrat_id in activated_ids],
+                'payments_created': payments_created,
+            },
+            request=request,
+        )
+
+        return {
+            'activated': len(activated_ids),
+            'skipped': len(found) - len(activated_ids),
+            'not_found': not_found,
+            'payments_created': payments_created,
+        }
+
+    def bulk_activate(
+        self,
+        contrat_ids: Iterable[Any],
+        acting_user: Optional[ImmobUser] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        progress: Optional[Callable[[Dict[str, int]], None]] = None,
+        request=None
+    ) -> Dict[str, int]:
+        """
+        Active en masse des contrats DRAFT (import de portefeuille).
+
+        Les contrats sont traités par lots de `chunk_size`, chacun dans sa propre
+        transaction : le nombre de requêtes est constant par lot, quel que soit
+        le nombre d'échéances générées. Les contrats non DRAFT sont ignorés ;
+        avec un acting_user, ceux hors de son workspace sont introuvables.
+
+        :param progress: Callback appelé après chaque lot avec les totaux cumulés.
+        :return: Totaux {'activated', 'skipped', 'not_found', 'payments_created', 'chunks'}.
+        """
+        if acting_user is not None and acting_user.role != ImmobUser.UserRole.OWNER:
+            AuditLogService.log_action(
+                user=acting_user,
+                action=AuditLog.AuditAction.ACCESS_DENIED,
+                entity_type='Contrat',
+                entity_id=str(UUID(int=0)),
+                request=request
+            )
+            raise PermissionError("Seul un Owner peut activer des contrats en masse.")
+
+        totals = {'activated': 0, 'skipped': 0, 'not_found': 0, 'payments_created': 0, 'chunks': 0}
+        for chunk in self._chunks(contrat_ids, chunk_size):
+            result = self._activate_chunk(chunk, acting_user, request)
+            for key, value in result.items():
+                totals[key] += value
+            totals['chunks'] += 1
+            if progress:
+                progress(totals)
+
+        return totals
+
+
+contrat_service = ContratService()
@@ -0,0 +1,140 @@
+from finance.models import Contrat, Payment
+from dateutil.relativedelta import relativedelta
+from django.db import connection
+from django.utils import timezone
+from decimal import Decimal
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+
+class PaymentScheduleService:
+    """
+    Calcule les échéanciers de paiement des contrats en mémoire et les
+    insère en une seule requête, quel que soit le nombre d'échéances.
+    """
+
+    FREQUENCY_STEPS = {
+        Contrat.PaymentFrequency.MONTHLY: relativedelta(months=1),
+        Contrat.PaymentFrequency.QUARTERLY: relativedelta(months=3),
+        Contrat.PaymentFrequency.ANNUALLY: relativedelta(years=1),
+    }
+
+    @staticmethod
+    def compute_due_dates(start_date: date, end_date: date, frequency: str) -> List[date]:
+        """
+        Retourne toutes les dates d'échéance entre start_date et end_date (incluses).
+        Chaque échéance est calculée à partir de la précédente, comme l'échéancier historique.
+        """
+        step = PaymentScheduleService.FREQUENCY_STEPS.get(frequency)
+        if step is None:
+            raise ValueError(f"Fréquence de paiement inconnue : {frequency}")
+
+        due_dates = []
+        current_date = start_date
+        while current_date <= end_date:
+            due_dates.append(current_date)
+            current_date += step
+        return due_dates
+
+    @staticmethod
+    def build_payments(
+        contrat: Contrat,
+        skip_due_dates: Iterable[date] = (),
+        today: Optional[date] = None
+    ) -> Tuple[List[Payment], int]:
+        """
+        Construit (sans les sauvegarder) les paiements de l'échéancier d'un contrat.
+        Les échéances déjà passées sont créées directement en LATE (bulk_create
+        ne passe par aucun signal, le balayage ne les verrait qu'au prochain passage).
+
+        :param skip_due_dates: Échéances déjà existantes à ne pas recréer.
+        :param today: Date de référence pour le retard (défaut : aujourd'hui).
+        :return: (paiements à créer, nombre d'échéances ignorées)
+        """
+        skip_due_dates = set(skip_due_dates)
+        today = today or timezone.now().date()
+        amount = contrat.monthly_rent + (contrat.charges or Decimal('0.00'))
+        due_dates = PaymentScheduleService.compute_due_dates(
+            contrat.start_date, contrat.end_date, contrat.payment_frequency
+        )
+
+        payments = [
+            Payment(
+                contrat=contrat,
+                due_date=due_date,
+                amount=amount,
+                status=Payment.PaymentStatus.LATE if due_date < today else Payment.PaymentStatus.PENDING,
+                reference_number=f"{contrat.contrat_number}-{payment_number:03d}",
+                created_by_id=contrat.created_by_id, # type: ignore
+            )
+            for payment_number, due_date in enumerate(due_dates, start=1)
+            if due_date not in skip_due_dates
+        ]
+        return payments, len(due_dates) - len(payments)
+
+    @staticmethod
+    def _insert_ignoring_conflicts(payments: List[Payment]) -> int:
+        """
+        Insère les paiements (INSERT ... ON CONFLICT DO NOTHING, comme
+        bulk_create(ignore_conflicts=True)) et retourne le nombre de lignes
+        réellement insérées, lu sur le curseur : aucune relecture de la table.
+        """
+        fields = list(Payment._meta.concrete_fields)
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(field.column) for field in fields)
+        row = f"({', '.join(['%s'] * len(fields))})"
+        batch_size = max(connection.ops.bulk_batch_size(fields, payments), 1)
+
+        inserted = 0
+        with connection.cursor() as cursor:
+            for start in range(0, len(payments), batch_size):
+                batch = payments[start:start + batch_size]
+                params = [
+                    field.get_db_prep_save(field.pre_save(payment, add=True), connection)
+                    for payment in batch
+                    for field in fields
+                ]
+                cursor.execute(
+                    f"INSERT INTO {quote(Payment._meta.db_table)} ({columns}) "
+                    f"VALUES {', '.join([row] * len(batch))} ON CONFLICT DO NOTHING",
+                    params
+                )
+                inserted += cursor.rowcount
+        return inserted
+
+    @staticmethod
+    def generate_for_contrats(contrats: Iterable[Contrat]) -> Tuple[int, int]:
+        """
+        Génère les échéanciers de plusieurs contrats ACTIFS : une lecture des
+        échéances existantes, puis un seul INSERT en masse qui ignore les
+        conflits sur (contrat, due_date) et compte les lignes insérées.
+        Régénérer un échéancier ne crée donc jamais de doublon.
+
+        :return: (nombre de paiements créés, nombre d'échéances ignorées)
+        """
+        contrats = [c for c in contrats if c.status == Contrat.ContratStatus.ACTIVE]
+        if not contrats:
+            return 0, 0
+
+        existing: dict = {}
+        for contrat_id, due_date in Payment.objects.filter(
+            contrat__in=contrats
+        ).values_list('contrat_id', 'due_date'):
+            existing.setdefault(contrat_id, set()).add(due_date)
+
+        today = timezone.now().date()
+        to_create: List[Payment] = []
+        skipped = 0
+        for contrat in contrats:
+            payments, contrat_skipped = PaymentScheduleService.build_payments(
+                contrat, existing.get(contrat.id, ()), today
+            )
+            to_create.extend(payments)
+            skipped += contrat_skipped
+
+        if not to_create:
+            return 0, skipped
+
+        # Échéances créées entre la lecture et l'INSERT : écartées et comptées comme ignorées
+        created = PaymentScheduleService._insert_ignoring_conflicts(to_create)
+        return created, skipped + len(to_create) - created
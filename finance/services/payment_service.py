@@ -0,0 +1,88 @@
+from core.services.audit_log_service import AuditLogService, AuditLog
+from finance.models import Contrat, Payment
+from holdings.models import Property
+from dashboard.services.portfolio_stats_service import portfolio_stats_service
+from django.db import connection, transaction
+from django.utils import timezone
+from datetime import date
+from uuid import UUID
+from typing import Optional
+
+
+class PaymentService:
+    """
+    Gère la logique métier liée aux paiements de loyer.
+    """
+
+    # Clé du verrou consultatif PostgreSQL partagé par tous les nœuds
+    LATE_SWEEP_LOCK_KEY = 0x1A7E_5EE9
+
+    @staticmethod
+    def _try_advisory_lock(key: int) -> bool:
+        """
+        Prend un verrou consultatif de transaction (libéré au COMMIT/ROLLBACK).
+        Retourne False si un autre nœud le détient déjà.
+        """
+        if connection.vendor != 'postgresql':
+            return True
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", [key])
+            return cursor.fetchone()[0]
+
+    @transaction.atomic
+    def sweep_late_payments(self, today: Optional[date] = None) -> Optional[int]:
+        """
+        Passe en LATE tous les paiements PENDING dont l'échéance est dépassée,
+        en un seul UPDATE servi par l'index (status, due_date). Les lignes
+        modifiées (RETURNING) sont regroupées par bâtiment dans la même requête :
+        aucune lecture préalable des paiements en retard.
+
+        Peut être lancé en parallèle depuis plusieurs nœuds (cron) : un seul
+        exécute le balayage grâce au verrou consultatif.
+
+        :return: Le nombre de paiements passés en LATE, ou None si le verrou est déjà pris.
+        """
+        if not self._try_advisory_lock(self.LATE_SWEEP_LOCK_KEY):
+            return None
+
+        today = today or timezone.now().date()
+        quote = connection.ops.quote_name
+        payments = quote(Payment._meta.db_table)
+        contrats = quote(Contrat._meta.db_table)
+        properties = quote(Property._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"WITH updated AS ("
+                f"UPDATE {payments} SET status = %s, updated_at = %s "
+                f"WHERE status = %s AND due_date < %s RETURNING contrat_id"
+                f") "
+                f"SELECT p.workspace_id, p.building_id, COUNT(*) FROM updated "
+                f"JOIN {contrats} c ON c.id = updated.contrat_id "
+                f"JOIN {properties} p ON p.id = c.property_id "
+                f"GROUP BY p.workspace_id, p.building_id",
+                [Payment.PaymentStatus.LATE, timezone.now(), Payment.PaymentStatus.PENDING, today]
+            )
+            rows = cursor.fetchall()
+        updated = sum(count for _, _, count in rows)
+
+        # Bâtiments dont les impayés ont changé (statistiques recalculées au COMMIT)
+        portfolio_stats_service.schedule_refresh((workspace_id, building_id) for workspace_id, building_id, _ in rows)
+
+        if updated:
+            AuditLogService.log_action(
+                user=None, # type: ignore
+                action=AuditLog.AuditAction.UPDATE,
+                entity_type='Payment',
+                entity_id=str(UUID(int=0)),
+                old_values={'status': Payment.PaymentStatus.PENDING},
+                new_values={
+                    'status': Payment.PaymentStatus.LATE,
+                    'due_date_before': today.isoformat(),
+                    'updated_count': updated,
+                },
+            )
+
+        return updated
+
+
+payment_service = PaymentService()
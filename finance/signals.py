@@ -1,8 +1,7 @@
 
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save
 from django.dispatch import receiver
-from django.utils import timezone
-from .models import Contrat, Payment
+from .models import Contrat
 from holdings.models import Property
 
 
@@ -23,12 +22,3 @@ def update_property_status_on_contrat_save(sender, instance, created, **kwargs):
             instance.property.status = Property.PropertyStatus.AVAILABLE
             instance.property.save()
 
-
-@receiver(pre_save, sender=Payment)
-def check_payment_late_status(sender, instance, **kwargs):
-    """Vérifie et met à jour le statut de retard des paiements"""
-    if instance.status == Payment.PaymentStatus.PENDING:
-        if instance.due_date < timezone.now().date():
-            instance.status = Payment.PaymentStatus.LATE
-
-
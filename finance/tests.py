@@ -1,3 +1,279 @@
+from datetime import date
+from decimal import Decimal
+from importlib import import_module
+from io import StringIO
+from unittest import mock
+from uuid import uuid4
+
+from django.apps import apps
+from django.core.management import CommandError, call_command
+from django.db import DEFAULT_DB_ALIAS, connection, connections
 from django.test import TestCase
 
-# Create your tests here.
+from accounts.models import ImmobUser
+from core.models import AuditLog
+from finance.models import Contrat, Invoice, Payment, Tenant
+from finance.services.contrat_service import contrat_service
+from finance.services.payment_schedule_service import PaymentScheduleService
+from finance.services.payment_service import PaymentService, payment_service
+from holdings.models import Building, Property
+
+
+def create_owner(name):
+    """Owner sans mot de passe utilisable ; son workspace est créé par le signal."""
+    return ImmobUser.objects.create_user(
+        username=name, email=f'{name}@example.com', password=None, role=ImmobUser.UserRole.OWNER,
+    )
+
+
+def create_contrat(owner, number, status=Contrat.ContratStatus.DRAFT,
+                   start_date=date(2026, 1, 1), end_date=date(2026, 6, 30)):
+    """Contrat sur une propriété et un locataire neufs du workspace de l'owner (6 échéances mensuelles)."""
+    workspace = owner.workspace
+    building, _ = Building.objects.get_or_create(
+        workspace=workspace, name=f'{owner.username}-building', defaults={'street': 'Rue', 'city': 'Douala'},
+    )
+    property = Property.objects.create(
+        building=building, workspace=workspace, reference_code=f'P-{number}', name=f'P {number}',
+        type=Property.PropertyType.APARTMENT, surface_area=40, room_count=2, monthly_rent=Decimal('100000'),
+    )
+    tenant = Tenant.objects.create(
+        workspace=workspace, first_name=f'Tenant {number}', phone='600000000', id_number=f'ID-{number}',
+        address='Douala', emergency_contact_name='Contact', emergency_contact_phone='600000001',
+    )
+    return Contrat.objects.create(
+        workspace=workspace, property=property, tenant=tenant, created_by=owner,
+        contrat_number=f'CTR-{number}', start_date=start_date, end_date=end_date,
+        monthly_rent=Decimal('100000'), charges=Decimal('5000'), status=status,
+    )
+
+
+class BulkActivateTests(TestCase):
+    """Activation en masse : décompte activés / ignorés / introuvables et périmètre du workspace."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner_a = create_owner('bulk-owner-a')
+        cls.owner_b = create_owner('bulk-owner-b')
+        cls.drafts_a = [create_contrat(cls.owner_a, 'A1'), create_contrat(cls.owner_a, 'A2')]
+        cls.active_a = create_contrat(cls.owner_a, 'A3', status=Contrat.ContratStatus.ACTIVE)
+        cls.draft_b = create_contrat(cls.owner_b, 'B1')
+        cls.manager = ImmobUser.objects.create_user(
+            username='bulk-manager', email='bulk-manager@example.com', password=None,
+            role=ImmobUser.UserRole.MANAGER, workspace=cls.owner_a.workspace,
+        )
+
+    def all_ids(self):
+        return [c.id for c in (*self.drafts_a, self.active_a, self.draft_b)] + [uuid4()]
+
+    def test_totals_for_an_owner(self):
+        progress = []
+        totals = contrat_service.bulk_activate(
+            self.all_ids(), acting_user=self.owner_a, chunk_size=2, progress=lambda t: progress.append(dict(t)),
+        )
+
+        # Contrat de B et identifiant inconnu : introuvables pour owner_a
+        self.assertEqual(
+            totals,
+            {'activated': 2, 'skipped': 1, 'not_found': 2, 'payments_created': 12, 'chunks': 3},
+        )
+        self.assertEqual(len(progress), 3)
+        self.assertEqual(progress[-1], totals)
+        self.assertEqual(
+            set(Contrat.objects.filter(status=Contrat.ContratStatus.ACTIVE).values_list('contrat_number', flat=True)),
+            {'CTR-A1', 'CTR-A2', 'CTR-A3'},
+        )
+        self.assertEqual(Payment.objects.filter(contrat__in=self.drafts_a).count(), 12)
+        self.assertFalse(Payment.objects.filter(contrat=self.draft_b).exists())
+
+    def test_second_run_skips_activated_contrats(self):
+        contrat_service.bulk_activate(self.all_ids(), acting_user=self.owner_a)
+
+        totals = contrat_service.bulk_activate(self.all_ids(), acting_user=self.owner_a)
+
+        self.assertEqual(
+            totals,
+            {'activated': 0, 'skipped': 3, 'not_found': 2, 'payments_created': 0, 'chunks': 1},
+        )
+
+    def test_one_audit_entry_per_chunk(self):
+        contrat_service.bulk_activate(self.all_ids(), acting_user=self.owner_a, chunk_size=1)
+
+        logs = AuditLog.objects.filter(user=self.owner_a, entity_type='Contrat', action=AuditLog.AuditAction.UPDATE)
+        self.assertEqual(
+            sorted(id for log in logs for id in log.new_values['contrat_ids']),
+            sorted(str(c.id) for c in self.drafts_a),
+        )
+
+    def test_unscoped_run_reaches_every_workspace(self):
+        totals = contrat_service.bulk_activate(self.all_ids())
+
+        self.assertEqual(totals['activated'], 3)
+        self.assertEqual(totals['not_found'], 1)
+
+    def test_non_owner_is_refused(self):
+        with self.assertRaises(PermissionError):
+            contrat_service.bulk_activate(self.all_ids(), acting_user=self.manager)
+
+        self.assertFalse(Contrat.objects.filter(pk=self.drafts_a[0].pk, status=Contrat.ContratStatus.ACTIVE).exists())
+        self.assertTrue(AuditLog.objects.filter(user=self.manager, action=AuditLog.AuditAction.ACCESS_DENIED).exists())
+
+    def test_command_requires_an_explicit_scope(self):
+        for options in ({}, {'user': self.owner_a.email, 'all_workspaces': True}):
+            with self.subTest(options=options), self.assertRaises(CommandError):
+                call_command('activate_contrats', all_drafts=True, stdout=StringIO(), **options)
+
+        self.assertFalse(Contrat.objects.filter(pk=self.draft_b.pk, status=Contrat.ContratStatus.ACTIVE).exists())
+
+    def test_command_all_drafts_stays_in_the_user_workspace(self):
+        call_command('activate_contrats', all_drafts=True, user=self.owner_a.email, stdout=StringIO())
+
+        self.assertEqual(
+            Contrat.objects.filter(pk__in=[c.pk for c in self.drafts_a], status=Contrat.ContratStatus.ACTIVE).count(), 2
+        )
+        self.draft_b.refresh_from_db()
+        self.assertEqual(self.draft_b.status, Contrat.ContratStatus.DRAFT)
+
+    def test_command_all_workspaces(self):
+        out = StringIO()
+        call_command('activate_contrats', all_drafts=True, all_workspaces=True, stdout=out)
+
+        self.assertIn('Activated 3 contrats', out.getvalue())
+        self.assertTrue(AuditLog.objects.filter(user=None, entity_type='Contrat').exists())
+
+
+class LatePaymentSweepTests(TestCase):
+    """Balayage des retards : statuts basculés en un UPDATE, bâtiments touchés et verrou consultatif."""
+
+    today = date(2026, 4, 15)
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner_a = create_owner('sweep-owner-a')
+        cls.owner_b = create_owner('sweep-owner-b')
+        cls.contrat_a = create_contrat(cls.owner_a, 'SA', status=Contrat.ContratStatus.ACTIVE)
+        cls.contrat_b = create_contrat(cls.owner_b, 'SB', status=Contrat.ContratStatus.ACTIVE)
+        statuses = [
+            (date(2026, 3, 1), Payment.PaymentStatus.PENDING),
+            (date(2026, 4, 1), Payment.PaymentStatus.PENDING),
+            (date(2026, 4, 15), Payment.PaymentStatus.PENDING),
+            (date(2026, 2, 1), Payment.PaymentStatus.PAID),
+        ]
+        for contrat in (cls.contrat_a, cls.contrat_b):
+            for due_date, status in statuses:
+                Payment.objects.create(
+                    contrat=contrat, amount=Decimal('105000'), due_date=due_date, status=status,
+                    reference_number=f'{contrat.contrat_number}-{due_date:%m%d}',
+                )
+        # Contrat A : seule l'échéance de mars est en retard
+        Payment.objects.filter(contrat=cls.contrat_a, due_date=date(2026, 4, 1)).update(
+            status=Payment.PaymentStatus.PAID
+        )
+
+    def statuses(self):
+        return dict(Payment.objects.values_list('reference_number', 'status'))
+
+    def test_overdue_pending_payments_become_late(self):
+        with mock.patch(
+            'finance.services.payment_service.portfolio_stats_service.schedule_refresh'
+        ) as schedule_refresh:
+            updated = payment_service.sweep_late_payments(today=self.today)
+
+        self.assertEqual(updated, 3)
+        late, pending, paid = Payment.PaymentStatus.LATE, Payment.PaymentStatus.PENDING, Payment.PaymentStatus.PAID
+        self.assertEqual(self.statuses(), {
+            'CTR-SA-0301': late, 'CTR-SA-0401': paid, 'CTR-SA-0415': pending, 'CTR-SA-0201': paid,
+            'CTR-SB-0301': late, 'CTR-SB-0401': late, 'CTR-SB-0415': pending, 'CTR-SB-0201': paid,
+        })
+        self.assertEqual(
+            set(schedule_refresh.call_args.args[0]),
+            {
+                (contrat.workspace_id, contrat.property.building_id)
+                for contrat in (self.contrat_a, self.contrat_b)
+            },
+        )
+        log = AuditLog.objects.get(entity_type='Payment', user=None)
+        self.assertEqual(log.new_values['updated_count'], 3)
+
+    def test_nothing_overdue_writes_no_audit(self):
+        self.assertEqual(payment_service.sweep_late_payments(today=date(2026, 1, 1)), 0)
+
+        self.assertFalse(AuditLog.objects.filter(entity_type='Payment').exists())
+
+    def test_concurrent_sweep_is_a_no_op(self):
+        # Un autre nœud détient le verrou dans sa transaction
+        other = connections.create_connection(DEFAULT_DB_ALIAS)
+        try:
+            other.set_autocommit(False)
+            with other.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)', [PaymentService.LATE_SWEEP_LOCK_KEY])
+
+            self.assertIsNone(payment_service.sweep_late_payments(today=self.today))
+            self.assertNotIn(Payment.PaymentStatus.LATE, self.statuses().values())
+        finally:
+            other.rollback()
+            other.close()
+
+        self.assertEqual(payment_service.sweep_late_payments(today=self.today), 3)
+
+
+class PaymentScheduleTests(TestCase):
+    """Génération des échéanciers : idempotente, sans doublon ni relecture des lignes insérées."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = create_owner('schedule-owner')
+        cls.contrat = create_contrat(cls.owner, 'SCH', status=Contrat.ContratStatus.ACTIVE)
+
+    def test_regenerating_a_schedule_is_idempotent(self):
+        self.assertEqual(self.contrat.generate_payments(), (6, 0))
+        self.assertEqual(self.contrat.generate_payments(), (0, 6))
+
+        Payment.objects.filter(contrat=self.contrat, due_date=date(2026, 3, 1)).delete()
+        with self.assertNumQueries(2):
+            self.assertEqual(self.contrat.generate_payments(), (1, 5))
+
+        due_dates = list(Payment.objects.filter(contrat=self.contrat).values_list('due_date', flat=True))
+        self.assertEqual(len(due_dates), 6)
+        self.assertEqual(len(set(due_dates)), 6)
+
+    def test_rows_created_after_the_read_are_counted_as_skipped(self):
+        payments, _ = PaymentScheduleService.build_payments(self.contrat, today=date(2026, 4, 15))
+        Payment.objects.bulk_create(payments[:2])
+        payments, _ = PaymentScheduleService.build_payments(self.contrat, today=date(2026, 4, 15))
+
+        self.assertEqual(PaymentScheduleService._insert_ignoring_conflicts(payments), 4)
+        stored = Payment.objects.get(contrat=self.contrat, due_date=date(2026, 6, 1))
+        self.assertEqual(stored.amount, Decimal('105000'))
+        self.assertEqual(stored.status, Payment.PaymentStatus.PENDING)
+        self.assertEqual(stored.reference_number, 'CTR-SCH-006')
+        self.assertIsNotNone(stored.created_at)
+
+    def test_migration_dedupes_schedules_before_the_constraint(self):
+        migration = import_module('finance.migrations.0002_payment_unique_contrat_due_date')
+        # Annulé avec la transaction du test
+        with connection.cursor() as cursor:
+            cursor.execute('ALTER TABLE immob_payments DROP CONSTRAINT unique_payment_contrat_due_date')
+
+        def payment(reference, status):
+            return Payment.objects.create(
+                contrat=self.contrat, amount=Decimal('105000'), due_date=date(2026, 1, 1),
+                status=status, reference_number=reference,
+            )
+
+        pending = payment('DUP-1', Payment.PaymentStatus.PENDING)
+        paid = payment('DUP-2', Payment.PaymentStatus.PAID)
+        late = payment('DUP-3', Payment.PaymentStatus.LATE)
+        single = Payment.objects.create(
+            contrat=self.contrat, amount=Decimal('105000'), due_date=date(2026, 2, 1), reference_number='ONE',
+        )
+        invoice = Invoice.objects.create(
+            payment=pending, invoice_number='INV-DUP', issue_date=date(2026, 1, 1), total_amount=Decimal('105000'),
+        )
+
+        migration.dedupe_payment_schedules(apps, None)
+
+        self.assertEqual(set(Payment.objects.values_list('pk', flat=True)), {paid.pk, single.pk})
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.payment_id, paid.pk)
+        self.assertFalse(Payment.objects.filter(pk=late.pk).exists())
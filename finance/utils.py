@@ -1,8 +1,17 @@
+from core.services.reference_service import reference_service
+from django.utils import timezone
+from typing import List
+
+
+def generate_contract_numbers(count: int) -> List[str]:
+    """
+    Génère `count` numéros de contrat uniques (numérotation séquentielle par
+    jour, ex. CTR-20251018-00042). Les références de paiement en dérivent.
+    """
+    prefix = f"CTR-{timezone.now().strftime('%Y%m%d')}"
+    return [f"{prefix}-{value:05d}" for value in reference_service.allocate(prefix, count)]
+
+
 def generate_contract_number():
     """Génère un numéro de contrat unique"""
-    from django.utils import timezone
-    import random
-    
-    date_part = timezone.now().strftime('%Y%m%d')
-    random_part = ''.join([str(random.randint(0, 9)) for _ in range(4)])
-    return f"CTR-{date_part}-{random_part}"
+    return generate_contract_numbers(1)[0]
@@ -1,12 +1,12 @@
 import { Tabs, TabsList, TabsContent, TabsTrigger } from "@/components/ui/tabs";
 import DashboardLayout from "./DashboardLayout";
-import { useEffect, useMemo, type ReactNode } from "react";
+import { useEffect, useMemo, useState, type ReactNode } from "react";
 import  { DataTable as PropertyTable } from "./Properties/components/property-table";
 import  { DataTable as BuildingTable } from "./Properties/components/building-table";
 import { columns as columnsProperty } from "./Properties/components/columns-property";
 import { columns as columnsBuilding } from "./Properties/components/columns-building";
-import { usePage } from "@inertiajs/react";
-import { usePropertyStore, type Property, type Building } from "./Properties/property-store";
+import { router, usePage } from "@inertiajs/react";
+import { usePropertyStore, type Property, type Building, type Pagination } from "./Properties/property-store";
 import { Button } from "@/components/ui/button";
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogTrigger } from "@/components/ui/dialog";
 import CreatePropertyForm from "./Properties/components/forms/property-creation-form";
@@ -16,6 +16,8 @@ function Properties() {
   const page = usePage();
   const initialProperties = useMemo(() => (page.props.properties as Property[]) || [], [page.props.properties]);
   const initialBuildings = useMemo(() => (page.props.buildings as Building[]) || [], [page.props.buildings]);
+  const pagination = page.props.pagination as Pagination | undefined;
+  const [isLoadingMore, setLoadingMore] = useState(false);
   const {
     initializeProperties,
     initializeBuildings,
@@ -41,6 +43,18 @@ function Properties() {
     );
   }, [buildings]);
 
+  // Page suivante : rechargement partiel, la prop "properties" est fusionnée côté client
+  const loadMoreProperties = () => {
+    if (!pagination?.next_cursor) return;
+    router.reload({
+      only: ["properties", "pagination"],
+      data: { cursor: pagination.next_cursor },
+      preserveUrl: true,
+      onStart: () => setLoadingMore(true),
+      onFinish: () => setLoadingMore(false),
+    });
+  };
+
   return (
     <div className="h-full flex-1 flex-col gap-8 p-8 md:flex">
       <div className="flex items-center justify-between gap-2">
@@ -71,6 +85,13 @@ function Properties() {
         </TabsList>
         <TabsContent value="property">
           <PropertyTable data={properties} columns={columnsProperty} />
+          {pagination?.has_more && (
+            <div className="flex justify-center pt-4">
+              <Button variant="outline" onClick={loadMoreProperties} disabled={isLoadingMore}>
+                {isLoadingMore ? "Chargement..." : "Charger plus de propriétés"}
+              </Button>
+            </div>
+          )}
         </TabsContent>
         <TabsContent value="building">
           <BuildingTable data={buildings} columns={columnsBuilding} />
@@ -44,10 +44,20 @@ export interface Property {
   door_number?: string;
   monthly_rent: number;
   description: string | null;
+  equipment_list?: string[];
   has_parking: boolean | null;
   has_balcony: boolean | null;
 }
 
+/**
+ * Pagination par curseur des propriétés
+ * Basée sur la sortie de `property_service.list_properties_page`
+ */
+export interface Pagination {
+  next_cursor: string | null;
+  has_more: boolean;
+}
+
 // -------------------------------------------------------------------
 // DÉFINITION DU STORE
 // -------------------------------------------------------------------
@@ -1,11 +1,36 @@
 import DashboardLayout from "./DashboardLayout";
-import { type ReactNode } from "react";
+import { useEffect, useState, type ReactNode } from "react";
+import { router, usePage } from "@inertiajs/react";
 import { DataTable } from "./components/data-table";
 import { columns } from "./Teams/components/columns";
-import { useTeamStore} from "../../store/team-store";
+import { Button } from "@/components/ui/button";
+import { useTeamStore, type User, type Pagination } from "../../store/team-store";
 
 function Teams() {
+  const page = usePage();
+  const pagination = page.props.pagination as Pagination | undefined;
+  const [isLoadingMore, setLoadingMore] = useState(false);
   const users = useTeamStore((state) => state.users);
+  const initializeUsers = useTeamStore((state) => state.initializeUsers);
+
+  // Les réponses POST/PUT excluent "users" : le store n'est hydraté que si la prop est présente
+  useEffect(() => {
+    if (page.props.users) {
+      initializeUsers(page.props.users as User[]);
+    }
+  }, [page.props.users, initializeUsers]);
+
+  // Page suivante : rechargement partiel, la prop "users" est fusionnée côté client
+  const loadMoreUsers = () => {
+    if (!pagination?.next_cursor) return;
+    router.reload({
+      only: ["users", "pagination"],
+      data: { cursor: pagination.next_cursor },
+      preserveUrl: true,
+      onStart: () => setLoadingMore(true),
+      onFinish: () => setLoadingMore(false),
+    });
+  };
 
   return (
     <div className="h-full flex-1 flex-col gap-8 p-8 md:flex">
@@ -21,6 +46,13 @@ function Teams() {
       
       </div>
       <DataTable data={users} columns={columns} />
+      {pagination?.has_more && (
+        <div className="flex justify-center pt-4">
+          <Button variant="outline" onClick={loadMoreUsers} disabled={isLoadingMore}>
+            {isLoadingMore ? "Chargement..." : "Charger plus de membres"}
+          </Button>
+        </div>
+      )}
     </div>
   );
 }
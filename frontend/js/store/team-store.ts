@@ -13,6 +13,15 @@ export interface User {
   // Ajoutez tout autre champ exposé par votre serializer Django
 }
 
+/**
+ * Pagination par curseur des membres de l'équipe
+ * Basée sur la sortie de `team_service.list_team_members_page`
+ */
+export interface Pagination {
+  next_cursor: string | null;
+  has_more: boolean;
+}
+
 interface TeamState {
   users: User[];
   selectedUser: User | null;
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:45
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_userbuildingpermission_permission_level_score_and_more'),
+        ('holdings', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='building',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('name', 'street', 'city', 'postal_code', config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.SearchVector('name', 'reference_code', 'door_number', config='simple'), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='building',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='building_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='property_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['reference_code'], name='property_reference_code_trgm', opclasses=['gin_trgm_ops']),
+        ),
+    ]
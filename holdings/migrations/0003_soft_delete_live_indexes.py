@@ -0,0 +1,120 @@
+# Generated by Django 5.2.7 on 2026-10-18 03:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_deleted_at(apps, schema_editor):
+    """Lignes déjà supprimées : la dernière modification tient lieu de date de suppression."""
+    for model_name in ['Building', 'Property', 'MaintenanceLog']:
+        model = apps.get_model('holdings', model_name)
+        model._base_manager.filter(is_deleted=True, deleted_at__isnull=True).update(
+            deleted_at=models.F('updated_at')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_soft_delete_deleted_at'),
+        ('holdings', '0002_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='building',
+            name='immob_build_workspa_825bf6_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='building',
+            name='immob_build_postal__79457e_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='maintenancelog',
+            name='immob_maint_propert_f0396f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='maintenancelog',
+            name='immob_maint_schedul_4a8d6d_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='maintenancelog',
+            name='immob_maint_type_597219_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='property',
+            name='immob_prope_workspa_f7fc22_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='property',
+            name='immob_prope_buildin_b08f16_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='property',
+            name='immob_prope_type_bf55d7_idx',
+        ),
+        migrations.AddField(
+            model_name='building',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='maintenancelog',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AddField(
+            model_name='property',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Deleted at'),
+        ),
+        migrations.AlterField(
+            model_name='building',
+            name='is_deleted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='maintenancelog',
+            name='is_deleted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name='property',
+            name='is_deleted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='building',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['workspace', 'city'], name='building_ws_city_live'),
+        ),
+        migrations.AddIndex(
+            model_name='building',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['postal_code'], name='building_postal_live'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancelog',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['property', 'status'], name='maint_prop_status_live'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancelog',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['scheduled_date', 'status'], name='maint_date_status_live'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancelog',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['type', 'status'], name='maint_type_status_live'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['workspace', 'status'], name='property_ws_status_live'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['building', 'floor'], name='property_bldg_floor_live'),
+        ),
+        migrations.AddIndex(
+            model_name='property',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['type', 'status'], name='property_type_status_live'),
+        ),
+        migrations.RunPython(backfill_deleted_at, migrations.RunPython.noop),
+    ]
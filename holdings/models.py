@@ -1,4 +1,8 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db.models import Case, Count, F, FloatField, Q, Value, When
+from django.db.models.functions import Cast
 from django.core.validators import MinValueValidator
 from django.utils.translation import gettext_lazy as _
 from django.db.models.signals import post_save
@@ -7,7 +11,43 @@ from decimal import Decimal
 from django.utils import timezone
 
 from finance.models import Contrat
-from core.models import SoftDeletedModelMixin, ImmobBaseModel, ImmobDefaultManager
+from core.models import SoftDeletedModelMixin, ImmobBaseModel, ImmobDefaultManager, WorkspaceScopedManager, WorkspaceScopedQuerySet
+
+
+class BuildingQuerySet(WorkspaceScopedQuerySet):
+    """QuerySet des bâtiments"""
+
+    OCCUPANCY_FIELDS = (
+        'total_units', 'occupied_units', 'available_units',
+        'maintenance_units', 'occupancy_rate',
+    )
+
+    def with_occupancy(self):
+        """
+        Annote les compteurs de propriétés (total, occupées, disponibles, en
+        maintenance) et le taux d'occupation en une seule requête, par
+        agrégation conditionnelle sur les propriétés non supprimées.
+        """
+        alive = Q(building_properties__is_deleted=False)
+
+        def count_units(status=None):
+            condition = alive if status is None else alive & Q(building_properties__status=status)
+            # distinct : compteurs justes même si le queryset joint d'autres tables
+            return Count('building_properties', filter=condition, distinct=True)
+
+        return self.annotate(
+            total_units=count_units(),
+            occupied_units=count_units(Property.PropertyStatus.OCCUPIED),
+            available_units=count_units(Property.PropertyStatus.AVAILABLE),
+            maintenance_units=count_units(Property.PropertyStatus.MAINTENANCE),
+        ).annotate(
+            occupancy_rate=Case(
+                When(total_units=0, then=Value(0.0)),
+                default=Cast('occupied_units', FloatField()) * 100 / F('total_units'),
+                output_field=FloatField(),
+            )
+        )
+
 
 class Building(SoftDeletedModelMixin, ImmobBaseModel):
     """Bâtiment contenant plusieurs propriétés"""
@@ -34,16 +74,24 @@ class Building(SoftDeletedModelMixin, ImmobBaseModel):
     )
     description = models.TextField(blank=True, verbose_name=_('Description'))
 
-    objects = ImmobDefaultManager()
-    all_objects = models.Manager()
+    # Recherche plein texte (colonne générée, maintenue par PostgreSQL)
+    search_vector = models.GeneratedField(
+        expression=SearchVector('name', 'street', 'city', 'postal_code', config='simple'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = WorkspaceScopedManager.from_queryset(BuildingQuerySet)()
+    all_objects = models.Manager.from_queryset(BuildingQuerySet)()
 
     class Meta:
         db_table = 'immob_buildings'
         verbose_name = _('Building')
         verbose_name_plural = _('Buildings')
         indexes = [
-            models.Index(fields=['workspace', 'city']),
-            models.Index(fields=['postal_code']),
+            SoftDeletedModelMixin.live_index('workspace', 'city', name='building_ws_city_live'),
+            SoftDeletedModelMixin.live_index('postal_code', name='building_postal_live'),
+            GinIndex(fields=['search_vector'], name='building_search_vector_gin'),
         ]
 
     def __str__(self):
@@ -51,6 +99,9 @@ class Building(SoftDeletedModelMixin, ImmobBaseModel):
 
     def get_occupancy_rate(self):
         """Calcule le taux d'occupation du bâtiment"""
+        # Déjà annoté par Building.objects.with_occupancy() : aucune requête
+        if hasattr(self, 'occupancy_rate'):
+            return self.occupancy_rate
         total = self.get_property_count()
         if total == 0:
             return 0.0
@@ -59,10 +110,14 @@ class Building(SoftDeletedModelMixin, ImmobBaseModel):
 
     def get_property_count(self):
         """Retourne le nombre total de propriétés"""
+        if hasattr(self, 'total_units'):
+            return self.total_units
         return self.building_properties.filter(is_deleted=False).count() # type: ignore
 
     def get_occupied_property_count(self):
         """Retourne le nombre de propriétés occupées"""
+        if hasattr(self, 'occupied_units'):
+            return self.occupied_units
         return self.building_properties.filter( # type: ignore
             is_deleted=False,
             status=Property.PropertyStatus.OCCUPIED
@@ -163,7 +218,14 @@ class Property(SoftDeletedModelMixin, ImmobBaseModel):
     
     description = models.TextField(blank=True, verbose_name=_('Description'))
 
-    objects = ImmobDefaultManager()
+    # Recherche plein texte (colonne générée, maintenue par PostgreSQL)
+    search_vector = models.GeneratedField(
+        expression=SearchVector('name', 'reference_code', 'door_number', config='simple'),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = WorkspaceScopedManager()
     all_objects = models.Manager()
 
     class Meta:
@@ -171,10 +233,13 @@ class Property(SoftDeletedModelMixin, ImmobBaseModel):
         verbose_name = _('Property')
         verbose_name_plural = _('Properties')
         indexes = [
-            models.Index(fields=['workspace', 'status']),
-            models.Index(fields=['building', 'floor']),
-            models.Index(fields=['type', 'status']),
+            SoftDeletedModelMixin.live_index('workspace', 'status', name='property_ws_status_live'),
+            SoftDeletedModelMixin.live_index('building', 'floor', name='property_bldg_floor_live'),
+            SoftDeletedModelMixin.live_index('type', 'status', name='property_type_status_live'),
             models.Index(fields=['reference_code']),
+            GinIndex(fields=['search_vector'], name='property_search_vector_gin'),
+            # Recherche approchée (pg_trgm) : similarité et LIKE/ILIKE
+            GinIndex(fields=['reference_code'], opclasses=['gin_trgm_ops'], name='property_reference_code_trgm'),
         ]
 
     def __str__(self):
@@ -318,9 +383,9 @@ class MaintenanceLog(SoftDeletedModelMixin, ImmobBaseModel):
         verbose_name = _('Maintenance Log')
         verbose_name_plural = _('Maintenance Logs')
         indexes = [
-            models.Index(fields=['property', 'status']),
-            models.Index(fields=['scheduled_date', 'status']),
-            models.Index(fields=['type', 'status']),
+            SoftDeletedModelMixin.live_index('property', 'status', name='maint_prop_status_live'),
+            SoftDeletedModelMixin.live_index('scheduled_date', 'status', name='maint_date_status_live'),
+            SoftDeletedModelMixin.live_index('type', 'status', name='maint_type_status_live'),
         ]
 
     def __str__(self):
@@ -1,14 +1,16 @@
 from accounts.models import ImmobUser, UserBuildingPermission
-from holdings.models import Building
-from .dtos import AddressUpdateDTO, BuildingCreateDTO, BuildingUpdateDTO, AddressDTO
+from accounts.services.permission_resolver import PermissionResolver
+from holdings.models import Building, BuildingQuerySet
+from .dtos import AddressUpdateDTO, BuildingCreateDTO, BuildingUpdateDTO, AddressDTO, BuildingPermission
 from core.services.audit_log_service import AuditLogService, AuditLog
 from django.db import transaction
 from django.db.models.query import QuerySet
-from django.db.models import OuterRef, Subquery, CharField, IntegerField, Value, Case, When
+from django.db.models import OuterRef, Subquery, CharField, IntegerField, Value, Case, When, F
 from django.utils import timezone
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from uuid import UUID
+from datetime import datetime
 from typing import Literal, Optional, List, Dict, Any
 
 
@@ -52,37 +54,39 @@ class BuildingService:
         :raises PermissionError: Si l'utilisateur n'a pas le droit.
         """
         
-        required_score = SCORE_MAPPING.get(required_permission, DEFAULT_SCORE)
-        
         try:
             building = Building.objects.get(id=building_id)
         except Building.DoesNotExist:
             self._log_access_denied(acting_user, building_id, request)
             raise PermissionError("Accès refusé ou ressource non trouvée.")
 
-        # L'OWNER a un accès illimité
-        if acting_user.role == ImmobUser.UserRole.OWNER:
-            return building
-            
-        # Les autres rôles (MANAGER/VIEWER) doivent avoir une permission explicite
-        
-        best_permission = UserBuildingPermission.objects.filter(
-            user=acting_user,
-            building=building,
-        ).filter(
-            Q(expires_at__isnull=True) | Q(expires_at__gte=timezone.now()) # Permissions valides
-        ).order_by('-permission_level_score').first() # Ordonne par le score le plus élevé
-        
-        # Détermine le score de l'utilisateur sur ce Building
-        user_score = best_permission.permission_level_score if best_permission else DEFAULT_SCORE
+        self.check_building_permission(acting_user, building.id, required_permission, request)
+
+        return building
+
+    def check_building_permission(
+        self,
+        acting_user: ImmobUser,
+        building_id: UUID,
+        required_permission: UserBuildingPermission.PermissionLevel,
+        request: Optional[Any] = None
+    ) -> None:
+        """
+        Vérifie que l'utilisateur a le niveau de permission requis sur un Building.
+        Les scores sont résolus via le PermissionResolver de la requête :
+        une seule requête DB par requête HTTP, quel que soit le nombre de vérifications.
+
+        :raises PermissionError: Si l'utilisateur n'a pas le droit.
+        """
+
+        # L'OWNER a un accès illimité (géré par le resolver, sans requête DB)
+        resolver = PermissionResolver.for_user(acting_user, request)
 
         # Règle 3: Comparaison des scores
-        if user_score < required_score:
+        if not resolver.has_permission(building_id, required_permission):
             self._log_access_denied(acting_user, building_id, request)
             raise PermissionError(f"Permission insuffisante.")
 
-        return building
-
 
     @transaction.atomic
     def create_building(self, acting_user: ImmobUser, building_data: BuildingCreateDTO, request=None) -> Building:
@@ -118,7 +122,7 @@ class BuildingService:
         # 3. CRÉATION DU BÂTIMENT
         building = Building.objects.create(
             **building_fields,
-            workspace=acting_user.workspace
+            workspace_id=acting_user.workspace_id
         )
         
         # 4. CRÉATION DES PERMISSIONS (si fournies)
@@ -150,9 +154,9 @@ class BuildingService:
                     )
                 )
 
-            # 4.3 Sauvegarde en masse
+            # 4.3 Sauvegarde en masse (scores calculés, upsert sur (user, building))
             if permissions_to_create:
-                UserBuildingPermission.objects.bulk_create(permissions_to_create)
+                UserBuildingPermission.objects.bulk_grant(permissions_to_create)
 
         # 5. AUDIT LOG
         AuditLogService.log_action(
@@ -166,6 +170,66 @@ class BuildingService:
 
         return building
 
+    @transaction.atomic
+    def grant_permissions(
+        self,
+        acting_user: ImmobUser,
+        building_ids: List[UUID],
+        permissions_data: List[BuildingPermission],
+        expires_at: Optional[datetime] = None,
+        request=None
+    ) -> List[UserBuildingPermission]:
+        """
+        Octroie (ou met à jour) des permissions à plusieurs utilisateurs sur
+        plusieurs bâtiments en une seule requête (réservé aux Owners).
+        Utilisé pour l'intégration d'une équipe sur tout un parc.
+        """
+
+        # 1. CONTRÔLE DE RÔLE
+        if acting_user.role != ImmobUser.UserRole.OWNER:
+            self._log_access_denied(acting_user, UUID(int=0), request)
+            raise PermissionError("Accès refusé. Seul un Owner est autorisé à attribuer des permissions.")
+
+        # 2. Périmètre : uniquement les bâtiments et utilisateurs du workspace de l'Owner
+        buildings = list(
+            Building.objects.filter(id__in=building_ids, workspace_id=acting_user.workspace_id).values_list('id', flat=True)
+        )
+        users_map = ImmobUser.objects.filter(workspace_id=acting_user.workspace_id).in_bulk(
+            [p.user_id for p in permissions_data]
+        )
+
+        # 3. UPSERT EN MASSE
+        permissions_to_grant = [
+            UserBuildingPermission(
+                user=users_map[perm.user_id],
+                building_id=building_id,
+                permission_level=perm.permission_name,
+                granted_by=acting_user,
+                expires_at=expires_at,
+            )
+            for building_id in buildings
+            for perm in permissions_data
+            if perm.user_id in users_map
+        ]
+        granted = UserBuildingPermission.objects.bulk_grant(permissions_to_grant)
+
+        # 4. AUDIT LOG (une entrée pour l'ensemble du lot)
+        AuditLogService.log_action(
+            user=acting_user,
+            action=AuditLog.AuditAction.UPDATE,
+            entity_type='UserBuildingPermission',
+            entity_id=str(UUID(int=0)),
+            new_values={
+                'building_ids': [str(building_id) for building_id in buildings],
+                'permissions': [p.model_dump(mode='json') for p in permissions_data if p.user_id in users_map],
+                'expires_at': expires_at.isoformat() if expires_at else None,
+                'granted_count': len(granted),
+            },
+            request=request,
+        )
+
+        return granted
+
     @transaction.atomic
     def update_building(
         self, 
@@ -225,14 +289,22 @@ class BuildingService:
 
         return building_to_update
 
-    def list_buildings_for_user(self, acting_user: ImmobUser):
+    def list_buildings_for_user(self, acting_user: ImmobUser, with_occupancy: bool = True):
         """
         Retourne la liste des Buildings auxquels l'utilisateur a accès.
         Implémente le filtrage par périmètre.
+
+        Avec `with_occupancy`, chaque ligne contient aussi les compteurs
+        d'occupation (total_units, occupied_units, available_units,
+        maintenance_units, occupancy_rate), calculés dans la même requête.
         """
-        
+        occupancy_fields = BuildingQuerySet.OCCUPANCY_FIELDS if with_occupancy else ()
+
         if acting_user.role == ImmobUser.UserRole.OWNER:
-            return Building.objects.all().annotate(
+            buildings_qs = Building.objects.for_workspace(acting_user.workspace_id) # type: ignore
+            if with_occupancy:
+                buildings_qs = buildings_qs.with_occupancy()
+            return buildings_qs.annotate(
                 user_best_permission=Value(
                     str(UserBuildingPermission.PermissionLevel.DELETE),
                     output_field=CharField()
@@ -248,18 +320,20 @@ class BuildingService:
                 'latitude', 
                 'longitude',
                 'floor_count',
-                'description'
+                'description',
+                *occupancy_fields
             )
         
-        valid_user_permissions = UserBuildingPermission.objects.filter(
-            user=acting_user,
-            building=OuterRef('pk')
-        ).filter(
-            Q(expires_at__isnull=True) | Q(expires_at__gte=timezone.now())
-        ).order_by('-permission_level_score')
-        
-        single_score_subquery = valid_user_permissions.values('permission_level_score')[:1]
-        
+        # Plan par jointure sur la permission valide de l'utilisateur (unique
+        # par bâtiment) : le score est lu sur la ligne jointe, sans sous-requête
+        # corrélée ni DISTINCT.
+        buildings_qs = Building.objects.for_workspace(acting_user.workspace_id).filter( # type: ignore
+            Q(user_permissions__expires_at__isnull=True) | Q(user_permissions__expires_at__gte=timezone.now()),
+            user_permissions__user=acting_user,
+        ).annotate(
+            user_best_score=F('user_permissions__permission_level_score')
+        )
+
         SCORE_TO_PERMISSION_MAP = {v: k for k, v in SCORE_MAPPING.items()}
         permission_case = Case(
             *[
@@ -269,15 +343,10 @@ class BuildingService:
             default=Value('none'),
             output_field=CharField()
         )
-        
-        buildings_qs = Building.objects.filter(
-            id__in=valid_user_permissions.values('building')
-        ).distinct().annotate(
-           user_best_score=Subquery(
-               single_score_subquery, output_field=IntegerField()
-           )
-        )
-        
+
+        if with_occupancy:
+            buildings_qs = buildings_qs.with_occupancy()
+
         buildings_qs = buildings_qs.annotate(
             user_best_permission=permission_case
         ).values(
@@ -291,9 +360,14 @@ class BuildingService:
             'latitude', 
             'longitude',
             'floor_count',
-            'description'
+            'description',
+            *occupancy_fields
         )
         
         return buildings_qs
 
+    async def alist_buildings_for_user(self, acting_user: ImmobUser, with_occupancy: bool = True) -> List[Dict[str, Any]]:
+        """Version asynchrone de list_buildings_for_user (requête évaluée par l'ORM asynchrone)."""
+        return [row async for row in self.list_buildings_for_user(acting_user, with_occupancy)]
+
 building_service = BuildingService()
\ No newline at end of file
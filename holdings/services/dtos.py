@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import Literal, Optional
 from uuid import UUID
+from decimal import Decimal
 from holdings.models import Property
 
 class AddressDTO(BaseModel):
@@ -120,3 +121,50 @@ class PropertyPhotoDTO(BaseModel):
     file_path: str = Field(..., max_length=500)
     is_primary: Optional[bool] = False
     display_order: Optional[int] = 0
+
+
+class PropertyListQueryDTO(BaseModel):
+    """
+    Filtres, tri et pagination par curseur de la liste des propriétés.
+    Utilisé par PropertyService.list_properties_page.
+    """
+    status: Optional[str] = Field(None, max_length=20)
+    type: Optional[str] = Field(None, max_length=20)
+    building_id: Optional[UUID] = None
+    city: Optional[str] = Field(None, max_length=100)
+    rent_min: Optional[Decimal] = Field(None, ge=0)
+    rent_max: Optional[Decimal] = Field(None, ge=0)
+    room_count_min: Optional[int] = Field(None, ge=0)
+    room_count_max: Optional[int] = Field(None, ge=0)
+    sort: Literal[
+        'created_at', '-created_at',
+        'name', '-name',
+        'monthly_rent', '-monthly_rent',
+        'room_count', '-room_count',
+    ] = '-created_at'
+    cursor: Optional[str] = None
+    page_size: int = Field(50, ge=1, le=200)
+
+    @field_validator('type')
+    def validate_type(cls, value):
+        """
+        Vérifie que le type de propriété est valide.
+        """
+        if value is None:
+            return value
+        valid_types = [choice[0] for choice in Property.PropertyType.choices]
+        if value not in valid_types:
+            raise ValueError(f"Le type de propriété doit être l'un des suivants : {', '.join(valid_types)}")
+        return value
+
+    @field_validator('status')
+    def validate_status(cls, value):
+        """
+        Vérifie que le statut de la propriété est valide.
+        """
+        if value is None:
+            return value
+        valid_statuses = [choice[0] for choice in Property.PropertyStatus.choices]
+        if value not in valid_statuses:
+            raise ValueError(f"Le statut de la propriété doit être l'un des suivants : {', '.join(valid_statuses)}")
+        return value
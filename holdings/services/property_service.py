@@ -1,12 +1,14 @@
 from accounts.models import ImmobUser, UserBuildingPermission
 from holdings.models import Building, Property
-from .dtos import PropertyCreateDTO, PropertyUpdateDTO # DTOs de la session précédente
+from .dtos import PropertyCreateDTO, PropertyUpdateDTO, PropertyListQueryDTO # DTOs de la session précédente
+from accounts.services.permission_resolver import PermissionResolver
+from core.pagination import akeyset_paginate, keyset_paginate, validate_cursor
 from core.services.audit_log_service import AuditLogService, AuditLog
 from holdings.services.building_service import building_service, SCORE_MAPPING, DEFAULT_SCORE # Importe le service et les constantes
 
 from django.db import transaction
 from django.db.models.query import QuerySet
-from django.db.models import OuterRef, Subquery, CharField, IntegerField, Value, Case, When
+from django.db.models import OuterRef, Subquery, CharField, IntegerField, Value, Case, When, F
 from django.utils import timezone
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
@@ -47,16 +49,23 @@ class PropertyService:
             self._log_access_denied(acting_user, property_id, request)
             raise PermissionError("Propriété non trouvée.")
 
-        # 2. Délégation du contrôle d'accès au BuildingService
+        # 2. Le bâtiment parent doit exister (et ne pas être supprimé)
+        if prop.building is None or prop.building.is_deleted:
+            building_service._log_access_denied(acting_user, prop.building_id, request) # type: ignore
+            raise PermissionError("Accès refusé ou ressource non trouvée.")
+
+        # 3. Délégation du contrôle d'accès au BuildingService
+        # Le bâtiment est déjà chargé via select_related : seule la vérification
+        # des droits est déléguée (servie par le PermissionResolver de la requête)
         # Lève une PermissionError si l'accès est refusé sur le bâtiment parent
-        building_service.get_building_for_user(
+        building_service.check_building_permission(
             acting_user=acting_user,
-            building_id=prop.building.id, # type: ignore
+            building_id=prop.building.id,
             required_permission=required_permission,
             request=request
         )
         
-        # 3. Retourner la propriété si le contrôle est passé
+        # 4. Retourner la propriété si le contrôle est passé
         return prop
 
     @transaction.atomic
@@ -84,7 +93,7 @@ class PropertyService:
         
         prop = Property.objects.create(
             reference_code = generate_reference_code(property_data.type),
-            workspace = acting_user.workspace,
+            workspace_id = acting_user.workspace_id,
             building=parent_building,
             **data_to_create
         )
@@ -161,9 +170,8 @@ class PropertyService:
             request
         )
         
-        # 2. SOFT DELETE
-        prop_to_delete.is_deleted = True
-        prop_to_delete.save()
+        # 2. SOFT DELETE (horodaté pour la purge différée)
+        prop_to_delete.delete()
         
         # 3. AUDIT LOG (CDC 5.3.4)
         AuditLogService.log_action(
@@ -204,7 +212,7 @@ class PropertyService:
         
         # Cas 1: OWNER
         if acting_user.role == ImmobUser.UserRole.OWNER:
-            return Property.objects.filter(is_deleted=False).annotate(
+            return Property.objects.for_workspace(acting_user.workspace_id).annotate( # type: ignore
                 building_permission=Value(
                     str(UserBuildingPermission.PermissionLevel.DELETE),
                     output_field=CharField()
@@ -212,32 +220,23 @@ class PropertyService:
             ).values() # .values() est optionnel mais suit le style demandé
 
         # Cas 2: MANAGER/VIEWER
-        
-        # Sous-requête des permissions valides (exactement comme dans BuildingService)
-        valid_user_permissions = UserBuildingPermission.objects.filter(
-            user=acting_user
-        ).filter(
-            Q(expires_at__isnull=True) | Q(expires_at__gte=timezone.now())
-        )
-        
-        # Filtre les bâtiments auxquels l'utilisateur a au moins le droit VIEW
-        buildings_with_view_access = valid_user_permissions.filter(
-            permission_level_score__gte=SCORE_MAPPING[UserBuildingPermission.PermissionLevel.VIEW]
-        ).values_list('building_id', flat=True)
-
-        # Requête principale : Obtenir les propriétés de ces bâtiments
-        properties_qs = Property.objects.filter(
-            building_id__in=buildings_with_view_access,
-            is_deleted=False
+
+        # Plan par jointure : propriétés ⋈ bâtiment ⋈ permission valide de
+        # l'utilisateur. Toutes les conditions sont dans le même filter() pour
+        # porter sur la même ligne de permission ; (user, building) étant
+        # unique, la jointure ne duplique aucune propriété et le score est lu
+        # directement sur la ligne jointe (pas de sous-requête par propriété).
+        permission = 'building__user_permissions__'
+        properties_qs = Property.objects.for_workspace(acting_user.workspace_id).filter( # type: ignore
+            Q(**{f'{permission}expires_at__isnull': True}) | Q(**{f'{permission}expires_at__gte': timezone.now()}),
+            **{
+                f'{permission}user': acting_user,
+                f'{permission}permission_level_score__gte': SCORE_MAPPING[UserBuildingPermission.PermissionLevel.VIEW],
+            },
+        ).annotate(
+            building_permission_score=F(f'{permission}permission_level_score')
         )
 
-        # Annotation : Ajoute le niveau de permission du bâtiment parent à chaque propriété
-        
-        # Subquery pour le score
-        score_subquery = valid_user_permissions.filter(
-            building_id=OuterRef('building_id')
-        ).values('permission_level_score')[:1]
-        
         # Case pour le mapping score -> str
         SCORE_TO_PERMISSION_MAP = {v: k for k, v in SCORE_MAPPING.items()}
         permission_case = Case(
@@ -248,13 +247,7 @@ class PropertyService:
             default=Value('none'),
             output_field=CharField()
         )
-
-        # Applique l'annotation
-        properties_qs = properties_qs.annotate(
-            building_permission_score=Subquery(score_subquery, output_field=IntegerField())
-        ).annotate(
-            building_permission=permission_case
-        )
+        properties_qs = properties_qs.annotate(building_permission=permission_case)
         
         # Retourne les valeurs pour le frontend
         return properties_qs.values(
@@ -277,8 +270,124 @@ class PropertyService:
             'monthly_rent',
             'description'
         ) #
-           
-        
+
+
+    PAGE_FIELDS = (
+        'id', 'name', 'reference_code', 'building_id', 'building__name', 'building__city',
+        'type', 'status', 'floor', 'door_number', 'surface_area', 'room_count',
+        'bedroom_count', 'bathroom_count', 'has_parking', 'has_balcony', 'equipment_list',
+        'monthly_rent', 'description', 'created_at',
+    )
+
+    def _page_queryset(
+        self,
+        acting_user: ImmobUser,
+        filters: PropertyListQueryDTO,
+        scores: Optional[Dict[UUID, int]]
+    ) -> QuerySet:
+        """
+        Requête (non évaluée) des propriétés filtrées. `scores` restreint le
+        périmètre aux bâtiments visibles (None pour un OWNER).
+        """
+        properties_qs = Property.objects.for_workspace(acting_user.workspace_id) # type: ignore
+        if scores is not None:
+            properties_qs = properties_qs.filter(building_id__in=list(scores))
+
+        if filters.status:
+            properties_qs = properties_qs.filter(status=filters.status)
+        if filters.type:
+            properties_qs = properties_qs.filter(type=filters.type)
+        if filters.building_id:
+            properties_qs = properties_qs.filter(building_id=filters.building_id)
+        if filters.city:
+            properties_qs = properties_qs.filter(building__city=filters.city)
+        if filters.rent_min is not None:
+            properties_qs = properties_qs.filter(monthly_rent__gte=filters.rent_min)
+        if filters.rent_max is not None:
+            properties_qs = properties_qs.filter(monthly_rent__lte=filters.rent_max)
+        if filters.room_count_min is not None:
+            properties_qs = properties_qs.filter(room_count__gte=filters.room_count_min)
+        if filters.room_count_max is not None:
+            properties_qs = properties_qs.filter(room_count__lte=filters.room_count_max)
+
+        return properties_qs.values(*self.PAGE_FIELDS)
+
+    @staticmethod
+    def _page_ordering(filters: PropertyListQueryDTO) -> List[str]:
+        # Clé de tri unique : départage par id dans le même sens
+        tie_breaker = '-id' if filters.sort.startswith('-') else 'id'
+        return [filters.sort, tie_breaker]
+
+    def validate_page_cursor(self, filters: PropertyListQueryDTO) -> None:
+        """
+        Vérifie le curseur de la page demandée avant toute requête.
+
+        :raises InvalidCursorError: Curseur invalide.
+        """
+        validate_cursor(Property, self._page_ordering(filters), filters.cursor)
+
+    @staticmethod
+    def _visible_scores(scores: Dict[UUID, int]) -> Dict[UUID, int]:
+        view_score = SCORE_MAPPING[UserBuildingPermission.PermissionLevel.VIEW]
+        return {building_id: score for building_id, score in scores.items() if score >= view_score}
+
+    @staticmethod
+    def _set_page_permissions(page: Dict[str, Any], scores: Optional[Dict[UUID, int]]) -> Dict[str, Any]:
+        score_to_permission = {score: permission for permission, score in SCORE_MAPPING.items()}
+        for row in page['results']:
+            if scores is None:
+                row['building_permission'] = str(UserBuildingPermission.PermissionLevel.DELETE)
+            else:
+                row['building_permission'] = str(score_to_permission.get(scores.get(row['building_id']), 'none'))
+        return page
+
+    def list_properties_page(
+        self,
+        acting_user: ImmobUser,
+        filters: PropertyListQueryDTO,
+        request: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Retourne une page de propriétés visibles par l'utilisateur, filtrée et
+        triée côté serveur, paginée par curseur (taille constante quel que soit
+        le nombre de logements du workspace).
+
+        Le périmètre d'un MANAGER/VIEWER et son droit par bâtiment viennent du
+        PermissionResolver (scores en cache) : aucune sous-requête corrélée.
+
+        :return: {'results': [...], 'next_cursor': str | None, 'has_more': bool}
+        :raises InvalidCursorError: Curseur invalide.
+        """
+        scores = None
+        if acting_user.role != ImmobUser.UserRole.OWNER:
+            scores = self._visible_scores(PermissionResolver.for_user(acting_user, request).scores)
+
+        page = keyset_paginate(
+            self._page_queryset(acting_user, filters, scores),
+            ordering=self._page_ordering(filters),
+            cursor=filters.cursor,
+            page_size=filters.page_size,
+        )
+        return self._set_page_permissions(page, scores)
+
+    async def alist_properties_page(
+        self,
+        acting_user: ImmobUser,
+        filters: PropertyListQueryDTO,
+        request: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """Version asynchrone de list_properties_page (ORM asynchrone)."""
+        scores = None
+        if acting_user.role != ImmobUser.UserRole.OWNER:
+            scores = self._visible_scores(await PermissionResolver.for_user(acting_user, request).ascores())
+
+        page = await akeyset_paginate(
+            self._page_queryset(acting_user, filters, scores),
+            ordering=self._page_ordering(filters),
+            cursor=filters.cursor,
+            page_size=filters.page_size,
+        )
+        return self._set_page_permissions(page, scores)
 
 
 property_service = PropertyService()
\ No newline at end of file
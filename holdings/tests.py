@@ -1,3 +1,143 @@
-from django.test import TestCase
+from decimal import Decimal
+from unittest import skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+
+from accounts.models import ImmobUser, UserBuildingPermission
+from holdings.models import Building, Property
+from holdings.services.building_service import building_service
+from holdings.services.property_service import property_service
+
+
+@skipUnless(connection.vendor == 'postgresql', "Plans d'exécution PostgreSQL")
+class PermissionListingPlanTests(TestCase):
+    """
+    Les listes d'un MANAGER/VIEWER doivent joindre les permissions une seule
+    fois : aucune sous-requête (SubPlan) exécutée pour chaque ligne.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        owner = ImmobUser.objects.create_user(
+            username='owner', email='owner@example.com', password='x',
+            role=ImmobUser.UserRole.OWNER,
+        )
+        workspace = owner.workspace
+        cls.manager = ImmobUser.objects.create_user(
+            username='manager', email='manager@example.com', password='x',
+            role=ImmobUser.UserRole.MANAGER, workspace=workspace,
+        )
+        for index in range(3):
+            building = Building.objects.create(
+                workspace=workspace, name=f'B{index}', street='Rue', city='Douala'
+            )
+            for unit in range(2):
+                Property.objects.create(
+                    building=building, workspace=workspace,
+                    reference_code=f'TST-{index}{unit}', name=f'P{index}{unit}',
+                    type=Property.PropertyType.APARTMENT, surface_area=40,
+                    room_count=2, monthly_rent=Decimal('100000'),
+                )
+            if index < 2:
+                UserBuildingPermission.objects.create(
+                    user=cls.manager, building=building, granted_by=owner,
+                    permission_level=UserBuildingPermission.PermissionLevel.UPDATE,
+                )
+
+    def assertNoSubPlan(self, queryset):
+        plan = queryset.explain()
+        self.assertNotIn('SubPlan', plan, plan)
+
+    def test_list_all_properties_for_user_uses_join(self):
+        properties = property_service.list_all_properties_for_user(self.manager)
+
+        self.assertNoSubPlan(properties)
+        rows = list(properties)
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(
+            {row['building_permission'] for row in rows},
+            {UserBuildingPermission.PermissionLevel.UPDATE}
+        )
+
+    def test_list_buildings_for_user_uses_join(self):
+        buildings = building_service.list_buildings_for_user(self.manager)
+
+        self.assertNoSubPlan(buildings)
+        rows = list(buildings)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual({row['total_units'] for row in rows}, {2})
+
+
+class BuildingPermissionCheckTests(TestCase):
+    """Vérifications de permission servies par le resolver de la requête, à jour des octrois et retraits."""
+
+    Level = UserBuildingPermission.PermissionLevel
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = ImmobUser.objects.create_user(
+            username='check-owner', email='check-owner@example.com', password=None,
+            role=ImmobUser.UserRole.OWNER,
+        )
+        workspace = cls.owner.workspace
+        cls.manager = ImmobUser.objects.create_user(
+            username='check-manager', email='check-manager@example.com', password=None,
+            role=ImmobUser.UserRole.MANAGER, workspace=workspace,
+        )
+        cls.buildings = [
+            Building.objects.create(workspace=workspace, name=f'C{index}', street='Rue', city='Douala')
+            for index in range(3)
+        ]
+        UserBuildingPermission.objects.create(
+            user=cls.manager, building=cls.buildings[0], granted_by=cls.owner, permission_level=cls.Level.UPDATE,
+        )
+        UserBuildingPermission.objects.create(
+            user=cls.manager, building=cls.buildings[1], granted_by=cls.owner, permission_level=cls.Level.VIEW,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.request = RequestFactory().get('/')
+
+    def check(self, building, level, user=None):
+        building_service.check_building_permission(user or self.manager, building.pk, level, request=self.request)
+
+    def test_repeated_checks_share_one_query(self):
+        with self.assertNumQueries(1):
+            for _ in range(3):
+                self.check(self.buildings[0], self.Level.UPDATE)
+                self.check(self.buildings[1], self.Level.VIEW)
+
+        # Requête suivante : servie par le cache partagé
+        self.request = RequestFactory().get('/')
+        with self.assertNumQueries(0):
+            self.check(self.buildings[0], self.Level.VIEW)
+
+    def test_owner_check_needs_no_query(self):
+        with self.assertNumQueries(0):
+            for building in self.buildings:
+                self.check(building, self.Level.DELETE, user=self.owner)
+
+    def test_grant_during_the_request_is_seen(self):
+        with self.assertRaises(PermissionError):
+            self.check(self.buildings[2], self.Level.VIEW)
+
+        UserBuildingPermission.objects.create(
+            user=self.manager, building=self.buildings[2], granted_by=self.owner, permission_level=self.Level.VIEW,
+        )
+        self.check(self.buildings[2], self.Level.VIEW)
+
+        UserBuildingPermission.objects.bulk_grant([UserBuildingPermission(
+            user=self.manager, building=self.buildings[1], granted_by=self.owner, permission_level=self.Level.DELETE,
+        )])
+        self.check(self.buildings[1], self.Level.DELETE)
+
+    def test_revoke_during_the_request_is_seen(self):
+        self.check(self.buildings[0], self.Level.UPDATE)
+
+        UserBuildingPermission.objects.filter(user=self.manager, building=self.buildings[0]).get().delete()
+
+        with self.assertRaises(PermissionError):
+            self.check(self.buildings[0], self.Level.VIEW)
@@ -1,19 +1,29 @@
+from core.services.reference_service import reference_service
+from django.utils import timezone
+from typing import List
 from .models import Property
 
 
-def generate_reference_code(property_type):
-    """Génère un code de référence unique pour une propriété"""
-    from django.utils import timezone
-    import random
-    
+def _reference_prefix(property_type) -> str:
     type_prefix = {
         Property.PropertyType.APARTMENT: 'APT',
         Property.PropertyType.HOUSE: 'HSE',
         Property.PropertyType.STUDIO: 'STD',
     }.get(property_type, 'PRO')
-    
 
     date_part = timezone.now().strftime('%y%m')
-    random_part = ''.join([str(random.randint(0, 9)) for _ in range(3)])
-    
-    return f"{type_prefix}-{date_part}{random_part}"
\ No newline at end of file
+    return f"{type_prefix}-{date_part}"
+
+
+def generate_reference_codes(property_type, count: int) -> List[str]:
+    """
+    Génère `count` codes de référence uniques pour des propriétés d'un même type
+    (numérotation séquentielle par type et par mois, ex. APT-25100042).
+    """
+    prefix = _reference_prefix(property_type)
+    return [f"{prefix}{value:04d}" for value in reference_service.allocate(prefix, count)]
+
+
+def generate_reference_code(property_type):
+    """Génère un code de référence unique pour une propriété"""
+    return generate_reference_codes(property_type, 1)[0]
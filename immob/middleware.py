@@ -1,12 +1,76 @@
+from abc import ABC, abstractmethod
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.contrib.auth.middleware import AuthenticationMiddleware
 from django.contrib.messages import get_messages
+from django.utils.functional import SimpleLazyObject
+from accounts.services.user_payload_cache import UserPayloadCache
+from accounts.services.user_snapshot_cache import UserSnapshotCache
+from functools import partial
 from inertia import share
+from core.context import UNSCOPED, LazyWorkspace, set_current_workspace, reset_current_workspace
 
 
-class DataShareMiddleware(object):
+class AsyncCapableMiddleware(ABC):
+    """
+    Base des middlewares du projet, utilisables en WSGI comme en ASGI :
+    sous ASGI, `__acall__` est appelé sans repasser par un thread, ce qui
+    laisse les vues async s'exécuter directement dans la boucle d'événements.
+    """
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.process(request)
+
+    @abstractmethod
+    def process(self, request):
+        """Traitement de la requête sous WSGI (ou vue sync)."""
+
+    @abstractmethod
+    async def __acall__(self, request):
+        """Traitement de la requête sous ASGI."""
+
+
+def _get_cached_user(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = UserSnapshotCache.get_user(request)
+    return request._cached_user
+
+
+async def _aget_cached_user(request):
+    if not hasattr(request, "_acached_user"):
+        request._acached_user = await UserSnapshotCache.aget_user(request)
+    return request._acached_user
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    AuthenticationMiddleware dont l'utilisateur de session est servi par le
+    UserSnapshotCache : la DB n'est interrogée qu'en cas d'absence du cache.
+    """
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: _get_cached_user(request))
+        request.auser = partial(_aget_cached_user, request)
+
+
+class DataShareMiddleware(AsyncCapableMiddleware):
+    """
+    Partage les messages flash avec les pages Inertia. La prop est paresseuse :
+    le stockage des messages n'est lu (et vidé) que lorsqu'une page Inertia
+    est rendue avec cette prop, pas pour les réponses JSON ou les
+    rechargements partiels qui ne la demandent pas.
+    """
+
+    @staticmethod
+    def _collect_messages(request):
         messages = []
         for message in get_messages(request):
             message = {
@@ -17,26 +81,72 @@ class DataShareMiddleware(object):
                 "level_tag": message.level_tag,
             }
             messages.append(message)
-        share(request, messages=messages,)
+        return messages
+
+    def process(self, request):
+        share(request, messages=lambda: self._collect_messages(request),)
 
         response = self.get_response(request)
 
         return response
 
-class UserAuthMiddleware(object):
-    def __init__(self, get_response):
-        self.get_response = get_response
+    async def __acall__(self, request):
+        share(request, messages=lambda: self._collect_messages(request),)
+        return await self.get_response(request)
 
-    def __call__(self, request):
-        user = dict()
-        if request.user.is_authenticated:
-            user = {
-                "id": request.user.id,
-                "name": request.user.get_full_name(),
-                "username": request.user.username,
-                "email": request.user.email,
-                "role": request.user.role
-            }
-        share(request, auth={"user": user})
+
+class UserAuthMiddleware(AsyncCapableMiddleware):
+    """
+    Partage l'utilisateur connecté (`auth.user`) avec les pages Inertia.
+    Paresseux comme les messages, et servi depuis la session tant que le
+    profil n'a pas changé (UserPayloadCache).
+    """
+
+    def process(self, request):
+        share(request, auth=lambda: {"user": UserPayloadCache.get(request)})
         response = self.get_response(request)
         return response
+
+    async def __acall__(self, request):
+        share(request, auth=lambda: {"user": UserPayloadCache.get(request)})
+        return await self.get_response(request)
+
+
+class WorkspaceContextMiddleware(AsyncCapableMiddleware):
+    """
+    Active le workspace de l'utilisateur connecté pour la durée de la requête :
+    les managers WorkspaceScopedManager (Building, Property, Tenant, Contrat)
+    filtrent alors automatiquement sur ce workspace. Les superutilisateurs
+    (administration de la plateforme) ne sont pas restreints.
+
+    Le workspace est résolu au premier usage d'un de ces managers
+    (LazyWorkspace) : sous WSGI, les requêtes qui n'en font pas ne chargent
+    ni la session ni l'utilisateur. Sous ASGI, l'utilisateur est chargé en
+    amont (request.auser()) pour ne jamais bloquer la boucle d'événements.
+    Un utilisateur sans workspace ne voit aucune ligne.
+    """
+
+    @staticmethod
+    def _workspace_id_for(user):
+        if not user.is_authenticated or user.is_superuser:
+            return UNSCOPED
+        return user.workspace_id
+
+    def process(self, request):
+        token = set_current_workspace(LazyWorkspace(lambda: self._workspace_id_for(request.user)))
+        try:
+            return self.get_response(request)
+        finally:
+            reset_current_workspace(token)
+
+    async def __acall__(self, request):
+        # Le contexte (contextvars) suit la requête à travers les await et
+        # les appels sync_to_async de l'ORM asynchrone. L'utilisateur est
+        # chargé ici, dans la boucle, par request.auser() : la résolution
+        # ne fait alors plus aucun accès bloquant (session, DB).
+        user = await request.auser()
+        token = set_current_workspace(LazyWorkspace(lambda: self._workspace_id_for(user)))
+        try:
+            return await self.get_response(request)
+        finally:
+            reset_current_workspace(token)
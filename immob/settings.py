@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 import os
 import re
+import sys
 from pathlib import Path
 
 import environ
@@ -34,6 +35,9 @@ SECRET_KEY = env("SECRET_KEY", default="django-insecure-3472^sitrt^-xx#!u-t_4bi2
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = env.bool("DEBUG", default=True)
 
+# Exécution de la suite de tests (manage.py test) : certains défauts en dépendent
+TESTING = len(sys.argv) > 1 and sys.argv[1] == "test"
+
 ALLOWED_HOSTS = env.list("ALLOWED_HOSTS", default=["*"])
 
 SITE_ID = 1
@@ -47,6 +51,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sites",
+    "django.contrib.postgres",
     "debug_toolbar",
     
     "django_vite",
@@ -56,6 +61,7 @@ INSTALLED_APPS = [
     "accounts",
     "holdings",
     "finance",
+    "dashboard",
     
 ]
 
@@ -66,7 +72,8 @@ MIDDLEWARE = [
     
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "immob.middleware.CachedAuthenticationMiddleware",
+    "immob.middleware.WorkspaceContextMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "inertia.middleware.InertiaMiddleware",
@@ -116,10 +123,82 @@ else:
         }
 }
 
+# Pool de connexions psycopg 3 (OPTIONS["pool"], Django 5.1+) : les connexions
+# sont réutilisées entre requêtes et threads d'un même worker au lieu d'être
+# rouvertes (TLS + authentification) à chaque requête.
+# DATABASE_POOL_MAX_SIZE devrait couvrir le nombre de threads par worker.
+DATABASE_POOL = env.bool("DATABASE_POOL", default=True)
+if DATABASE_POOL and DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0  # Incompatible avec le pool
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": env.int("DATABASE_POOL_MIN_SIZE", default=2),
+        "max_size": env.int("DATABASE_POOL_MAX_SIZE", default=8),
+        # Attente maximale (s) d'une connexion libre avant erreur
+        "timeout": env.float("DATABASE_POOL_TIMEOUT", default=10.0),
+        # Recyclage des connexions (s) : durée de vie et inactivité maximales
+        "max_lifetime": env.float("DATABASE_POOL_MAX_LIFETIME", default=1800.0),
+        "max_idle": env.float("DATABASE_POOL_MAX_IDLE", default=300.0),
+    }
+    # Vérifie chaque connexion avant de la prêter (coupures réseau, redémarrage du
+    # serveur). Avec le pool, Django transmet CONN_HEALTH_CHECKS au pool sous la
+    # forme check=ConnectionPool.check_connection (OPTIONS["pool"]["check"] est
+    # refusé : l'argument est déjà fourni par Django).
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = env.bool("DATABASE_POOL_CHECK", default=True)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Partagé entre les workers Gunicorn : backend fichier par défaut, dans un
+# répertoire propre à l'installation, ou Redis via CACHE_URL=redis://127.0.0.1:6379/1
+# (nécessite le paquet `redis`). Le backend fichier n'a pas d'incr atomique :
+# compteurs et versions y sont approximatifs sous concurrence (voir core.cache).
+# Les tests utilisent un cache mémoire propre au processus, vide à chaque lancement.
+
+CACHES = {
+    "default": env.cache("CACHE_URL", default=f"filecache://{BASE_DIR / 'var' / 'cache'}"),
+}
+if TESTING:
+    CACHES["default"] = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+
+# Durée de vie maximale (secondes) des permissions de bâtiment en cache
+PERMISSION_CACHE_TIMEOUT = env.int("PERMISSION_CACHE_TIMEOUT", default=300)
+
+# Durée de vie maximale (secondes) de l'instantané de l'utilisateur de session
+USER_SNAPSHOT_CACHE_TIMEOUT = env.int("USER_SNAPSHOT_CACHE_TIMEOUT", default=300)
+
+
+# Journal d'audit : écriture groupée asynchrone (bulk_create au COMMIT, par lot
+# ou sur minuterie). AUDIT_LOG_ASYNC=False écrit chaque entrée immédiatement ;
+# c'est le défaut des tests, où les callbacks on_commit d'un TestCase ne sont
+# jamais exécutés.
+AUDIT_LOG_ASYNC = env.bool("AUDIT_LOG_ASYNC", default=not TESTING)
+AUDIT_LOG_BATCH_SIZE = env.int("AUDIT_LOG_BATCH_SIZE", default=100)
+AUDIT_LOG_FLUSH_INTERVAL = env.float("AUDIT_LOG_FLUSH_INTERVAL", default=2.0)
+# Partitionnement mensuel (commande audit_partitions) : rétention et archivage
+AUDIT_LOG_RETENTION_MONTHS = env.int("AUDIT_LOG_RETENTION_MONTHS", default=None)
+AUDIT_LOG_ARCHIVE_DIR = env.str("AUDIT_LOG_ARCHIVE_DIR", default=None)
+
+# Numérotation des références : taille des blocs réservés par processus
+REFERENCE_BLOCK_SIZE = env.int("REFERENCE_BLOCK_SIZE", default=20)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
+# Hachage des mots de passe : PBKDF2-SHA256 au facteur de travail configurable.
+# Un changement d'itérations est appliqué à chaque compte lors de sa connexion suivante.
+PASSWORD_HASHER_ITERATIONS = env.int("PASSWORD_HASHER_ITERATIONS", default=1_000_000)
+# Processus de hachage des mots de passe pour l'import d'équipe (défaut : nombre de CPU)
+TEAM_IMPORT_HASH_WORKERS = env.int("TEAM_IMPORT_HASH_WORKERS", default=0) or None
+PASSWORD_HASHERS = [
+    "accounts.hashers.ConfigurablePBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+    "django.contrib.auth.hashers.Argon2PasswordHasher",
+    "django.contrib.auth.hashers.BCryptSHA256PasswordHasher",
+    "django.contrib.auth.hashers.ScryptPasswordHasher",
+]
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -141,7 +220,14 @@ AUTHENTICATION_BACKENDS = [
     "django.contrib.auth.backends.ModelBackend",
     
 ]
-MAX_FAILED_LOGIN_ATTEMPTS = 5
+# Verrouillage après échecs de connexion : fenêtre glissante (secondes) dans le
+# cache partagé, seuil par email (verrouille le compte) et par IP (rejet sans accès DB)
+MAX_FAILED_LOGIN_ATTEMPTS = env.int("MAX_FAILED_LOGIN_ATTEMPTS", default=5)
+MAX_FAILED_LOGIN_ATTEMPTS_TIME = env.int("MAX_FAILED_LOGIN_ATTEMPTS_TIME", default=900)
+MAX_FAILED_LOGIN_ATTEMPTS_PER_IP = env.int("MAX_FAILED_LOGIN_ATTEMPTS_PER_IP", default=50)
+# Nombre de proxies de confiance devant l'application (X-Forwarded-For n'est lu
+# qu'au-delà de 0 ; sinon l'IP du client est REMOTE_ADDR)
+NUM_PROXIES = env.int("NUM_PROXIES", default=0)
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 AUTH_USER_MODEL = 'accounts.ImmobUser'
 